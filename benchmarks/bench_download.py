@@ -0,0 +1,201 @@
+"""Download benchmark: HFDownloader against the local Hugging Face stand-in.
+
+Starts ``hf_server.py`` in a subprocess (so its CPU time is not counted) for
+every scenario, file size and concurrency level, downloads end to end and
+reports throughput, client CPU per GB, time to first byte and recovery time
+after injected faults.
+
+    python benchmarks/bench_download.py --sizes 64M,512M --concurrency 1,4 --output download.json
+"""
+import argparse
+import hashlib
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.hf_server import HostedFile, parse_size  # noqa: E402
+from src.services import hf_endpoints  # noqa: E402
+from src.services.hf_downloader import DownloadRequest, HFDownloader  # noqa: E402
+
+SCENARIOS = ("clean", "latency", "bandwidth", "reset", "throttle")
+FILENAME = "model.safetensors"
+
+
+def scenario_args(
+    scenario: str, size: int, concurrency: int, args: argparse.Namespace
+) -> List[str]:
+    if scenario == "latency":
+        return ["--latency", str(args.latency)]
+    if scenario == "bandwidth":
+        return ["--bandwidth", args.bandwidth]
+    if scenario == "reset":
+        return ["--reset-after", str(max(1, size // 2)), "--resets", str(concurrency)]
+    if scenario == "throttle":
+        return ["--throttles", str(concurrency)]
+    return []
+
+
+def start_server(files: List[HostedFile], extra: List[str]) -> subprocess.Popen:
+    command = [sys.executable, str(ROOT / "benchmarks" / "hf_server.py")]
+    for hosted in files:
+        command += ["--file", f"{hosted.repo_id}:{hosted.filename}:{hosted.size}"]
+    return subprocess.Popen(command + extra, stdout=subprocess.PIPE, text=True)
+
+
+def server_events(url: str) -> List[Dict]:
+    with urllib.request.urlopen(f"{url}/_bench/events", timeout=10) as response:
+        return json.loads(response.read())["events"]
+
+
+def recovery_times(events: List[Dict]) -> List[float]:
+    times = []
+    for index, event in enumerate(events):
+        if event["kind"] not in ("reset", "throttle"):
+            continue
+        resumed = next(
+            (
+                later
+                for later in events[index + 1 :]
+                if later["kind"] == "start" and later["path"] == event["path"]
+            ),
+            None,
+        )
+        if resumed:
+            times.append(resumed["at"] - event["at"])
+    return times
+
+
+def run_case(
+    scenario: str, size: int, concurrency: int, args: argparse.Namespace
+) -> Dict[str, object]:
+    files = [HostedFile(f"bench/repo{index}", FILENAME, size) for index in range(concurrency)]
+    process = start_server(files, scenario_args(scenario, size, concurrency, args))
+    try:
+        url = process.stdout.readline().strip()
+        endpoints = [url]
+        if scenario in ("reset", "throttle"):
+            endpoints.append(url.replace("127.0.0.1", "localhost"))
+        hf_endpoints.DEFAULT_HF_ENDPOINT = url
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first_byte: Dict[int, float] = {}
+            outcomes: Dict[int, bool] = {}
+            lock = threading.Lock()
+            jobs = []
+            cpu_start = time.process_time()
+            started = time.perf_counter()
+            for index, hosted in enumerate(files):
+                request = DownloadRequest(
+                    repo_id=hosted.repo_id,
+                    filename=FILENAME,
+                    model_type="checkpoints",
+                    base_model="bench",
+                    target_dir=Path(temp_dir) / str(index),
+                    readme_dir=Path(temp_dir) / "readmes",
+                    endpoints=endpoints,
+                )
+
+                def progress(_done: int, _total: int, _speed: float, index: int = index) -> None:
+                    with lock:
+                        first_byte.setdefault(index, time.perf_counter() - started)
+
+                def complete(success: bool, *_rest, index: int = index) -> None:
+                    outcomes[index] = success
+
+                jobs.append(HFDownloader().download_async(request, progress, complete))
+            for job in jobs:
+                job.wait()
+            wall = time.perf_counter() - started
+            cpu = time.process_time() - cpu_start
+
+            verified = all(
+                outcomes.get(index)
+                and _sha256(Path(temp_dir) / str(index) / FILENAME) == hosted.sha256
+                for index, hosted in enumerate(files)
+            )
+        events = server_events(url)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    total_bytes = size * concurrency
+    recoveries = recovery_times(events)
+    return {
+        "scenario": scenario,
+        "size_bytes": size,
+        "concurrency": concurrency,
+        "wall_seconds": wall,
+        "throughput_mb_s": total_bytes / wall / 1024**2,
+        "cpu_seconds_per_gb": cpu / (total_bytes / 1024**3),
+        "ttfb_ms": _median_ms(list(first_byte.values())),
+        "recovery_ms": _median_ms(recoveries),
+        "faults": sum(1 for event in events if event["kind"] in ("reset", "throttle")),
+        "succeeded": sum(1 for ok in outcomes.values() if ok),
+        "verified": verified,
+    }
+
+
+def summarize(samples: List[Dict[str, object]]) -> Dict[str, object]:
+    summary = dict(samples[0])
+    for key in ("wall_seconds", "throughput_mb_s", "cpu_seconds_per_gb", "ttfb_ms", "recovery_ms"):
+        values = [sample[key] for sample in samples if sample[key] is not None]
+        summary[key] = statistics.median(values) if values else None
+    summary["verified"] = all(sample["verified"] for sample in samples)
+    summary["runs"] = len(samples)
+    return summary
+
+
+def _median_ms(values: List[float]) -> Optional[float]:
+    return statistics.median(values) * 1000 if values else None
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(8 * 1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="16M,128M")
+    parser.add_argument("--concurrency", default="1,4")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds, latency scenario")
+    parser.add_argument("--bandwidth", default="50M", help="bytes/s, bandwidth scenario")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = []
+    for scenario in args.scenarios.split(","):
+        for size in [parse_size(value) for value in args.sizes.split(",")]:
+            for concurrency in [int(value) for value in args.concurrency.split(",")]:
+                samples = [run_case(scenario, size, concurrency, args) for _ in range(args.runs)]
+                results.append(summarize(samples))
+                print(json.dumps(results[-1]), file=sys.stderr)
+    result = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "results": results,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
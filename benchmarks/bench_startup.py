@@ -0,0 +1,83 @@
+"""Startup benchmark: import time, time-to-window and time-to-interactive.
+
+Runs ``main.py`` in fresh interpreters and reads the timings the app records
+when ``CMM_STARTUP_REPORT`` is set. Needs a display.
+
+    python benchmarks/bench_startup.py --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def measure_import(module: str) -> float:
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT, text=True)
+    return float(output.strip())
+
+
+def measure_startup(timeout: float) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report = Path(temp_dir) / "startup.json"
+        env = dict(os.environ, CMM_STARTUP_REPORT=str(report), CMM_STARTUP_EXIT="1")
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "main.py"], cwd=ROOT, env=env, timeout=timeout, check=True
+        )
+        timings = json.loads(report.read_text(encoding="utf-8"))
+        timings["process_exit"] = time.perf_counter() - start
+        return timings
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    keys = sorted({key for sample in samples for key in sample})
+    summary = {}
+    for key in keys:
+        values = [sample[key] for sample in samples if key in sample]
+        summary[key] = {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+        }
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    imports = [
+        {"src.app": measure_import("src.app"), "customtkinter": measure_import("customtkinter")}
+        for _ in range(args.runs)
+    ]
+    startups = [measure_startup(args.timeout) for _ in range(args.runs)]
+    result = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "imports": summarize(imports),
+        "startup": summarize(startups),
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""Local stand-in for the Hugging Face resolve and model-info endpoints.
+
+Serves generated files with Range, ETag and LFS headers and can inject
+latency, per-connection bandwidth caps, mid-stream resets and 429s. Used by
+``bench_download.py``; can also be run on its own:
+
+    python benchmarks/hf_server.py --file user/repo:model.safetensors:256M --bandwidth 50M
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import socket
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+
+BLOCK_SIZE = 1024 * 1024
+SEND_CHUNK = 64 * 1024
+LFS_MIN_SIZE = 10 * 1024 * 1024
+COMMIT = "0123456789abcdef0123456789abcdef01234567"
+README_TEXT = "# Stand-in model\n\nServed by benchmarks/hf_server.py.\n"
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+@dataclass
+class Faults:
+    latency: float = 0.0
+    bandwidth: float = 0.0
+    reset_after: int = 0
+    resets: int = 0
+    throttles: int = 0
+    retry_after: int = 1
+
+
+@dataclass
+class ServerEvent:
+    at: float
+    kind: str
+    path: str
+    offset: int = 0
+    status: int = 0
+
+
+class HostedFile:
+    def __init__(
+        self, repo_id: str, filename: str, size: int, data: Optional[bytes] = None
+    ) -> None:
+        self.repo_id = repo_id
+        self.filename = filename
+        self.size = len(data) if data is not None else size
+        self._data = data
+        self._block = b""
+        self._sha256 = ""
+        self._lock = threading.Lock()
+
+    def prepare(self) -> None:
+        if self.is_lfs:
+            self.sha256
+
+    @property
+    def is_lfs(self) -> bool:
+        return self.size >= LFS_MIN_SIZE
+
+    @property
+    def sha256(self) -> str:
+        with self._lock:
+            if not self._sha256:
+                digest = hashlib.sha256()
+                for chunk in self.read(0, self.size):
+                    digest.update(chunk)
+                self._sha256 = digest.hexdigest()
+            return self._sha256
+
+    @property
+    def etag(self) -> str:
+        if self.is_lfs:
+            return self.sha256
+        blob = f"blob {self.size}\0".encode() + b"".join(self.read(0, self.size))
+        return hashlib.sha1(blob).hexdigest()
+
+    def read(self, start: int, end: int) -> Iterator[bytes]:
+        if self._data is not None:
+            for offset in range(start, end, SEND_CHUNK):
+                yield self._data[offset : min(end, offset + SEND_CHUNK)]
+            return
+        block = self._pattern()
+        view = memoryview(block)
+        offset = start
+        while offset < end:
+            inner = offset % BLOCK_SIZE
+            count = min(SEND_CHUNK, BLOCK_SIZE - inner, end - offset)
+            yield bytes(view[inner : inner + count])
+            offset += count
+
+    def _pattern(self) -> bytes:
+        if not self._block:
+            name = f"{self.repo_id}/{self.filename}".encode()
+            seed = int.from_bytes(hashlib.sha256(name).digest()[:8], "big")
+            self._block = random.Random(seed).randbytes(BLOCK_SIZE)
+        return self._block
+
+
+@dataclass
+class _Counters:
+    resets: int = 0
+    throttles: int = 0
+
+
+@dataclass
+class StandInServer:
+    files: List[HostedFile]
+    host: str = "127.0.0.1"
+    port: int = 0
+    faults: Faults = field(default_factory=Faults)
+
+    def __post_init__(self) -> None:
+        self.events: List[ServerEvent] = []
+        self._counters = _Counters()
+        self._lock = threading.Lock()
+        self._by_path: Dict[Tuple[str, str], HostedFile] = {}
+        for hosted in self.files:
+            hosted.prepare()
+            self._by_path[(hosted.repo_id, hosted.filename)] = hosted
+            readme = (hosted.repo_id, "README.md")
+            if readme not in self._by_path:
+                self._by_path[readme] = HostedFile(
+                    hosted.repo_id, "README.md", 0, README_TEXT.encode()
+                )
+        self.httpd = _StandInHTTPServer((self.host, self.port), _StandInHandler, self)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def shutdown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def lookup(self, repo_id: str, filename: str) -> Optional[HostedFile]:
+        return self._by_path.get((repo_id, filename))
+
+    def siblings(self, repo_id: str) -> List[str]:
+        return sorted(name for repo, name in self._by_path if repo == repo_id)
+
+    def record(self, kind: str, path: str, offset: int = 0, status: int = 0) -> None:
+        with self._lock:
+            self.events.append(ServerEvent(time.time(), kind, path, offset, status))
+
+    def take_fault(self, kind: str) -> bool:
+        with self._lock:
+            if kind == "throttle" and self._counters.throttles < self.faults.throttles:
+                self._counters.throttles += 1
+                return True
+            if kind == "reset" and self._counters.resets < self.faults.resets:
+                self._counters.resets += 1
+                return True
+        return False
+
+    def reset_faults(self, faults: Faults) -> None:
+        with self._lock:
+            self.faults = faults
+            self._counters = _Counters()
+            self.events = []
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, address, handler, owner: StandInServer) -> None:
+        self.owner = owner
+        super().__init__(address, handler)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _StandInHTTPServer
+
+    def log_message(self, *_args) -> None:
+        return
+
+    def do_HEAD(self) -> None:
+        self._dispatch(head=True)
+
+    def do_GET(self) -> None:
+        self._dispatch(head=False)
+
+    def _dispatch(self, head: bool) -> None:
+        path = unquote(urlsplit(self.path).path)
+        if path == "/_bench/events":
+            events = [asdict(event) for event in self.server.owner.events]
+            self._send_json(200, {"events": events}, head)
+            return
+        match = re.fullmatch(r"/api/models/(.+?)(?:/revision/[^/]+)?", path)
+        if match:
+            self._model_info(match.group(1), head)
+            return
+        match = re.fullmatch(r"/(.+?)/resolve/[^/]+/(.+)", path)
+        if match:
+            self._resolve(match.group(1), match.group(2), path, head)
+            return
+        self._send_json(404, {"error": "Entry not found"}, head)
+
+    def _model_info(self, repo_id: str, head: bool) -> None:
+        siblings = self.server.owner.siblings(repo_id)
+        if not siblings:
+            self._send_json(404, {"error": "Repository not found"}, head)
+            return
+        payload = {
+            "id": repo_id,
+            "modelId": repo_id,
+            "sha": COMMIT,
+            "private": False,
+            "siblings": [{"rfilename": name} for name in siblings],
+        }
+        self._send_json(200, payload, head)
+
+    def _resolve(self, repo_id: str, filename: str, path: str, head: bool) -> None:
+        owner = self.server.owner
+        hosted = owner.lookup(repo_id, filename)
+        if hosted is None:
+            self._send_json(404, {"error": "Entry not found"}, head)
+            return
+        if owner.faults.latency:
+            time.sleep(owner.faults.latency)
+        start, end, partial, open_ended = self._range(hosted.size)
+        if start is None:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{hosted.size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body_request = not head and open_ended
+        if body_request and owner.take_fault("throttle"):
+            owner.record("throttle", path, start, 429)
+            self.send_response(429)
+            self.send_header("Retry-After", str(owner.faults.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        status = 206 if partial else 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", f'"{hosted.etag}"')
+        self.send_header("X-Repo-Commit", COMMIT)
+        if hosted.is_lfs:
+            self.send_header("X-Linked-Etag", f'"{hosted.sha256}"')
+            self.send_header("X-Linked-Size", str(hosted.size))
+        if partial:
+            self.send_header("Content-Range", f"bytes {start}-{end - 1}/{hosted.size}")
+        self.end_headers()
+        if head:
+            return
+        owner.record("start", path, start, status)
+        reset_at = None
+        if body_request and owner.faults.reset_after and owner.take_fault("reset"):
+            reset_at = start + owner.faults.reset_after
+        self._stream(hosted, start, end, reset_at, path)
+
+    def _stream(
+        self, hosted: HostedFile, start: int, end: int, reset_at: Optional[int], path: str
+    ) -> None:
+        owner = self.server.owner
+        bandwidth = owner.faults.bandwidth
+        began = time.perf_counter()
+        sent = 0
+        try:
+            for chunk in hosted.read(start, end):
+                if reset_at is not None and start + sent + len(chunk) > reset_at:
+                    chunk = chunk[: max(0, reset_at - start - sent)]
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+                    owner.record("reset", path, start + sent + len(chunk))
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    self.close_connection = True
+                    return
+                self.wfile.write(chunk)
+                sent += len(chunk)
+                if bandwidth:
+                    delay = sent / bandwidth - (time.perf_counter() - began)
+                    if delay > 0:
+                        time.sleep(delay)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+            return
+        owner.record("done", path, start + sent)
+
+    def _range(self, size: int) -> Tuple[Optional[int], int, bool, bool]:
+        header = self.headers.get("Range")
+        if not header:
+            return 0, size, False, True
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", header.strip())
+        if not match or not (match.group(1) or match.group(2)):
+            return 0, size, False, True
+        first, last = match.groups()
+        if not first:
+            start = max(0, size - int(last))
+            return start, size, True, False
+        start = int(first)
+        if start >= size:
+            return None, 0, False, False
+        end = min(size, int(last) + 1) if last else size
+        return start, end, True, not last
+
+    def _send_json(self, status: int, payload: Dict, head: bool) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Repo-Commit", COMMIT)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+
+def parse_size(text: str) -> int:
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([KMG]?)i?B?", text.strip().upper())
+    if not match:
+        raise ValueError(f"invalid size: {text}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def parse_file(spec: str) -> HostedFile:
+    repo_id, filename, size = spec.rsplit(":", 2)
+    return HostedFile(repo_id, filename, parse_size(size))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--file", action="append", default=[], help="repo_id:filename:size")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before headers")
+    parser.add_argument("--bandwidth", default="0", help="bytes/s per connection, e.g. 50M")
+    parser.add_argument("--reset-after", default="0", help="cut body requests after N bytes")
+    parser.add_argument("--resets", type=int, default=0, help="number of connections to cut")
+    parser.add_argument("--throttles", type=int, default=0, help="number of 429 responses")
+    args = parser.parse_args()
+
+    faults = Faults(
+        latency=args.latency,
+        bandwidth=parse_size(args.bandwidth),
+        reset_after=parse_size(args.reset_after),
+        resets=args.resets,
+        throttles=args.throttles,
+    )
+    server = StandInServer([parse_file(spec) for spec in args.file], args.host, args.port, faults)
+    print(server.url, flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
-from src.app import ComfyModelManagerApp
+import time
+
+STARTED_AT = time.perf_counter()
+
+from src.app import ComfyModelManagerApp  # noqa: E402
 
 
 def main() -> None:
-    app = ComfyModelManagerApp()
+    app = ComfyModelManagerApp(started_at=STARTED_AT)
     app.run()
 
 
@@ -1,23 +1,64 @@
+import json
 import os
+import time
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 
 from src.config import AppConfig, ConfigManager, default_config_path
+from src.models.catalog import catalog_snapshot_path, load_snapshot, save_snapshot
 from src.models.model_scanner import ModelEntry, ModelScanner
-from src.ui.download_dialog import DownloadDialog, DownloadResult
+from src.services import tracing
+from src.services.metrics import REGISTRY, MetricsExporter, metrics_dir
+from src.services.readme_resolver import ReadmeResolver
+from src.services.scheduler import (
+    POOL_CPU,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_VISIBLE,
+    Job,
+    get_scheduler,
+)
+from src.services.search_index import SearchIndex
+from src.services.thumbnail_cache import ThumbnailCache
+from src.ui.thumbnail_loader import ThumbnailLoader
 from src.ui.model_detail import ModelDetailDialog
 from src.ui.model_grid import ModelGrid
 from src.ui.sidebar import Sidebar
 from src.ui.settings_dialog import SettingsDialog
 from src.ui.topbar import Topbar
-from src.utils.file_utils import file_hash, safe_relative_path, text_hash
+from src.ui.watchdog import UiWatchdog
+from src.utils.file_utils import file_size_display, safe_relative_path, text_hash
+
+if TYPE_CHECKING:
+    from src.services.integrity import IntegrityResult
+    from src.services.precision import ConversionResult
+    from src.services.preview_ingest import IngestResult
+    from src.services.relocator import MoveResult, Relocator
+    from src.ui.download_dialog import DownloadResult
+
+
+STARTUP_REPORT_ENV = "CMM_STARTUP_REPORT"
+STARTUP_EXIT_ENV = "CMM_STARTUP_EXIT"
+WATCHED_CALLBACKS = (
+    "_load_models",
+    "_models_scanned",
+    "_refresh_view",
+    "_open_detail",
+    "_update_preview",
+    "_save_settings",
+    "_save_notes",
+    "_previews_ingested",
+)
 
 
 class ComfyModelManagerApp:
-    def __init__(self) -> None:
+    def __init__(self, started_at: Optional[float] = None) -> None:
+        self._started_at = started_at if started_at is not None else time.perf_counter()
+        self.startup_timings: Dict[str, float] = {}
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("dark-blue")
         self.root = ctk.CTk()
@@ -25,8 +66,29 @@ class ComfyModelManagerApp:
         self.root.geometry("1200x780")
         self.root.configure(fg_color="#0b0c10")
 
+        self.tracer = tracing.enable_from_env()
         self.config_manager = ConfigManager(default_config_path())
         self.config = self.config_manager.load()
+        if self.tracer and self.tracer.output is None:
+            self.tracer.output = tracing.trace_path(
+                Path(self.config.app_data_dir) / "diagnostics"
+            )
+        self.scheduler = get_scheduler()
+        self.scheduler.dispatcher = lambda callback: self.root.after(0, callback)
+        self.thumbnails = self._create_thumbnail_cache()
+        self.thumbnail_loader = ThumbnailLoader(self.root, self.thumbnails, self.scheduler)
+        self.readmes = ReadmeResolver(Path(self.config.app_data_dir))
+        self.search_index = SearchIndex(Path(self.config.app_data_dir), self.readmes)
+
+        self.models: List[ModelEntry] = load_snapshot(
+            catalog_snapshot_path(Path(self.config.app_data_dir))
+        )
+        self.search_query = ""
+        self._scan_generation = 0
+        self._scan_scheduled = False
+        self._search_after_id = None
+        self._index_running = False
+        self._index_pending = False
 
         self.selected_type = self.config.model_types[0]["id"]
         self.selected_base = self.config.base_models[0]
@@ -36,15 +98,56 @@ class ComfyModelManagerApp:
         self.grid = None
         self._last_download_repo = ""
         self._settings_dialog = None
+        self.move_button = None
+
+        self.watchdog = UiWatchdog.from_env(
+            self.root, Path(self.config.app_data_dir) / "diagnostics"
+        )
+        if self.watchdog:
+            self.watchdog.instrument(self, WATCHED_CALLBACKS)
 
         self._build_layout()
+        self._mark_startup("layout")
+        if self.watchdog:
+            self.watchdog.instrument(self.grid, ["update_models"], prefix="ModelGrid.")
+            self.watchdog.start()
+        self.metrics = MetricsExporter(
+            REGISTRY, metrics_dir(Path(self.config.app_data_dir)), "app"
+        )
+        self.metrics.start()
+        self.root.bind("<Map>", self._on_map, add="+")
         self._load_models()
 
         if not self.config.comfyui_models_dir:
             self._open_settings()
 
     def run(self) -> None:
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.metrics.stop()
+            if self.tracer:
+                self.tracer.export()
+            if self.watchdog:
+                self.watchdog.stop()
+
+    def _on_map(self, event) -> None:
+        if event.widget is self.root:
+            self._mark_startup("window")
+
+    def _mark_startup(self, stage: str) -> None:
+        if stage in self.startup_timings:
+            return
+        self.startup_timings[stage] = time.perf_counter() - self._started_at
+        if stage != "interactive":
+            return
+        report_path = os.environ.get(STARTUP_REPORT_ENV)
+        if report_path:
+            Path(report_path).write_text(
+                json.dumps(self.startup_timings, indent=2), encoding="utf-8"
+            )
+        if os.environ.get(STARTUP_EXIT_ENV):
+            self.root.after(0, self.root.destroy)
 
     def _build_layout(self) -> None:
         header = ctk.CTkFrame(self.root, fg_color="#0b0c10")
@@ -63,6 +166,31 @@ class ComfyModelManagerApp:
             command=self._open_settings,
         ).pack(side="right", padx=20, pady=12)
 
+        ctk.CTkButton(
+            header,
+            text="导入预览图",
+            fg_color="#2f3e46",
+            hover_color="#3d4f59",
+            command=self._import_previews,
+        ).pack(side="right", pady=12)
+
+        ctk.CTkButton(
+            header,
+            text="检查完整性",
+            fg_color="#2f3e46",
+            hover_color="#3d4f59",
+            command=self._check_integrity,
+        ).pack(side="right", padx=(0, 12), pady=12)
+
+        self.move_button = ctk.CTkButton(
+            header,
+            text="移动所选",
+            fg_color="#2f3e46",
+            hover_color="#3d4f59",
+            command=self._open_move,
+        )
+        self.move_button.pack(side="right", padx=(0, 12), pady=12)
+
         body = ctk.CTkFrame(self.root, fg_color="#0b0c10")
         body.pack(fill="both", expand=True)
 
@@ -73,10 +201,14 @@ class ComfyModelManagerApp:
         content = ctk.CTkFrame(body, fg_color="#0b0c10")
         content.pack(side="left", fill="both", expand=True)
 
-        self.topbar = Topbar(content, self.config.base_models, self._on_base_select)
+        self.topbar = Topbar(
+            content, self.config.base_models, self._on_base_select, self._on_search
+        )
         self.topbar.pack(fill="x")
 
-        self.grid = ModelGrid(content, self._open_detail)
+        self.grid = ModelGrid(
+            content, self._open_detail, self.thumbnail_loader, self._on_selection_change
+        )
         self.grid.pack(fill="both", expand=True, padx=12, pady=12)
 
         if self.sidebar:
@@ -84,6 +216,12 @@ class ComfyModelManagerApp:
         if self.topbar:
             self.topbar._select(self.selected_base)
 
+    def _create_thumbnail_cache(self) -> ThumbnailCache:
+        return ThumbnailCache(
+            Path(self.config.app_data_dir),
+            image_factory=lambda image: ctk.CTkImage(image, size=image.size),
+        )
+
     def _open_settings(self) -> None:
         if self._settings_dialog and self._settings_dialog.winfo_exists():
             self._settings_dialog.lift()
@@ -94,6 +232,8 @@ class ComfyModelManagerApp:
             self.config.comfyui_models_dir,
             self.config.app_data_dir,
             self.config.hf_token,
+            self.config.hf_endpoints,
+            self.config.extra_model_paths_yaml,
             self._save_settings,
             self._on_settings_closed,
         )
@@ -102,21 +242,106 @@ class ComfyModelManagerApp:
     def _on_settings_closed(self) -> None:
         self._settings_dialog = None
 
-    def _save_settings(self, comfy_dir: str, app_data_dir: str, token: str) -> None:
+    def _save_settings(
+        self,
+        comfy_dir: str,
+        app_data_dir: str,
+        token: str,
+        endpoints: List[str],
+        extra_model_paths_yaml: str,
+    ) -> None:
         self.config.comfyui_models_dir = comfy_dir
         self.config.app_data_dir = app_data_dir
         self.config.hf_token = token
+        self.config.hf_endpoints = endpoints
+        self.config.extra_model_paths_yaml = extra_model_paths_yaml
         self.config.ensure_app_dirs()
         self.config_manager.save()
+        self.thumbnails = self._create_thumbnail_cache()
+        self.thumbnail_loader.cache = self.thumbnails
+        self.readmes = ReadmeResolver(Path(self.config.app_data_dir))
+        self.search_index = SearchIndex(Path(self.config.app_data_dir), self.readmes)
         self._load_models()
 
     def _load_models(self) -> None:
-        scanner = ModelScanner(self.config)
-        models = scanner.scan()
-        filtered = self._filter_models(models)
+        if self._scan_scheduled:
+            return
+        self._scan_scheduled = True
+        self.root.after_idle(self._start_scan)
+
+    def _start_scan(self) -> None:
+        self._scan_scheduled = False
+        self._scan_generation += 1
+        generation = self._scan_generation
+        config = replace(self.config, models_metadata=dict(self.config.models_metadata))
+        snapshot_path = catalog_snapshot_path(Path(config.app_data_dir))
+
+        def worker() -> List[ModelEntry]:
+            models = ModelScanner(config, scheduler=self.scheduler).scan()
+            try:
+                save_snapshot(snapshot_path, models)
+            except OSError:
+                pass
+            return models
+
+        self.scheduler.submit(
+            worker,
+            pool=POOL_CPU,
+            priority=PRIORITY_VISIBLE,
+            name="scan models",
+            on_done=lambda job: self._models_scanned(generation, job.result),
+        )
+
+    def _models_scanned(self, generation: int, models: Optional[List[ModelEntry]]) -> None:
+        if generation != self._scan_generation or models is None:
+            return
+        self.models = models
+        self._refresh_view()
+        self._sync_search_index()
+        self._mark_startup("interactive")
+
+    def _refresh_view(self) -> None:
+        if self.search_query:
+            hits = self.search_index.search(self.search_query)
+            filtered = [model for model in self.models if model.relative_path in hits]
+        else:
+            filtered = self._filter_models(self.models)
         if self.grid:
             self.grid.update_models(filtered)
 
+    def _on_search(self, query: str) -> None:
+        self.search_query = query.strip()
+        if self._search_after_id:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(150, self._run_search)
+
+    def _run_search(self) -> None:
+        self._search_after_id = None
+        self._refresh_view()
+
+    def _sync_search_index(self) -> None:
+        if self._index_running:
+            self._index_pending = True
+            return
+        self._index_running = True
+        index = self.search_index
+        models = list(self.models)
+
+        self.scheduler.submit(
+            lambda: index.sync(models),
+            pool=POOL_CPU,
+            name="sync search index",
+            on_done=lambda _job: self._search_index_synced(),
+        )
+
+    def _search_index_synced(self) -> None:
+        self._index_running = False
+        if self._index_pending:
+            self._index_pending = False
+            self._sync_search_index()
+        elif self.search_query:
+            self._refresh_view()
+
     def _filter_models(self, models: List[ModelEntry]) -> List[ModelEntry]:
         return [
             model
@@ -127,10 +352,12 @@ class ComfyModelManagerApp:
 
     def _on_type_select(self, model_type: str) -> None:
         self.selected_type = model_type
+        self._refresh_view()
         self._load_models()
 
     def _on_base_select(self, base_model: str) -> None:
         self.selected_base = base_model
+        self._refresh_view()
         self._load_models()
 
     def _open_download(self) -> None:
@@ -140,6 +367,8 @@ class ComfyModelManagerApp:
         if not self.config.app_data_dir:
             messagebox.showerror("配置缺失", "请先在设置中配置应用数据目录")
             return
+        from src.ui.download_dialog import DownloadDialog
+
         dialog = DownloadDialog(
             self.root,
             [item["id"] for item in self.config.model_types],
@@ -147,14 +376,16 @@ class ComfyModelManagerApp:
             self.selected_type,
             self.selected_base,
             self.config.hf_token,
+            self.config.hf_endpoints,
             Path(self.config.comfyui_models_dir),
             Path(self.config.app_data_dir),
             self._set_last_download_repo,
             self._download_complete,
+            self.config.peer_urls,
         )
         dialog.grab_set()
 
-    def _download_complete(self, result: DownloadResult) -> None:
+    def _download_complete(self, result: "DownloadResult") -> None:
         if not result.success:
             messagebox.showerror("下载失败", result.message)
             return
@@ -162,14 +393,23 @@ class ComfyModelManagerApp:
             relative = safe_relative_path(
                 Path(self.config.comfyui_models_dir), Path(result.model_path)
             )
+            from src.services.block_manifest import downloaded_sha256, manifests_dir
+
             readme_path = result.readme_path
             if readme_path:
                 readme_path = str(Path(readme_path))
+            model_path = Path(result.model_path)
             self.config.add_metadata(
                 relative_path=relative,
                 repo_id=self._last_download_repo,
-                filename=Path(result.model_path).name,
+                filename=model_path.name,
                 readme_path=readme_path or "",
+                sha256=downloaded_sha256(
+                    manifests_dir(Path(self.config.app_data_dir)),
+                    self._last_download_repo,
+                    model_path.name,
+                    model_path,
+                ),
             )
             self.config_manager.save()
         messagebox.showinfo("下载完成", "模型下载完成")
@@ -182,30 +422,256 @@ class ComfyModelManagerApp:
         dialog = ModelDetailDialog(
             self.root,
             model,
-            self.config.app_data_dir,
+            self.readmes,
+            self.thumbnail_loader,
             self._update_preview,
             self._delete_model,
             self._save_notes,
+            self._promote_model if self.config.slow_tier_dir else None,
+            self._warm_model,
+            self._convert_model,
         )
         dialog.grab_set()
 
+    def _promote_model(self, model: ModelEntry) -> None:
+        from src.services.tiering import TierError, TierManager
+
+        manager = TierManager(self.config)
+
+        def worker() -> str:
+            try:
+                manager.promote(model)
+            except (OSError, TierError) as exc:
+                return str(exc)
+            return ""
+
+        self.scheduler.submit(
+            worker,
+            priority=PRIORITY_INTERACTIVE,
+            name=f"promote {model.name}",
+            on_done=lambda job: self._model_promoted(model, job.result),
+        )
+
+    def _warm_model(self, model: ModelEntry) -> None:
+        from src.services.page_cache import warm_file
+
+        def worker() -> Tuple[str, str]:
+            try:
+                percent = warm_file(Path(model.absolute_path)).residency.percent
+            except OSError as exc:
+                return "", str(exc)
+            return ("" if percent is None else f"{percent:.0f}%"), ""
+
+        self.scheduler.submit(
+            worker,
+            priority=PRIORITY_INTERACTIVE,
+            name=f"warm {model.name}",
+            on_done=lambda job: self._model_warmed(model, job),
+        )
+
+    def _model_warmed(self, model: ModelEntry, job: Job) -> None:
+        if job.error is not None or job.result is None:
+            messagebox.showerror("预热失败", str(job.error or job.status))
+            return
+        resident, error = job.result
+        if error:
+            messagebox.showerror("预热失败", error)
+            return
+        detail = f"，已缓存 {resident}" if resident else ""
+        messagebox.showinfo("预热完成", f"{model.name} 已读入系统缓存{detail}")
+
+    def _convert_model(self, model: ModelEntry) -> None:
+        from src.services.precision import conversion_target, convert_file
+
+        source = Path(model.absolute_path)
+        target = conversion_target(source, "fp16")
+        if target.exists():
+            messagebox.showerror("转换失败", f"{target.name} 已存在")
+            return
+
+        def worker() -> Tuple[Optional["ConversionResult"], str]:
+            job = self.scheduler.current_job()
+            try:
+                return convert_file(source, target, "fp16", job.report), ""
+            except (OSError, ValueError) as exc:
+                return None, str(exc)
+
+        self.scheduler.submit(
+            worker,
+            pool=POOL_CPU,
+            priority=PRIORITY_INTERACTIVE,
+            name=f"convert {model.name}",
+            on_done=lambda job: self._model_converted(model, job),
+        )
+
+    def _model_converted(self, model: ModelEntry, job: Job) -> None:
+        if job.error is not None or job.result is None:
+            messagebox.showerror("转换失败", str(job.error or job.status))
+            return
+        result, error = job.result
+        if error:
+            messagebox.showerror("转换失败", error)
+            return
+        from src.services.precision import register_conversion
+
+        register_conversion(self.config, model.relative_path, result)
+        self.config_manager.save()
+        messagebox.showinfo(
+            "转换完成",
+            f"{result.target.name}: {file_size_display(result.bytes_in)} → "
+            f"{file_size_display(result.bytes_out)}",
+        )
+        self._load_models()
+
+    def _model_promoted(self, model: ModelEntry, error: str) -> None:
+        if error:
+            messagebox.showerror("移动失败", error)
+        else:
+            messagebox.showinfo("完成", f"{model.name} 已移回高速存储")
+        self._load_models()
+
+    def _check_integrity(self) -> None:
+        from src.services.integrity import check_models
+
+        if not self.models:
+            return
+        models = list(self.models)
+        self.scheduler.submit(
+            partial(check_models, self.config, models, scheduler=self.scheduler),
+            pool=POOL_CPU,
+            priority=PRIORITY_INTERACTIVE,
+            name="verify library",
+            on_done=lambda job: self._integrity_checked(job.result),
+        )
+
+    def _integrity_checked(self, results: Optional[List["IntegrityResult"]]) -> None:
+        if results is None:
+            return
+        from src.services.integrity import record_results
+
+        record_results(self.config, results)
+        self.config_manager.save()
+        statuses = {result.model.relative_path: result.status for result in results}
+        self.models = [
+            replace(model, integrity=statuses.get(model.relative_path, model.integrity))
+            for model in self.models
+        ]
+        self._refresh_view()
+        broken = [result for result in results if result.broken]
+        if not broken:
+            messagebox.showinfo("检查完成", f"{len(results)} 个模型文件均完整")
+            return
+        lines = [f"{result.model.relative_path}: {result.detail}" for result in broken[:20]]
+        summary = f"{len(broken)} 个文件异常\n" + "\n".join(lines)
+        messagebox.showwarning("发现损坏文件", summary)
+
     def _update_preview(self, model: ModelEntry) -> None:
         path = filedialog.askopenfilename(
             title="选择预览图",
-            filetypes=[("Image", "*.png;*.jpg;*.jpeg")],
+            filetypes=[("Image", "*.png;*.jpg;*.jpeg;*.webp")],
         )
         if not path:
             return
-        preview_dir = Path(self.config.app_data_dir) / "previews"
-        preview_dir.mkdir(parents=True, exist_ok=True)
-        file_name = f"{file_hash(Path(path))}.png"
-        target = preview_dir / file_name
-        if not target.exists():
-            with open(path, "rb") as source:
-                target.write_bytes(source.read())
-        relative = safe_relative_path(Path(self.config.app_data_dir), target)
-        self.config.set_preview(model.relative_path, str(Path(self.config.app_data_dir) / relative))
-        self.config_manager.save()
+        self._ingest_previews([(model, Path(path))])
+
+    def _import_previews(self) -> None:
+        if not self.config.comfyui_models_dir:
+            messagebox.showerror("配置缺失", "请先在设置中配置 ComfyUI 模型目录")
+            return
+        folder = filedialog.askdirectory(title="选择预览图文件夹")
+        if not folder:
+            return
+        from src.services.preview_ingest import match_previews_by_stem
+
+        pairs = match_previews_by_stem(Path(folder), self.models)
+        if not pairs:
+            messagebox.showinfo("导入预览图", "没有找到与模型文件同名的图片")
+            return
+        self._ingest_previews(pairs)
+
+    def _ingest_previews(self, pairs: Sequence[Tuple[ModelEntry, Path]]) -> None:
+        from src.services.preview_ingest import PreviewIngestor
+
+        ingestor = PreviewIngestor(
+            Path(self.config.app_data_dir), self.thumbnails, self.scheduler
+        )
+        ingestor.ingest_async(pairs, self._previews_ingested)
+
+    def _previews_ingested(self, results: List["IngestResult"]) -> None:
+        saved = False
+        for result in results:
+            if result.preview_path and result.model:
+                self.config.set_preview(result.model.relative_path, str(result.preview_path))
+                saved = True
+        if saved:
+            self.config_manager.save()
+        failed = [result for result in results if result.error]
+        if failed:
+            messagebox.showerror(
+                "预览图导入失败",
+                "\n".join(f"{result.source.name}: {result.error}" for result in failed[:10]),
+            )
+        self._load_models()
+
+    def _on_selection_change(self, count: int) -> None:
+        if self.move_button:
+            self.move_button.configure(text=f"移动所选 ({count})" if count else "移动所选")
+
+    def _open_move(self) -> None:
+        models = self.grid.selected_models() if self.grid else []
+        if not models:
+            messagebox.showinfo("移动模型", "按住 Ctrl 点击模型卡片即可多选")
+            return
+        from src.models.model_roots import configured_roots
+        from src.ui.move_dialog import MoveDialog
+
+        dialog = MoveDialog(
+            self.root,
+            len(models),
+            [root.name for root in configured_roots(self.config)],
+            [item["id"] for item in self.config.model_types],
+            self.config.base_models,
+            self.selected_type,
+            self.selected_base,
+            lambda root, model_type, base: self._move_models(models, root, model_type, base),
+        )
+        dialog.grab_set()
+
+    def _move_models(
+        self, models: List[ModelEntry], root_name: str, model_type: str, base_model: str
+    ) -> None:
+        from src.models.model_roots import configured_roots
+        from src.services.relocator import RelocateError, Relocator, plan_moves
+
+        try:
+            plans = plan_moves(
+                models, configured_roots(self.config), root_name, model_type, base_model
+            )
+        except RelocateError as exc:
+            messagebox.showerror("移动失败", str(exc))
+            return
+        relocator = Relocator(self.config_manager, self.config.tier_bandwidth_mb * 1024 * 1024)
+
+        self.scheduler.submit(
+            lambda: relocator.transfer(plans),
+            priority=PRIORITY_INTERACTIVE,
+            name="move models",
+            on_done=lambda job: self._models_moved(relocator, job),
+        )
+
+    def _models_moved(self, relocator: "Relocator", job: Job) -> None:
+        results: List["MoveResult"] = job.result or []
+        relocator.commit(results)
+        failed = [result for result in results if not result.ok]
+        if job.error is not None or job.result is None:
+            messagebox.showerror("移动失败", str(job.error or job.status))
+        elif failed:
+            messagebox.showerror(
+                "移动失败",
+                "\n".join(f"{result.plan.model.name}: {result.error}" for result in failed[:10]),
+            )
+        if self.grid:
+            self.grid.clear_selection()
         self._load_models()
 
     def _delete_model(self, model: ModelEntry) -> None:
@@ -219,8 +685,11 @@ class ComfyModelManagerApp:
         if model.relative_path in self.config.models_metadata:
             self.config.models_metadata.pop(model.relative_path)
             self.config_manager.save()
+        self.models = [item for item in self.models if item.relative_path != model.relative_path]
+        self._refresh_view()
         self._load_models()
 
     def _save_notes(self, model: ModelEntry, notes: str) -> None:
         self.config.set_notes(model.relative_path, notes)
         self.config_manager.save()
+        self._sync_search_index()
@@ -0,0 +1,896 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, TextIO
+
+from src.config import AppConfig, ConfigManager, default_config_path
+from src.models.catalog import (
+    ModelCatalog,
+    catalog_snapshot_path,
+    load_snapshot,
+    save_snapshot,
+)
+from src.models.model_scanner import ModelEntry, ModelScanner
+from src.services import tracing
+from src.services.block_manifest import downloaded_sha256, manifests_dir
+from src.services.hf_downloader import DownloadRequest, HFDownloader
+from src.services.metrics import REGISTRY, MetricsExporter, metrics_dir, read_snapshots
+from src.services.model_hashes import cached_hash, find_duplicates, hash_models
+from src.utils.file_utils import file_size_display, safe_relative_path, text_hash
+
+
+@dataclass
+class DownloadJob:
+    repo_id: str
+    filename: str
+    model_type: str
+    base_model: str
+    line: int = 0
+    overwrite: bool = False
+    name: str = ""
+    sha256: str = ""
+
+
+@dataclass
+class DownloadOutcome:
+    job: DownloadJob
+    success: bool
+    message: str = ""
+    model_path: Optional[str] = None
+    readme_path: Optional[str] = None
+
+
+@dataclass
+class _JobProgress:
+    downloaded: int = 0
+    total: int = 0
+    speed: float = 0.0
+
+
+@dataclass
+class BatchProgress:
+    stream: TextIO
+    job_count: int
+    interval: float = 1.0
+    finished: int = 0
+    failed: int = 0
+    jobs: Dict[int, _JobProgress] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+
+    def update(self, index: int, downloaded: int, total: int, speed: float) -> None:
+        with self._lock:
+            progress = self.jobs.setdefault(index, _JobProgress())
+            progress.downloaded, progress.total, progress.speed = downloaded, total, speed
+            self._report(force=False)
+
+    def done(self, outcome: DownloadOutcome) -> None:
+        with self._lock:
+            self.finished += 1
+            if not outcome.success:
+                self.failed += 1
+            self.jobs.pop(outcome.job.line, None)
+            status = "ok" if outcome.success else f"failed: {outcome.message}"
+            self.stream.write(
+                f"[{self.finished}/{self.job_count}] {outcome.job.repo_id}/"
+                f"{outcome.job.filename} {status}\n"
+            )
+            self._report(force=True)
+
+    def _report(self, force: bool) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_report < self.interval:
+            return
+        self._last_report = now
+        downloaded = sum(item.downloaded for item in self.jobs.values())
+        total = sum(item.total for item in self.jobs.values())
+        speed = sum(item.speed for item in self.jobs.values())
+        self.stream.write(
+            f"  {self.finished}/{self.job_count} done, {self.failed} failed, "
+            f"{len(self.jobs)} active: {file_size_display(downloaded)}/"
+            f"{file_size_display(total)} at {file_size_display(int(speed))}/s\n"
+        )
+        self.stream.flush()
+
+
+def read_manifest(path: Path) -> List[DownloadJob]:
+    jobs: List[DownloadJob] = []
+    for number, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            item = json.loads(line)
+            action = item.get("action", "add")
+            # Removals and models without a Hugging Face source in a diff plan are not downloads.
+            if action == "remove" or ("action" in item and not item.get("repo_id")):
+                continue
+            jobs.append(
+                DownloadJob(
+                    repo_id=item["repo_id"],
+                    filename=item["filename"],
+                    model_type=item["model_type"],
+                    base_model=item["base_model"],
+                    line=number,
+                    overwrite=action == "replace",
+                    name=item.get("name", ""),
+                    sha256=item.get("sha256", ""),
+                )
+            )
+        except (ValueError, KeyError, TypeError) as exc:
+            raise ValueError(f"{path}:{number}: invalid manifest entry ({exc})") from exc
+    return jobs
+
+
+def download_jobs(
+    config_manager: ConfigManager,
+    jobs: Sequence[DownloadJob],
+    concurrency: int = 4,
+    skip_existing: bool = True,
+    stream: Optional[TextIO] = None,
+) -> List[DownloadOutcome]:
+    config = config_manager.config
+    models_root = Path(config.comfyui_models_dir)
+    type_ids = {item["id"] for item in config.model_types}
+    progress = BatchProgress(stream or sys.stderr, len(jobs))
+    save_lock = threading.Lock()
+
+    def run(job: DownloadJob) -> DownloadOutcome:
+        if job.model_type not in type_ids:
+            outcome = DownloadOutcome(job, False, f"unknown model type {job.model_type}")
+            progress.done(outcome)
+            return outcome
+        target_dir = models_root / job.model_type / job.base_model
+        target_path = target_dir / (job.name or job.filename)
+        if skip_existing and not job.overwrite and target_path.exists():
+            outcome = DownloadOutcome(job, True, "exists", model_path=str(target_path))
+            progress.done(outcome)
+            return outcome
+
+        request = DownloadRequest(
+            repo_id=job.repo_id,
+            filename=job.filename,
+            model_type=job.model_type,
+            base_model=job.base_model,
+            target_dir=target_dir,
+            readme_dir=Path(config.app_data_dir) / "readmes" / text_hash(job.repo_id),
+            token=config.hf_token,
+            endpoints=list(config.hf_endpoints),
+            manifest_dir=manifests_dir(Path(config.app_data_dir)),
+            peers=list(config.peer_urls),
+            target_name=job.name,
+            sha256=job.sha256,
+        )
+        result: Dict[str, DownloadOutcome] = {}
+
+        def complete(success: bool, message: str, readme: Optional[str], model: Optional[str]):
+            result["outcome"] = DownloadOutcome(job, success, message, model, readme)
+
+        HFDownloader().download_async(
+            request,
+            progress_cb=lambda done, total, speed: progress.update(job.line, done, total, speed),
+            completion_cb=complete,
+        ).wait()
+        outcome = result.get("outcome") or DownloadOutcome(job, False, "download_failed")
+        if outcome.success and outcome.model_path:
+            model_path = Path(outcome.model_path)
+            with save_lock:
+                config.add_metadata(
+                    relative_path=safe_relative_path(models_root, model_path),
+                    repo_id=job.repo_id,
+                    filename=Path(job.filename).name,
+                    readme_path=outcome.readme_path or "",
+                    sha256=downloaded_sha256(
+                        request.manifest_dir, job.repo_id, job.filename, model_path
+                    ),
+                )
+                config_manager.save()
+        progress.done(outcome)
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        return list(pool.map(run, jobs))
+
+
+def _filter(models: List[ModelEntry], args: argparse.Namespace) -> List[ModelEntry]:
+    model_type = getattr(args, "type", None)
+    base_model = getattr(args, "base", None)
+    return [
+        model
+        for model in models
+        if (not model_type or model.model_type == model_type)
+        and (not base_model or model.base_model == base_model)
+    ]
+
+
+def _scan(config: AppConfig) -> List[ModelEntry]:
+    models = ModelScanner(config).scan()
+    save_snapshot(catalog_snapshot_path(Path(config.app_data_dir)), models)
+    return models
+
+
+def _require_models_dir(config: AppConfig) -> None:
+    if not config.comfyui_models_dir:
+        raise SystemExit("comfyui_models_dir is not configured")
+
+
+def cmd_scan(manager: ConfigManager, args: argparse.Namespace) -> int:
+    _require_models_dir(manager.config)
+    models = _scan(manager.config)
+    counts: Dict[str, int] = {}
+    for model in models:
+        counts[model.model_type] = counts.get(model.model_type, 0) + 1
+    for model_type, count in sorted(counts.items()):
+        print(f"{model_type}\t{count}")
+    total = sum(model.size_bytes for model in models)
+    print(f"total\t{len(models)}\t{file_size_display(total)}")
+    return 0
+
+
+def cmd_list(manager: ConfigManager, args: argparse.Namespace) -> int:
+    _require_models_dir(manager.config)
+    models = _filter(_scan(manager.config), args)
+    if args.json:
+        payload = []
+        for model in models:
+            item = asdict(model)
+            item["sha256"] = cached_hash(manager.config, model) or ""
+            payload.append(item)
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return 0
+    for model in models:
+        print(
+            f"{model.model_type}\t{model.base_model}\t"
+            f"{file_size_display(model.size_bytes)}\t{model.relative_path}"
+        )
+    return 0
+
+
+def cmd_hash(manager: ConfigManager, args: argparse.Namespace) -> int:
+    _require_models_dir(manager.config)
+    models = _filter(_scan(manager.config), args)
+
+    def on_hashed(model: ModelEntry, sha256: str) -> None:
+        sys.stderr.write(f"hashed {model.relative_path}\n")
+
+    hashes = hash_models(manager.config, models, args.workers, on_hashed)
+    manager.save()
+    for model in models:
+        print(f"{hashes[model.relative_path]}  {model.relative_path}")
+    return 0
+
+
+def cmd_dupes(manager: ConfigManager, args: argparse.Namespace) -> int:
+    _require_models_dir(manager.config)
+    models = _filter(_scan(manager.config), args)
+    groups = find_duplicates(manager.config, models, args.workers)
+    manager.save()
+    if args.json:
+        payload = [
+            {
+                "sha256": cached_hash(manager.config, group[0]),
+                "size_bytes": group[0].size_bytes,
+                "paths": [model.relative_path for model in group],
+            }
+            for group in groups
+        ]
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return 0
+    for group in groups:
+        wasted = group[0].size_bytes * (len(group) - 1)
+        print(f"{cached_hash(manager.config, group[0])} ({file_size_display(wasted)} redundant)")
+        for model in group:
+            print(f"  {model.relative_path}")
+    return 0
+
+
+def cmd_download(manager: ConfigManager, args: argparse.Namespace) -> int:
+    _require_models_dir(manager.config)
+    if args.manifest:
+        if args.repo_id or args.filename:
+            raise SystemExit("use either --manifest or repo_id/filename, not both")
+        try:
+            jobs = read_manifest(Path(args.manifest))
+        except (OSError, ValueError) as exc:
+            raise SystemExit(str(exc)) from exc
+    else:
+        if not (args.repo_id and args.filename and args.type and args.base):
+            raise SystemExit("download needs repo_id, filename, --type and --base")
+        jobs = [DownloadJob(args.repo_id, args.filename, args.type, args.base)]
+
+    outcomes = download_jobs(manager, jobs, args.concurrency, not args.force)
+    return 0 if all(outcome.success for outcome in outcomes) else 1
+
+
+def cmd_serve(manager: ConfigManager, args: argparse.Namespace) -> int:
+    from src.services.catalog_server import CatalogServer
+
+    _require_models_dir(manager.config)
+    snapshot_path = catalog_snapshot_path(Path(manager.config.app_data_dir))
+    # Wall-clock milliseconds keep ETags from an earlier run from matching.
+    generation = time.time_ns() // 1_000_000
+    catalog = ModelCatalog(load_snapshot(snapshot_path), generation)
+
+    def describe(model: ModelEntry) -> Dict:
+        item = asdict(model)
+        item["sha256"] = cached_hash(manager.config, model) or ""
+        return item
+
+    def recorded_hashes(models: List[ModelEntry]) -> Dict[str, str]:
+        return {model.relative_path: cached_hash(manager.config, model) or "" for model in models}
+
+    hashes = recorded_hashes(catalog.snapshot()[1])
+
+    server = CatalogServer(catalog, args.host, args.port, describe)
+    server.start()
+    sys.stderr.write(f"serving catalog on {server.url}\n")
+    peer = None
+    if args.peer:
+        from src.services.peer_cache import PeerServer, build_index
+
+        peer = PeerServer(args.peer_host, args.peer_port)
+        peer.start()
+        sys.stderr.write(f"serving model files to peers on {peer.url}\n")
+    try:
+        while True:
+            manager.load()
+            models = ModelScanner(manager.config).scan()
+            diff = catalog.replace(models)
+            if not diff.is_empty:
+                save_snapshot(snapshot_path, models)
+            # Hashes recorded by `hash` change the served payload without changing any entry.
+            current = recorded_hashes(models)
+            catalog.mark_changed(
+                [
+                    key
+                    for key, sha256 in current.items()
+                    if hashes.get(key, sha256) != sha256 and key not in diff.changed
+                ]
+            )
+            hashes = current
+            if peer:
+                peer.set_index(build_index(manager.config, models))
+            time.sleep(args.rescan)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        if peer:
+            peer.shutdown()
+    return 0
+
+
+def _copy_progress(label: str):
+    last = [0.0]
+
+    def report(copied: int, total: int) -> None:
+        now = time.monotonic()
+        if copied < total and now - last[0] < 1.0:
+            return
+        last[0] = now
+        sys.stderr.write(
+            f"  {label}: {file_size_display(copied)}/{file_size_display(total)}\n"
+        )
+
+    return report
+
+
+def cmd_tier(manager: ConfigManager, args: argparse.Namespace) -> int:
+    from src.services.tiering import TierError, TierManager
+
+    _require_models_dir(manager.config)
+    try:
+        tiers = TierManager(manager.config)
+    except TierError as exc:
+        raise SystemExit(str(exc)) from exc
+    models = _filter(_scan(manager.config), args)
+    by_key = {model.relative_path: model for model in models}
+
+    if args.action == "touch":
+        for key in args.keys:
+            tiers.access_log.record(key)
+        tiers.access_log.save()
+        return 0
+
+    if args.action == "plan":
+        candidates = tiers.cold_candidates(models, args.days)[: args.limit or None]
+        if args.json:
+            payload = [
+                {
+                    "relative_path": item.model.relative_path,
+                    "size_bytes": item.model.size_bytes,
+                    "idle_days": round(item.idle_days, 1),
+                }
+                for item in candidates
+            ]
+            print(json.dumps(payload, ensure_ascii=False, indent=2))
+            return 0
+        for item in candidates:
+            print(
+                f"{item.idle_days:.0f}d\t{file_size_display(item.model.size_bytes)}\t"
+                f"{item.model.relative_path}"
+            )
+        total = sum(item.model.size_bytes for item in candidates)
+        print(f"total\t{len(candidates)}\t{file_size_display(total)}")
+        return 0
+
+    if args.action == "demote":
+        if args.keys:
+            selected = [by_key[key] for key in args.keys if key in by_key]
+        else:
+            candidates = tiers.cold_candidates(models, args.days)[: args.limit or None]
+            selected = [item.model for item in candidates]
+        move = tiers.demote
+    else:
+        selected = [by_key[key] for key in args.keys if key in by_key]
+        move = tiers.promote
+    missing = [key for key in args.keys if key not in by_key]
+    for key in missing:
+        sys.stderr.write(f"unknown model {key}\n")
+
+    failed = bool(missing)
+    for model in selected:
+        try:
+            path = move(model, _copy_progress(model.relative_path))
+        except (OSError, TierError) as exc:
+            failed = True
+            sys.stderr.write(f"{model.relative_path}: {exc}\n")
+            continue
+        print(f"{args.action}d\t{model.relative_path}\t{path}")
+    return 1 if failed else 0
+
+
+def cmd_warm(manager: ConfigManager, args: argparse.Namespace) -> int:
+    from src.services import page_cache
+
+    _require_models_dir(manager.config)
+    if not (args.keys or args.type or args.base):
+        raise SystemExit("select models by key or with --type/--base")
+    models = _filter(_scan(manager.config), args)
+    if args.keys:
+        wanted = set(args.keys)
+        models = [model for model in models if model.relative_path in wanted]
+    if not models:
+        raise SystemExit("no matching models")
+
+    def show(residency: "page_cache.Residency", relative_path: str, extra: str = "") -> None:
+        percent = residency.percent
+        shown = "unknown" if percent is None else f"{percent:5.1f}%"
+        print(f"{shown}\t{file_size_display(residency.size_bytes)}\t{relative_path}{extra}")
+
+    failed = False
+    for model in models:
+        path = Path(model.absolute_path)
+        try:
+            if args.status:
+                show(page_cache.residency(path), model.relative_path)
+            elif args.evict:
+                show(page_cache.evict(path), model.relative_path)
+            else:
+                progress = _copy_progress(model.relative_path)
+                result = page_cache.warm_file(path, args.workers, progress)
+                speed = result.bytes_read / max(result.seconds, 1e-6)
+                show(
+                    result.residency,
+                    model.relative_path,
+                    f"\t{result.seconds:.1f}s {file_size_display(int(speed))}/s",
+                )
+        except OSError as exc:
+            failed = True
+            sys.stderr.write(f"{model.relative_path}: {exc}\n")
+    return 1 if failed else 0
+
+
+def cmd_move(manager: ConfigManager, args: argparse.Namespace) -> int:
+    from src.models.model_roots import configured_roots
+    from src.services.relocator import RelocateError, Relocator, plan_moves
+
+    _require_models_dir(manager.config)
+    if not (args.keys or args.type or args.base):
+        raise SystemExit("select models by key or with --type/--base")
+    if not (args.to_root is not None or args.to_type or args.to_base):
+        raise SystemExit("give at least one of --to-root, --to-type, --to-base")
+    models = _filter(_scan(manager.config), args)
+    if args.keys:
+        wanted = set(args.keys)
+        models = [model for model in models if model.relative_path in wanted]
+        for key in sorted(wanted - {model.relative_path for model in models}):
+            sys.stderr.write(f"unknown model {key}\n")
+    try:
+        plans = plan_moves(
+            models, configured_roots(manager.config), args.to_root, args.to_type, args.to_base
+        )
+    except RelocateError as exc:
+        raise SystemExit(str(exc)) from exc
+
+    reporters: Dict[str, Callable[[int, int], None]] = {}
+
+    def progress(model: ModelEntry, copied: int, total: int) -> None:
+        key = model.relative_path
+        if key not in reporters:
+            reporters[key] = _copy_progress(key)
+        reporters[key](copied, total)
+
+    results = Relocator(manager, manager.config.tier_bandwidth_mb * 1024 * 1024).move(
+        plans, progress
+    )
+    for result in results:
+        if result.ok:
+            print(f"{result.method}\t{result.plan.model.relative_path}\t{result.plan.new_key}")
+        else:
+            sys.stderr.write(f"{result.plan.model.relative_path}: {result.error}\n")
+    return 0 if all(result.ok for result in results) else 1
+
+
+def cmd_verify(manager: ConfigManager, args: argparse.Namespace) -> int:
+    from src.services.integrity import STATUS_OK, check_models, record_results
+
+    _require_models_dir(manager.config)
+    models = _filter(_scan(manager.config), args)
+    if args.keys:
+        wanted = set(args.keys)
+        models = [model for model in models if model.relative_path in wanted]
+    started = time.monotonic()
+    results = check_models(manager.config, models, args.deep, args.workers)
+    record_results(manager.config, results)
+    manager.save()
+
+    broken = [result for result in results if result.broken]
+    if args.json:
+        payload = [
+            {
+                "relative_path": result.model.relative_path,
+                "status": result.status,
+                "detail": result.detail,
+            }
+            for result in results
+            if args.all or result.status != STATUS_OK
+        ]
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+    else:
+        for result in results:
+            if args.all or result.status != STATUS_OK:
+                print(f"{result.status}\t{result.model.relative_path}\t{result.detail}")
+    sys.stderr.write(
+        f"checked {len(results)} files, {len(broken)} broken "
+        f"in {time.monotonic() - started:.1f}s\n"
+    )
+    return 1 if broken else 0
+
+
+def cmd_repair(manager: ConfigManager, args: argparse.Namespace) -> int:
+    from src.services.block_manifest import BlockManifest, RepairError, manifest_path, repair_file
+    from src.services.integrity import STATUS_OK
+
+    config = manager.config
+    _require_models_dir(config)
+    if not (args.keys or args.type or args.base):
+        raise SystemExit("select models by key or with --type/--base")
+    models = _filter(_scan(config), args)
+    if args.keys:
+        wanted = set(args.keys)
+        models = [model for model in models if model.relative_path in wanted]
+        for key in sorted(wanted - {model.relative_path for model in models}):
+            sys.stderr.write(f"unknown model {key}\n")
+
+    directory = manifests_dir(Path(config.app_data_dir))
+    failed = False
+    for model in models:
+        metadata = config.models_metadata.get(model.relative_path) or {}
+        if metadata.get("converted_from"):
+            failed = True
+            sys.stderr.write(
+                f"{model.relative_path}: converted from {metadata['converted_from']}, "
+                "not a download\n"
+            )
+            continue
+        path = manifest_path(directory, metadata.get("repo_id", ""), metadata.get("filename", ""))
+        if not path.exists():
+            failed = True
+            sys.stderr.write(f"{model.relative_path}: no block manifest\n")
+            continue
+        target = Path(model.absolute_path)
+        try:
+            manifest = BlockManifest.load(path)
+            if (
+                Path(manifest.filename).name != model.name
+                or metadata.get("download_sha256") != manifest.sha256
+            ):
+                raise RepairError("block manifest does not describe this file")
+            result = repair_file(
+                target,
+                manifest,
+                list(config.hf_endpoints),
+                config.hf_token,
+                args.workers,
+                lambda done, total, key=model.relative_path: sys.stderr.write(
+                    f"  {key}: {done}/{total} blocks fetched\n"
+                ),
+            )
+        except (OSError, ValueError, TypeError, RepairError) as exc:
+            failed = True
+            sys.stderr.write(f"{model.relative_path}: {exc}\n")
+            continue
+        stat = target.stat()
+        config.set_hash(model.relative_path, result.sha256, stat.st_size, stat.st_mtime_ns)
+        config.set_integrity(model.relative_path, STATUS_OK, "", stat.st_size)
+        manager.save()
+        print(
+            f"{'repaired' if result.damaged else 'ok'}\t{model.relative_path}\t"
+            f"{len(result.damaged)}/{result.blocks_total} blocks\t"
+            f"{file_size_display(result.bytes_fetched)}"
+        )
+    return 1 if failed else 0
+
+
+def cmd_convert(manager: ConfigManager, args: argparse.Namespace) -> int:
+    from src.services.precision import conversion_target, convert_many, register_conversion
+
+    _require_models_dir(manager.config)
+    if not (args.keys or args.type or args.base):
+        raise SystemExit("select models by key or with --type/--base")
+    models = _filter(_scan(manager.config), args)
+    if args.keys:
+        wanted = set(args.keys)
+        models = [model for model in models if model.relative_path in wanted]
+        for key in sorted(wanted - {model.relative_path for model in models}):
+            sys.stderr.write(f"unknown model {key}\n")
+    models = [model for model in models if model.name.lower().endswith(".safetensors")]
+    if not models:
+        raise SystemExit("no matching .safetensors models")
+
+    pairs = [
+        (Path(model.absolute_path), conversion_target(Path(model.absolute_path), args.dtype))
+        for model in models
+    ]
+    failed = False
+    for model, result in zip(models, convert_many(pairs, args.dtype, args.workers, args.force)):
+        if result.error:
+            failed = True
+            sys.stderr.write(f"{model.relative_path}: {result.error}\n")
+            continue
+        key = register_conversion(manager.config, model.relative_path, result)
+        manager.save()
+        extra = f"\t{result.overflowed} overflowed" if result.overflowed else ""
+        print(
+            f"{file_size_display(result.bytes_in)} -> {file_size_display(result.bytes_out)}\t"
+            f"{result.seconds:.1f}s\t{model.relative_path}\t{key}{extra}"
+        )
+    return 1 if failed else 0
+
+
+def cmd_fingerprint(manager: ConfigManager, args: argparse.Namespace) -> int:
+    from src.services.fingerprint import build_fingerprint, fingerprint_path, save_fingerprint
+
+    _require_models_dir(manager.config)
+    models = _scan(manager.config)
+    if args.hash:
+        hash_models(manager.config, models, args.workers)
+        manager.save()
+    fingerprint = build_fingerprint(manager.config, models)
+    output = args.output or fingerprint_path(Path(manager.config.app_data_dir))
+    save_fingerprint(output, fingerprint)
+    print(f"{fingerprint.root.hash}  {output}")
+    if fingerprint.unhashed:
+        sys.stderr.write(
+            f"{fingerprint.unhashed} of {fingerprint.models} models have no recorded sha256 "
+            "and are compared by size only (use --hash)\n"
+        )
+    return 0
+
+
+def cmd_diff(manager: ConfigManager, args: argparse.Namespace) -> int:
+    from src.services.fingerprint import build_fingerprint, diff_fingerprints, load_fingerprint
+
+    if len(args.fingerprints) > 2:
+        raise SystemExit("diff takes one or two fingerprint files")
+    try:
+        fingerprints = [load_fingerprint(Path(path)) for path in args.fingerprints]
+    except (OSError, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
+    if len(fingerprints) == 1:
+        _require_models_dir(manager.config)
+        fingerprints.insert(0, build_fingerprint(manager.config, _scan(manager.config)))
+    current, target = fingerprints
+    if current.unhashed or target.unhashed:
+        sys.stderr.write(
+            f"{current.unhashed + target.unhashed} models have no recorded sha256 "
+            "and are compared by size only (run fingerprint --hash)\n"
+        )
+
+    plan = diff_fingerprints(current, target)
+    for item in plan:
+        print(json.dumps(asdict(item), ensure_ascii=False))
+    counts = {"add": 0, "remove": 0, "replace": 0}
+    for item in plan:
+        counts[item.action] += 1
+    manual = sum(1 for item in plan if item.action != "remove" and not item.repo_id)
+    sys.stderr.write(
+        f"{counts['add']} to add, {counts['remove']} to remove, {counts['replace']} to replace"
+        + (f", {manual} without a Hugging Face source" if manual else "")
+        + "\n"
+    )
+    return 1 if plan else 0
+
+
+def cmd_metrics(manager: ConfigManager, args: argparse.Namespace) -> int:
+    directory = metrics_dir(Path(manager.config.app_data_dir))
+    if args.json:
+        print(json.dumps(read_snapshots(directory), ensure_ascii=False, indent=2))
+        return 0
+    for path in sorted(directory.glob("*.prom")):
+        sys.stdout.write(path.read_text(encoding="utf-8"))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="comfy-model-manager", description="Headless ComfyModelManager commands"
+    )
+    parser.add_argument("--config", type=Path, default=None, help="config.json path")
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="record a Chrome trace-event file in app_data_dir/diagnostics",
+    )
+    parser.add_argument("--trace-file", type=Path, help="record the trace to this path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="scan the models directory and refresh the catalog")
+    scan.set_defaults(handler=cmd_scan)
+
+    listing = commands.add_parser("list", help="list installed models")
+    listing.add_argument("--type")
+    listing.add_argument("--base")
+    listing.add_argument("--json", action="store_true")
+    listing.set_defaults(handler=cmd_list)
+
+    hashing = commands.add_parser("hash", help="record sha256 hashes in the metadata")
+    hashing.add_argument("--type")
+    hashing.add_argument("--base")
+    hashing.add_argument("--workers", type=int, default=4)
+    hashing.set_defaults(handler=cmd_hash)
+
+    dupes = commands.add_parser("dupes", help="report byte-identical model files")
+    dupes.add_argument("--type")
+    dupes.add_argument("--base")
+    dupes.add_argument("--workers", type=int, default=4)
+    dupes.add_argument("--json", action="store_true")
+    dupes.set_defaults(handler=cmd_dupes)
+
+    download = commands.add_parser("download", help="download from Hugging Face")
+    download.add_argument("repo_id", nargs="?")
+    download.add_argument("filename", nargs="?")
+    download.add_argument("--type")
+    download.add_argument("--base")
+    download.add_argument("--manifest", help="JSON lines with repo_id, filename, model_type, base_model")
+    download.add_argument("--concurrency", type=int, default=4)
+    download.add_argument("--force", action="store_true", help="re-download existing files")
+    download.set_defaults(handler=cmd_download)
+
+    tier = commands.add_parser("tier", help="move cold models to the slow tier and back")
+    tier.add_argument("action", choices=["plan", "demote", "promote", "touch"])
+    tier.add_argument("keys", nargs="*", help="model keys (relative paths)")
+    tier.add_argument("--type")
+    tier.add_argument("--base")
+    tier.add_argument("--days", type=float, default=None, help="idle days before a model is cold")
+    tier.add_argument("--limit", type=int, default=0, help="maximum number of models")
+    tier.add_argument("--json", action="store_true")
+    tier.set_defaults(handler=cmd_tier)
+
+    warm = commands.add_parser("warm", help="pre-read models into the OS page cache")
+    warm.add_argument("keys", nargs="*", help="model keys (relative paths)")
+    warm.add_argument("--type")
+    warm.add_argument("--base")
+    warm.add_argument("--workers", type=int, default=4)
+    mode = warm.add_mutually_exclusive_group()
+    mode.add_argument("--status", action="store_true", help="only report resident percentage")
+    mode.add_argument("--evict", action="store_true", help="drop the files from the page cache")
+    warm.set_defaults(handler=cmd_warm)
+
+    move = commands.add_parser("move", help="move models to another base folder or root")
+    move.add_argument("keys", nargs="*", help="model keys (relative paths)")
+    move.add_argument("--type")
+    move.add_argument("--base")
+    move.add_argument("--to-root", help="target root name ('' for the main models directory)")
+    move.add_argument("--to-type")
+    move.add_argument("--to-base")
+    move.set_defaults(handler=cmd_move)
+
+    verify = commands.add_parser("verify", help="check model files for truncation and corruption")
+    verify.add_argument("keys", nargs="*", help="model keys (relative paths)")
+    verify.add_argument("--type")
+    verify.add_argument("--base")
+    verify.add_argument("--deep", action="store_true", help="also compare recorded sha256")
+    verify.add_argument("--workers", type=int, default=16)
+    verify.add_argument("--all", action="store_true", help="also list files that passed")
+    verify.add_argument("--json", action="store_true")
+    verify.set_defaults(handler=cmd_verify)
+
+    repair = commands.add_parser(
+        "repair", help="re-fetch only the damaged blocks of downloaded models"
+    )
+    repair.add_argument("keys", nargs="*", help="model keys (relative paths)")
+    repair.add_argument("--type")
+    repair.add_argument("--base")
+    repair.add_argument("--workers", type=int, default=4)
+    repair.set_defaults(handler=cmd_repair)
+
+    convert = commands.add_parser(
+        "convert", help="rewrite fp32 .safetensors models at half precision"
+    )
+    convert.add_argument("keys", nargs="*", help="model keys (relative paths)")
+    convert.add_argument("--type")
+    convert.add_argument("--base")
+    convert.add_argument("--dtype", choices=["fp16", "bf16"], default="fp16")
+    convert.add_argument("--workers", type=int, default=1, help="processes for batch runs")
+    convert.add_argument("--force", action="store_true", help="overwrite existing outputs")
+    convert.set_defaults(handler=cmd_convert)
+
+    fingerprint = commands.add_parser(
+        "fingerprint", help="export a Merkle-tree fingerprint of the model library"
+    )
+    fingerprint.add_argument("--output", type=Path, help="default: app_data_dir/fingerprint.json")
+    fingerprint.add_argument("--hash", action="store_true", help="hash models without a sha256")
+    fingerprint.add_argument("--workers", type=int, default=4)
+    fingerprint.set_defaults(handler=cmd_fingerprint)
+
+    diff = commands.add_parser(
+        "diff", help="print the add/remove/replace plan between two fingerprints"
+    )
+    diff.add_argument(
+        "fingerprints",
+        nargs="+",
+        help="[current] target; the current library is used when only one is given",
+    )
+    diff.set_defaults(handler=cmd_diff)
+
+    serve = commands.add_parser("serve", help="serve the catalog as JSON over HTTP")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--rescan", type=float, default=30.0, help="seconds between scans")
+    serve.add_argument("--peer", action="store_true", help="also serve hashed model files")
+    serve.add_argument("--peer-host", default="0.0.0.0")
+    serve.add_argument("--peer-port", type=int, default=8766)
+    serve.set_defaults(handler=cmd_serve)
+
+    metrics = commands.add_parser("metrics", help="print the exported metrics of all processes")
+    metrics.add_argument("--json", action="store_true")
+    metrics.set_defaults(handler=cmd_metrics)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.trace or args.trace_file:
+        tracer = tracing.enable(args.trace_file)
+    else:
+        tracer = tracing.enable_from_env()
+    manager = ConfigManager(args.config or default_config_path())
+    manager.load()
+    if tracer and tracer.output is None:
+        tracer.output = tracing.trace_path(Path(manager.config.app_data_dir) / "diagnostics")
+    if args.handler is cmd_metrics:
+        return cmd_metrics(manager, args)
+    exporter = MetricsExporter(
+        REGISTRY, metrics_dir(Path(manager.config.app_data_dir)), f"cli_{args.command}"
+    )
+    exporter.start()
+    try:
+        return args.handler(manager, args)
+    finally:
+        exporter.stop()
+        if tracer:
+            tracing.disable()
+            print(f"trace: {tracer.export()}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
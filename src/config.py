@@ -1,9 +1,13 @@
 import json
+import os
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from src.services import metrics, tracing
+
 
 MODEL_DIR_CHECKPOINTS = "checkpoints"
 MODEL_DIR_LORAS = "loras"
@@ -25,6 +29,18 @@ DEFAULT_MODEL_TYPES = [
 
 DEFAULT_BASE_MODELS = ["SD 1.5", "SDXL", "FLUX", "SD 3.x", "Kolors", "HunyuanDiT"]
 
+DEFAULT_HF_ENDPOINT = "https://huggingface.co"
+
+FILE_STATE_KEYS = (
+    "sha256",
+    "hash_size",
+    "hash_mtime",
+    "integrity",
+    "integrity_detail",
+    "integrity_size",
+)
+DOWNLOAD_IDENTITY_KEYS = ("repo_id", "filename", "readme", "download_sha256")
+
 
 def default_app_data_dir() -> Path:
     return Path.home() / ".comfy-model-manager" / "data"
@@ -39,6 +55,13 @@ class AppConfig:
     comfyui_models_dir: str = ""
     app_data_dir: str = str(default_app_data_dir())
     hf_token: str = ""
+    hf_endpoints: List[str] = field(default_factory=lambda: [DEFAULT_HF_ENDPOINT])
+    extra_model_roots: List[Dict[str, str]] = field(default_factory=list)
+    extra_model_paths_yaml: str = ""
+    slow_tier_dir: str = ""
+    tier_cold_days: int = 90
+    tier_bandwidth_mb: float = 0.0
+    peer_urls: List[str] = field(default_factory=list)
     model_types: List[Dict[str, str]] = field(default_factory=lambda: list(DEFAULT_MODEL_TYPES))
     base_models: List[str] = field(default_factory=lambda: list(DEFAULT_BASE_MODELS))
     models_metadata: Dict[str, Dict[str, str]] = field(default_factory=dict)
@@ -48,6 +71,13 @@ class AppConfig:
             "comfyui_models_dir": self.comfyui_models_dir,
             "app_data_dir": self.app_data_dir,
             "hf_token": self.hf_token,
+            "hf_endpoints": self.hf_endpoints,
+            "extra_model_roots": self.extra_model_roots,
+            "extra_model_paths_yaml": self.extra_model_paths_yaml,
+            "slow_tier_dir": self.slow_tier_dir,
+            "tier_cold_days": self.tier_cold_days,
+            "tier_bandwidth_mb": self.tier_bandwidth_mb,
+            "peer_urls": self.peer_urls,
             "model_types": self.model_types,
             "base_models": self.base_models,
             "models_metadata": self.models_metadata,
@@ -59,6 +89,13 @@ class AppConfig:
         config.comfyui_models_dir = payload.get("comfyui_models_dir", "")
         config.app_data_dir = payload.get("app_data_dir", str(default_app_data_dir()))
         config.hf_token = payload.get("hf_token", "")
+        config.hf_endpoints = payload.get("hf_endpoints", [DEFAULT_HF_ENDPOINT])
+        config.extra_model_roots = payload.get("extra_model_roots", [])
+        config.extra_model_paths_yaml = payload.get("extra_model_paths_yaml", "")
+        config.slow_tier_dir = payload.get("slow_tier_dir", "")
+        config.tier_cold_days = payload.get("tier_cold_days", 90)
+        config.tier_bandwidth_mb = payload.get("tier_bandwidth_mb", 0.0)
+        config.peer_urls = payload.get("peer_urls", [])
         config.model_types = payload.get("model_types", list(DEFAULT_MODEL_TYPES))
         config.base_models = payload.get("base_models", list(DEFAULT_BASE_MODELS))
         config.models_metadata = payload.get("models_metadata", {})
@@ -70,7 +107,12 @@ class AppConfig:
         (base / "previews").mkdir(parents=True, exist_ok=True)
 
     def add_metadata(
-        self, relative_path: str, repo_id: str, filename: str, readme_path: str
+        self,
+        relative_path: str,
+        repo_id: str,
+        filename: str,
+        readme_path: str,
+        sha256: str = "",
     ) -> None:
         self.models_metadata[relative_path] = {
             "repo_id": repo_id,
@@ -78,6 +120,8 @@ class AppConfig:
             "readme": readme_path,
             "added_at": datetime.utcnow().isoformat(timespec="seconds"),
         }
+        if sha256:
+            self.models_metadata[relative_path]["download_sha256"] = sha256
 
     def set_preview(self, relative_path: str, preview_path: str) -> None:
         entry = self.models_metadata.get(relative_path)
@@ -93,12 +137,48 @@ class AppConfig:
             self.models_metadata[relative_path] = entry
         entry["notes"] = notes
 
+    def set_hash(self, relative_path: str, sha256: str, size: int, mtime_ns: int) -> None:
+        entry = self.models_metadata.get(relative_path)
+        if not entry:
+            entry = {}
+            self.models_metadata[relative_path] = entry
+        entry["sha256"] = sha256
+        entry["hash_size"] = str(size)
+        entry["hash_mtime"] = str(mtime_ns)
+
+    def set_integrity(self, relative_path: str, status: str, detail: str, size: int) -> None:
+        entry = self.models_metadata.get(relative_path)
+        if not entry:
+            entry = {}
+            self.models_metadata[relative_path] = entry
+        entry["integrity"] = status
+        entry["integrity_detail"] = detail
+        entry["integrity_size"] = str(size)
+
+    def copy_metadata(self, source: str, target: str, **extra: str) -> None:
+        entry = {
+            key: value
+            for key, value in self.models_metadata.get(source, {}).items()
+            if key not in FILE_STATE_KEYS and key not in DOWNLOAD_IDENTITY_KEYS
+        }
+        entry.update(extra)
+        self.models_metadata[target] = entry
+
+    def rename_metadata(self, renames: Dict[str, str]) -> None:
+        moved = {
+            new_key: self.models_metadata.pop(old_key)
+            for old_key, new_key in renames.items()
+            if old_key in self.models_metadata and old_key != new_key
+        }
+        self.models_metadata.update(moved)
+
 
 class ConfigManager:
     def __init__(self, config_path: Path) -> None:
         self.config_path = config_path
         self.config = AppConfig()
 
+    @tracing.traced("ConfigManager.load", "config")
     def load(self) -> AppConfig:
         if self.config_path.exists():
             payload = json.loads(self.config_path.read_text(encoding="utf-8"))
@@ -109,12 +189,18 @@ class ConfigManager:
         self.config.ensure_app_dirs()
         return self.config
 
+    @tracing.traced("ConfigManager.save", "config")
     def save(self) -> None:
+        started = time.perf_counter()
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        self.config_path.write_text(
+        temp = self.config_path.with_name(f"{self.config_path.name}.{os.getpid()}.tmp")
+        temp.write_text(
             json.dumps(self.config.to_dict(), ensure_ascii=False, indent=2),
             encoding="utf-8",
         )
+        os.replace(temp, self.config_path)
+        metrics.CONFIG_SAVES.inc()
+        metrics.CONFIG_SAVE_SECONDS.observe(time.perf_counter() - started)
 
     def update_paths(self, comfyui_models_dir: str, app_data_dir: Optional[str] = None) -> None:
         self.config.comfyui_models_dir = comfyui_models_dir
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Deque, List, Optional, Sequence, Tuple
+
+from src.models.model_scanner import ModelEntry
+
+
+SNAPSHOT_VERSION = 1
+CHANGE_LOG_SIZE = 256
+
+
+@dataclass
+class ModelDiff:
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def diff_models(old: Sequence[ModelEntry], new: Sequence[ModelEntry]) -> ModelDiff:
+    previous = {model.relative_path: model for model in old}
+    diff = ModelDiff()
+    seen = set()
+    for model in new:
+        key = model.relative_path
+        seen.add(key)
+        before = previous.get(key)
+        if before is None:
+            diff.added.append(key)
+        elif before != model:
+            diff.changed.append(key)
+    diff.removed = [key for key in previous if key not in seen]
+    return diff
+
+
+class ModelCatalog:
+    def __init__(self, models: Sequence[ModelEntry] = (), generation: int = 1) -> None:
+        self._models: List[ModelEntry] = list(models)
+        self._generation = generation
+        self._changes: Deque[Tuple[int, ModelDiff]] = deque(maxlen=CHANGE_LOG_SIZE)
+        self._condition = threading.Condition()
+
+    @property
+    def generation(self) -> int:
+        with self._condition:
+            return self._generation
+
+    def snapshot(self) -> Tuple[int, List[ModelEntry]]:
+        with self._condition:
+            return self._generation, self._models
+
+    def replace(self, models: Sequence[ModelEntry]) -> ModelDiff:
+        with self._condition:
+            diff = diff_models(self._models, models)
+            if diff.is_empty:
+                return diff
+            self._models = list(models)
+            self._generation += 1
+            self._changes.append((self._generation, diff))
+            self._condition.notify_all()
+            return diff
+
+    def mark_changed(self, keys: Sequence[str]) -> None:
+        if not keys:
+            return
+        with self._condition:
+            self._generation += 1
+            self._changes.append((self._generation, ModelDiff(changed=list(keys))))
+            self._condition.notify_all()
+
+    def changes_since(self, generation: int) -> Optional[ModelDiff]:
+        with self._condition:
+            return self._changes_since(generation)
+
+    def wait_for_change(
+        self, generation: int, timeout: float
+    ) -> Tuple[int, Optional[ModelDiff]]:
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._generation == generation:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            return self._generation, self._changes_since(generation)
+
+    def _changes_since(self, generation: int) -> Optional[ModelDiff]:
+        if generation == self._generation:
+            return ModelDiff()
+        if generation > self._generation:
+            return None
+        if not self._changes or self._changes[0][0] > generation + 1:
+            return None
+        added, removed, changed = {}, {}, {}
+        for entry_generation, diff in self._changes:
+            if entry_generation <= generation:
+                continue
+            for key in diff.added:
+                if key in removed:
+                    del removed[key]
+                    changed[key] = None
+                else:
+                    added[key] = None
+            for key in diff.changed:
+                if key not in added:
+                    changed[key] = None
+            for key in diff.removed:
+                changed.pop(key, None)
+                if key in added:
+                    del added[key]
+                else:
+                    removed[key] = None
+        return ModelDiff(list(added), list(removed), list(changed))
+
+
+def catalog_snapshot_path(app_data_dir: Path) -> Path:
+    return Path(app_data_dir) / "catalog.json"
+
+
+def save_snapshot(path: Path, models: Sequence[ModelEntry]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": SNAPSHOT_VERSION, "models": [asdict(model) for model in models]}
+    temp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    temp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(temp, path)
+
+
+def load_snapshot(path: Path) -> List[ModelEntry]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+        return []
+    names = {item.name for item in fields(ModelEntry)}
+    models: List[ModelEntry] = []
+    for item in payload.get("models", []):
+        try:
+            models.append(ModelEntry(**{key: item[key] for key in item if key in names}))
+        except TypeError:
+            continue
+    return models
@@ -0,0 +1,119 @@
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config import AppConfig
+
+
+ROOT_KEY_PREFIX = "@"
+YAML_RESERVED_KEYS = {"base_path", "is_default"}
+
+
+@dataclass
+class ModelRoot:
+    name: str
+    type_dirs: Dict[str, List[Path]] = field(default_factory=dict)
+    workers: int = 4
+    timeout: float = 10.0
+
+    @property
+    def identity(self) -> Tuple:
+        return (
+            self.name,
+            tuple(sorted((key, tuple(map(str, dirs))) for key, dirs in self.type_dirs.items())),
+        )
+
+    def key_for(self, model_type: str, base_model: str, filename: str) -> str:
+        key = f"{model_type}/{base_model}/{filename}" if base_model else f"{model_type}/{filename}"
+        return f"{ROOT_KEY_PREFIX}{self.name}/{key}" if self.name else key
+
+
+def split_root_key(relative_path: str) -> Tuple[str, str]:
+    if not relative_path.startswith(ROOT_KEY_PREFIX):
+        return "", relative_path
+    name, _, rest = relative_path[len(ROOT_KEY_PREFIX) :].partition("/")
+    return name, rest
+
+
+def root_for_directory(
+    name: str,
+    directory: Path,
+    type_ids: Iterable[str],
+    workers: int = 4,
+    timeout: float = 10.0,
+) -> ModelRoot:
+    type_dirs = {type_id: [directory / type_id] for type_id in type_ids}
+    return ModelRoot(name, type_dirs, workers, timeout)
+
+
+def load_extra_model_paths(path: Path, type_ids: Iterable[str]) -> List[ModelRoot]:
+    import yaml
+
+    try:
+        payload = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    except yaml.YAMLError as exc:
+        raise ValueError(f"{path}: {exc}") from exc
+    if not isinstance(payload, dict):
+        raise ValueError(f"{path}: expected a mapping of sections")
+    known_types = set(type_ids)
+    roots: List[ModelRoot] = []
+    for section, entries in payload.items():
+        if not isinstance(entries, dict):
+            continue
+        base_path = _expand(str(entries.get("base_path") or ""), path.parent)
+        type_dirs: Dict[str, List[Path]] = {}
+        for key, value in entries.items():
+            if key in YAML_RESERVED_KEYS or key not in known_types or value is None:
+                continue
+            for line in str(value).splitlines():
+                line = line.strip()
+                if line:
+                    type_dirs.setdefault(key, []).append(_expand(line, base_path))
+        if type_dirs:
+            roots.append(ModelRoot(str(section), type_dirs))
+    return roots
+
+
+def configured_roots(config: AppConfig) -> List[ModelRoot]:
+    type_ids = [item["id"] for item in config.model_types]
+    roots: List[ModelRoot] = []
+    if config.comfyui_models_dir:
+        roots.append(root_for_directory("", Path(config.comfyui_models_dir), type_ids))
+    for item in config.extra_model_roots:
+        if item.get("path"):
+            roots.append(
+                root_for_directory(
+                    item.get("name") or Path(item["path"]).name,
+                    Path(item["path"]),
+                    type_ids,
+                    workers=int(item.get("workers", 4)),
+                    timeout=float(item.get("timeout", 10.0)),
+                )
+            )
+    if config.extra_model_paths_yaml:
+        try:
+            roots.extend(load_extra_model_paths(Path(config.extra_model_paths_yaml), type_ids))
+        except (OSError, ValueError):
+            pass
+    return _unique_names(roots)
+
+
+def _expand(value: str, base: Optional[Path]) -> Path:
+    path = Path(os.path.expandvars(os.path.expanduser(value)))
+    if base is not None and not path.is_absolute():
+        path = base / path
+    return path
+
+
+def _unique_names(roots: List[ModelRoot]) -> List[ModelRoot]:
+    seen = set()
+    for root in roots:
+        name = root.name.replace("/", "_")
+        candidate, index = name, 2
+        while candidate in seen:
+            candidate = f"{name}-{index}"
+            index += 1
+        seen.add(candidate)
+        root.name = candidate
+    return roots
@@ -1,9 +1,21 @@
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from functools import partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from src.config import AppConfig
-from src.utils.file_utils import is_model_file, safe_relative_path
+from src.models.model_roots import ModelRoot, configured_roots
+from src.services import metrics, tracing
+from src.services.scheduler import (
+    POOL_SCAN,
+    PRIORITY_VISIBLE,
+    Job,
+    JobScheduler,
+    get_scheduler,
+)
+from src.utils.file_utils import is_model_file
 
 
 @dataclass
@@ -19,42 +31,172 @@ class ModelEntry:
     preview: str = ""
     readme: str = ""
     notes: str = ""
+    root: str = ""
+    integrity: str = ""
+
+
+@dataclass
+class RootStatus:
+    name: str
+    models: List[ModelEntry] = field(default_factory=list)
+    scanned_at: float = 0.0
+    stale: bool = False
+    error: str = ""
+
+
+@dataclass
+class _RootScan:
+    done: threading.Event = field(default_factory=threading.Event)
+    running: threading.Event = field(default_factory=threading.Event)
+    started_at: float = 0.0
+
+    def mark_running(self) -> None:
+        if not self.running.is_set():
+            self.started_at = time.monotonic()
+            self.running.set()
+
+
+_root_states: Dict[Tuple, RootStatus] = {}
+_in_flight: Dict[Tuple, "_RootScan"] = {}
+_state_lock = threading.Lock()
 
 
 class ModelScanner:
-    def __init__(self, config: AppConfig) -> None:
+    def __init__(
+        self,
+        config: AppConfig,
+        roots: Optional[List[ModelRoot]] = None,
+        scheduler: Optional[JobScheduler] = None,
+    ) -> None:
         self.config = config
+        self.roots = roots if roots is not None else configured_roots(config)
+        self.scheduler = scheduler or get_scheduler()
+        self.statuses: Dict[str, RootStatus] = {}
 
+    @tracing.traced("ModelScanner.scan", "scan")
     def scan(self) -> List[ModelEntry]:
-        models_root = Path(self.config.comfyui_models_dir)
+        started = time.monotonic()
+        waits = [(root, self._start_root(root)) for root in self.roots]
         results: List[ModelEntry] = []
-        if not models_root.exists():
+        for root, flight in waits:
+            # A root gets its timeout to leave the scan queue and again once it is running.
+            flight.running.wait(max(0.0, started + root.timeout - time.monotonic()))
+            if flight.running.is_set():
+                flight.done.wait(max(0.0, flight.started_at + root.timeout - time.monotonic()))
+            with _state_lock:
+                status = _root_states.get(root.identity) or RootStatus(root.name)
+            if not flight.done.is_set():
+                status = replace(status, stale=True, error="timeout")
+            self.statuses[root.name] = status
+            for entry in status.models:
+                entry = replace(entry)
+                self._apply_metadata(entry)
+                results.append(entry)
+        elapsed = time.monotonic() - started
+        metrics.SCAN_SECONDS.observe(elapsed)
+        metrics.SCAN_FILES.inc(len(results))
+        metrics.SCAN_FILES_PER_SECOND.set(metrics.rate(len(results), elapsed))
+        metrics.CATALOG_MODELS.set(len(results))
+        return results
+
+    def _start_root(self, root: ModelRoot) -> _RootScan:
+        identity = root.identity
+        with _state_lock:
+            flight = _in_flight.get(identity)
+            if flight is not None:
+                return flight
+            flight = _in_flight[identity] = _RootScan()
+
+        def scan_dir(model_type: str, directory: Path) -> List[ModelEntry]:
+            flight.mark_running()
+            return self._scan_type_dir(root, model_type, directory)
+
+        directories = [
+            (model_type, directory)
+            for model_type, type_dirs in root.type_dirs.items()
+            for directory in type_dirs
+        ]
+        jobs = [
+            self.scheduler.submit(
+                partial(scan_dir, model_type, directory),
+                pool=POOL_SCAN,
+                priority=PRIORITY_VISIBLE,
+                name=f"scan {directory}",
+                group=f"scan:{root.name}",
+                group_limit=max(1, root.workers),
+            )
+            for model_type, directory in directories
+        ]
+
+        def finished(_jobs: List[Job]) -> None:
+            try:
+                status = RootStatus(root.name, self._merge(jobs), time.time())
+            except Exception as exc:
+                with _state_lock:
+                    previous = _root_states.get(identity)
+                models = previous.models if previous else []
+                scanned_at = previous.scanned_at if previous else 0.0
+                status = RootStatus(root.name, models, scanned_at, stale=True, error=str(exc))
+            with _state_lock:
+                _root_states[identity] = status
+                _in_flight.pop(identity, None)
+            flight.running.set()
+            flight.done.set()
+
+        self.scheduler.gather(jobs, finished, marshal=False)
+        return flight
+
+    def _merge(self, jobs: List[Job]) -> List[ModelEntry]:
+        results: List[ModelEntry] = []
+        seen = set()
+        for job in jobs:
+            for entry in job.wait(0) or []:
+                if entry.relative_path not in seen:
+                    seen.add(entry.relative_path)
+                    results.append(entry)
+        return results
+
+    def _scan_type_dir(
+        self, root: ModelRoot, model_type: str, type_dir: Path
+    ) -> List[ModelEntry]:
+        with tracing.span("ModelScanner.scan_dir", "scan", root=root.name, path=type_dir) as span:
+            results = self._list_type_dir(root, model_type, type_dir)
+            span.set(files=len(results))
+        return results
+
+    def _list_type_dir(
+        self, root: ModelRoot, model_type: str, type_dir: Path
+    ) -> List[ModelEntry]:
+        results: List[ModelEntry] = []
+        if not type_dir.exists():
             return results
 
-        type_map = {item["id"]: item["label"] for item in self.config.model_types}
-        for model_type_id in type_map.keys():
-            type_dir = models_root / model_type_id
-            if not type_dir.exists():
+        def add(file_path: Path, base_model: str) -> None:
+            results.append(
+                ModelEntry(
+                    name=file_path.name,
+                    relative_path=root.key_for(model_type, base_model, file_path.name),
+                    absolute_path=str(file_path),
+                    size_bytes=file_path.stat().st_size,
+                    model_type=model_type,
+                    base_model=base_model,
+                    root=root.name,
+                )
+            )
+
+        for base_dir in type_dir.iterdir():
+            if base_dir.is_file():
+                if is_model_file(base_dir):
+                    add(base_dir, "")
+                continue
+            if not base_dir.is_dir():
                 continue
-            for base_dir in type_dir.iterdir():
-                if not base_dir.is_dir():
-                    continue
-                base_model = base_dir.name
-                for file_path in base_dir.iterdir():
-                    if file_path.is_file() and is_model_file(file_path):
-                        relative = safe_relative_path(models_root, file_path)
-                        entry = ModelEntry(
-                            name=file_path.name,
-                            relative_path=relative,
-                            absolute_path=str(file_path),
-                            size_bytes=file_path.stat().st_size,
-                            model_type=model_type_id,
-                            base_model=base_model,
-                        )
-                        self._apply_metadata(entry)
-                        results.append(entry)
+            for file_path in base_dir.iterdir():
+                if file_path.is_file() and is_model_file(file_path):
+                    add(file_path, base_dir.name)
         return results
 
+    @tracing.traced("ModelScanner._apply_metadata", "scan")
     def _apply_metadata(self, entry: ModelEntry) -> None:
         metadata = self.config.models_metadata.get(entry.relative_path)
         if metadata:
@@ -63,6 +205,8 @@ class ModelScanner:
             entry.preview = metadata.get("preview", "")
             entry.readme = metadata.get("readme", "")
             entry.notes = metadata.get("notes", "")
+            if metadata.get("integrity_size") == str(entry.size_bytes):
+                entry.integrity = metadata.get("integrity", "")
             return
 
         fallback = self._find_metadata_by_filename(entry.name)
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import requests
+from huggingface_hub import hf_hub_url
+
+from src.services import metrics
+from src.services.hf_endpoints import normalize_endpoints
+from src.services.scheduler import POOL_CPU, POOL_IO, JobScheduler, get_scheduler
+from src.utils.file_utils import file_hash, text_hash
+
+
+MANIFESTS_DIR_NAME = "manifests"
+BLOCK_SIZE = 64 * 1024 * 1024
+READ_CHUNK_SIZE = 8 * 1024 * 1024
+
+RepairProgress = Callable[[int, int], None]
+
+
+class RepairError(RuntimeError):
+    pass
+
+
+@dataclass
+class BlockManifest:
+    repo_id: str
+    filename: str
+    size: int
+    sha256: str
+    block_size: int = BLOCK_SIZE
+    revision: str = ""
+    blocks: List[str] = field(default_factory=list)
+
+    def block_range(self, index: int) -> Tuple[int, int]:
+        start = index * self.block_size
+        return start, min(start + self.block_size, self.size)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temp.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BlockManifest":
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return cls(**payload)
+
+
+class BlockHasher:
+    def __init__(self, block_size: int = 0) -> None:
+        self.block_size = block_size or BLOCK_SIZE
+        self.reset()
+
+    def reset(self) -> None:
+        self.size = 0
+        self.blocks: List[str] = []
+        self._file = hashlib.sha256()
+        self._block = hashlib.sha256()
+        self._block_fill = 0
+
+    def update(self, data: bytes) -> None:
+        self._file.update(data)
+        self.size += len(data)
+        view = memoryview(data)
+        while view:
+            take = min(len(view), self.block_size - self._block_fill)
+            self._block.update(view[:take])
+            self._block_fill += take
+            view = view[take:]
+            if self._block_fill == self.block_size:
+                self.blocks.append(self._block.hexdigest())
+                self._block = hashlib.sha256()
+                self._block_fill = 0
+
+    def hexdigest(self) -> str:
+        return self._file.hexdigest()
+
+    def manifest(self, repo_id: str, filename: str, revision: str = "") -> BlockManifest:
+        blocks = list(self.blocks)
+        if self._block_fill:
+            blocks.append(self._block.hexdigest())
+        return BlockManifest(
+            repo_id, filename, self.size, self.hexdigest(), self.block_size, revision, blocks
+        )
+
+
+@dataclass
+class RepairResult:
+    path: Path
+    blocks_total: int
+    damaged: List[int] = field(default_factory=list)
+    bytes_fetched: int = 0
+    sha256: str = ""
+
+
+def manifests_dir(app_data_dir: Path) -> Path:
+    return Path(app_data_dir) / MANIFESTS_DIR_NAME
+
+
+def manifest_path(directory: Path, repo_id: str, filename: str) -> Path:
+    return Path(directory) / f"{text_hash(f'{repo_id}/{filename}')}.json"
+
+
+def downloaded_sha256(directory: Path, repo_id: str, filename: str, path: Path) -> str:
+    try:
+        manifest = BlockManifest.load(manifest_path(directory, repo_id, filename))
+        if manifest.size != path.stat().st_size:
+            return ""
+    except (OSError, ValueError, TypeError):
+        return ""
+    return manifest.sha256
+
+
+def hash_block(path: Path, start: int, end: int) -> Optional[str]:
+    digest = hashlib.sha256()
+    remaining = end - start
+    with path.open("rb") as handle:
+        handle.seek(start)
+        while remaining:
+            chunk = handle.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                return None
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def damaged_blocks(
+    path: Path,
+    manifest: BlockManifest,
+    workers: int = 4,
+    scheduler: Optional[JobScheduler] = None,
+) -> List[int]:
+    scheduler = scheduler or get_scheduler()
+    jobs = [
+        scheduler.submit(
+            partial(hash_block, path, *manifest.block_range(index)),
+            pool=POOL_CPU,
+            name=f"rehash {path.name}#{index}",
+            group="repair",
+            group_limit=max(1, workers),
+        )
+        for index in range(len(manifest.blocks))
+    ]
+    return [
+        index for index, job in enumerate(jobs) if job.wait() != manifest.blocks[index]
+    ]
+
+
+def fetch_block(
+    manifest: BlockManifest,
+    index: int,
+    endpoints: List[str],
+    token: str = "",
+) -> bytes:
+    start, end = manifest.block_range(index)
+    headers = {"Range": f"bytes={start}-{end - 1}"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    errors: List[str] = []
+    for endpoint in normalize_endpoints(endpoints):
+        url = hf_hub_url(
+            repo_id=manifest.repo_id,
+            filename=manifest.filename,
+            revision=manifest.revision or None,
+            endpoint=endpoint,
+        )
+        try:
+            with requests.get(url, headers=headers, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    errors.append(f"{endpoint}: range not supported")
+                    continue
+                data = bytearray()
+                for chunk in response.iter_content(chunk_size=READ_CHUNK_SIZE):
+                    data += chunk[: end - start - len(data)]
+                    if len(data) >= end - start:
+                        break
+        except requests.RequestException as exc:
+            errors.append(f"{endpoint}: {exc}")
+            metrics.DOWNLOAD_RETRIES.inc()
+            continue
+        data = bytes(data)
+        metrics.DOWNLOAD_BYTES.inc(len(data))
+        if hashlib.sha256(data).hexdigest() != manifest.blocks[index]:
+            errors.append(f"{endpoint}: block {index} does not match the manifest")
+            continue
+        return data
+    raise RepairError("; ".join(errors) or "repair_failed")
+
+
+def repair_file(
+    path: Path,
+    manifest: BlockManifest,
+    endpoints: List[str],
+    token: str = "",
+    workers: int = 4,
+    progress: Optional[RepairProgress] = None,
+    scheduler: Optional[JobScheduler] = None,
+) -> RepairResult:
+    scheduler = scheduler or get_scheduler()
+    if path.stat().st_size != manifest.size:
+        with path.open("r+b") as handle:
+            handle.truncate(manifest.size)
+    result = RepairResult(path, len(manifest.blocks))
+    result.damaged = damaged_blocks(path, manifest, workers, scheduler)
+
+    def repair(index: int) -> int:
+        data = fetch_block(manifest, index, endpoints, token)
+        with path.open("r+b") as handle:
+            handle.seek(manifest.block_range(index)[0])
+            handle.write(data)
+        return len(data)
+
+    jobs = [
+        scheduler.submit(
+            partial(repair, index),
+            pool=POOL_IO,
+            name=f"repair {path.name}#{index}",
+            group="repair-fetch",
+            group_limit=max(1, workers),
+        )
+        for index in result.damaged
+    ]
+    for done, job in enumerate(jobs, 1):
+        result.bytes_fetched += job.wait()
+        if progress:
+            progress(done, len(jobs))
+
+    sha256 = file_hash(path)
+    if sha256 != manifest.sha256:
+        raise RepairError(f"sha256 mismatch after repair: {sha256}")
+    result.sha256 = sha256
+    return result
+
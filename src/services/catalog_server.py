@@ -0,0 +1,218 @@
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.models.catalog import ModelCatalog, ModelDiff
+from src.models.model_scanner import ModelEntry
+
+
+DEFAULT_PORT = 8765
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_LONG_POLL_SECONDS = 60.0
+SSE_HEARTBEAT_SECONDS = 15.0
+PAGE_CACHE_SIZE = 256
+
+Describe = Callable[[ModelEntry], Dict]
+
+
+class CatalogServer:
+    def __init__(
+        self,
+        catalog: ModelCatalog,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        describe: Optional[Describe] = None,
+        heartbeat: float = SSE_HEARTBEAT_SECONDS,
+    ) -> None:
+        self.catalog = catalog
+        self.describe = describe or asdict
+        self.heartbeat = heartbeat
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._items: Tuple[int, List[Dict], Dict[str, Dict]] = (0, [], {})
+        self._pages: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self.httpd = _CatalogHTTPServer((host, port), _CatalogHandler, self)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def items(self) -> Tuple[int, List[Dict], Dict[str, Dict]]:
+        generation, models = self.catalog.snapshot()
+        with self._lock:
+            if self._items[0] == generation:
+                return self._items
+        items = [self.describe(model) for model in models]
+        by_key = {item["relative_path"]: item for item in items}
+        with self._lock:
+            if self._items[0] < generation:
+                self._items = (generation, items, by_key)
+                self._pages.clear()
+            return self._items
+
+    def page(self, query: Dict[str, str]) -> Tuple[int, bytes]:
+        generation, items, _ = self.items()
+        offset = max(0, int(query.get("offset", 0)))
+        limit = min(MAX_PAGE_SIZE, max(1, int(query.get("limit", DEFAULT_PAGE_SIZE))))
+        model_type = query.get("type", "")
+        base_model = query.get("base", "")
+        text = query.get("q", "").lower()
+        key = (generation, offset, limit, model_type, base_model, text)
+        with self._lock:
+            cached = self._pages.get(key)
+            if cached is not None:
+                self._pages.move_to_end(key)
+                return generation, cached
+
+        matches = [
+            item
+            for item in items
+            if (not model_type or item.get("model_type") == model_type)
+            and (not base_model or item.get("base_model") == base_model)
+            and (not text or text in item.get("name", "").lower())
+        ]
+        body = _encode(
+            {
+                "generation": generation,
+                "total": len(matches),
+                "offset": offset,
+                "limit": limit,
+                "models": matches[offset : offset + limit],
+            }
+        )
+        with self._lock:
+            if generation == self._items[0]:
+                self._pages[key] = body
+                while len(self._pages) > PAGE_CACHE_SIZE:
+                    self._pages.popitem(last=False)
+        return generation, body
+
+    def change_payload(self, since: int, generation: int, diff: Optional[ModelDiff]) -> Dict:
+        if diff is None:
+            return {"generation": generation, "since": since, "reset": True}
+        _, _, by_key = self.items()
+        return {
+            "generation": generation,
+            "since": since,
+            "reset": False,
+            "added": [by_key[key] for key in diff.added if key in by_key],
+            "changed": [by_key[key] for key in diff.changed if key in by_key],
+            "removed": diff.removed,
+        }
+
+
+class _CatalogHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, handler, owner: CatalogServer) -> None:
+        self.owner = owner
+        super().__init__(address, handler)
+
+
+class _CatalogHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _CatalogHTTPServer
+
+    def log_message(self, *_args) -> None:
+        return
+
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        routes = {
+            "/api/health": self._health,
+            "/api/models": self._models,
+            "/api/changes": self._changes,
+            "/api/events": self._events,
+        }
+        route = routes.get(parts.path.rstrip("/"))
+        if route is None:
+            self._send_json(404, {"error": "not_found"})
+            return
+        try:
+            route(query)
+        except ValueError as exc:
+            self._send_json(400, {"error": str(exc)})
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _health(self, _query: Dict[str, str]) -> None:
+        generation, models = self.server.owner.catalog.snapshot()
+        self._send_json(200, {"status": "ok", "generation": generation, "models": len(models)})
+
+    def _models(self, query: Dict[str, str]) -> None:
+        generation = self.server.owner.catalog.generation
+        etag = f'"{generation}"'
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        generation, body = self.server.owner.page(query)
+        self._send_body(200, body, {"ETag": f'"{generation}"', "Cache-Control": "no-cache"})
+
+    def _changes(self, query: Dict[str, str]) -> None:
+        owner = self.server.owner
+        since = int(query.get("since", 0))
+        timeout = min(MAX_LONG_POLL_SECONDS, max(0.0, float(query.get("timeout", 30))))
+        generation, diff = owner.catalog.wait_for_change(since, timeout)
+        self._send_json(200, owner.change_payload(since, generation, diff))
+
+    def _events(self, query: Dict[str, str]) -> None:
+        owner = self.server.owner
+        since = self.headers.get("Last-Event-ID") or query.get("since")
+        generation = int(since) if since else owner.catalog.generation
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(f"retry: 3000\nid: {generation}\nevent: hello\ndata: {{}}\n\n".encode())
+        self.wfile.flush()
+        while not owner._stopping.is_set():
+            current, diff = owner.catalog.wait_for_change(generation, owner.heartbeat)
+            if current == generation:
+                self.wfile.write(b": keepalive\n\n")
+            else:
+                data = json.dumps(owner.change_payload(generation, current, diff), ensure_ascii=False)
+                self.wfile.write(f"id: {current}\nevent: catalog\ndata: {data}\n\n".encode("utf-8"))
+                generation = current
+            self.wfile.flush()
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        self._send_body(status, _encode(payload), {})
+
+    def _send_body(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _encode(payload: Dict) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
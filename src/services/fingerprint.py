@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.config import AppConfig
+from src.models.model_scanner import ModelEntry
+from src.services.model_hashes import recorded_hash
+
+
+FINGERPRINT_VERSION = 1
+ACTION_ADD = "add"
+ACTION_REMOVE = "remove"
+ACTION_REPLACE = "replace"
+
+
+@dataclass
+class FileRecord:
+    size: int
+    sha256: str = ""
+    repo_id: str = ""
+    filename: str = ""
+
+    @property
+    def digest(self) -> str:
+        return _digest(f"{self.size}\0{self.sha256}")
+
+
+@dataclass
+class TreeNode:
+    hash: str = ""
+    children: Dict[str, "TreeNode"] = field(default_factory=dict)
+    file: Optional[FileRecord] = None
+
+    def to_dict(self) -> Dict:
+        if self.file is not None:
+            return {"hash": self.hash, "file": asdict(self.file)}
+        return {
+            "hash": self.hash,
+            "children": {name: child.to_dict() for name, child in self.children.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict) -> "TreeNode":
+        if "file" in payload:
+            return cls(payload["hash"], file=FileRecord(**payload["file"]))
+        return cls(
+            payload["hash"],
+            {name: cls.from_dict(child) for name, child in payload["children"].items()},
+        )
+
+    def files(self, path: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], FileRecord]]:
+        if self.file is not None:
+            yield path, self.file
+            return
+        for name in sorted(self.children):
+            yield from self.children[name].files(path + (name,))
+
+
+@dataclass
+class Fingerprint:
+    root: TreeNode
+    models: int = 0
+    unhashed: int = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": FINGERPRINT_VERSION,
+            "models": self.models,
+            "unhashed": self.unhashed,
+            "root": self.root.to_dict(),
+        }
+
+
+@dataclass
+class PlanItem:
+    action: str
+    model_type: str
+    base_model: str
+    name: str
+    size: int
+    sha256: str = ""
+    repo_id: str = ""
+    filename: str = ""
+
+    @property
+    def key(self) -> str:
+        if not self.base_model:
+            return f"{self.model_type}/{self.name}"
+        return f"{self.model_type}/{self.base_model}/{self.name}"
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _seal(node: TreeNode) -> str:
+    if node.file is not None:
+        node.hash = node.file.digest
+    else:
+        node.hash = _digest(
+            "".join(f"{name}\0{_seal(node.children[name])}\n" for name in sorted(node.children))
+        )
+    return node.hash
+
+
+def build_fingerprint(config: AppConfig, models: Iterable[ModelEntry]) -> Fingerprint:
+    root = TreeNode()
+    fingerprint = Fingerprint(root)
+    for model in models:
+        base = root.children.setdefault(model.model_type, TreeNode()).children.setdefault(
+            model.base_model, TreeNode()
+        )
+        if model.name in base.children:
+            continue
+        metadata = config.models_metadata.get(model.relative_path) or {}
+        sha256 = recorded_hash(config, model) or ""
+        record = FileRecord(model.size_bytes, sha256)
+        if not metadata.get("converted_from"):
+            record.repo_id = metadata.get("repo_id", "") or model.repo_id or ""
+            record.filename = metadata.get("filename", "") or model.filename or ""
+        base.children[model.name] = TreeNode(file=record)
+        fingerprint.models += 1
+        fingerprint.unhashed += 0 if sha256 else 1
+    _seal(root)
+    return fingerprint
+
+
+def fingerprint_path(app_data_dir: Path) -> Path:
+    return Path(app_data_dir) / "fingerprint.json"
+
+
+def save_fingerprint(path: Path, fingerprint: Fingerprint) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp.write_text(
+        json.dumps(fingerprint.to_dict(), ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    os.replace(temp, path)
+
+
+def load_fingerprint(path: Path) -> Fingerprint:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(payload, dict) or payload.get("version") != FINGERPRINT_VERSION:
+        raise ValueError(f"{path}: unsupported fingerprint version")
+    try:
+        root = TreeNode.from_dict(payload["root"])
+    except (KeyError, TypeError, AttributeError) as exc:
+        raise ValueError(f"{path}: invalid fingerprint ({exc})") from exc
+    return Fingerprint(root, payload.get("models", 0), payload.get("unhashed", 0))
+
+
+def _item(action: str, path: Tuple[str, ...], record: FileRecord) -> PlanItem:
+    model_type, base_model, name = path
+    return PlanItem(
+        action=action,
+        model_type=model_type,
+        base_model=base_model,
+        name=name,
+        size=record.size,
+        sha256=record.sha256,
+        repo_id=record.repo_id,
+        filename=record.filename,
+    )
+
+
+def diff_fingerprints(current: Fingerprint, target: Fingerprint) -> List[PlanItem]:
+    plan: List[PlanItem] = []
+
+    def walk(left: TreeNode, right: TreeNode, path: Tuple[str, ...]) -> None:
+        if left.hash == right.hash:
+            return
+        if left.file is not None and right.file is not None:
+            if (left.file.sha256 and right.file.sha256) or left.file.size != right.file.size:
+                plan.append(_item(ACTION_REPLACE, path, right.file))
+            return
+        for name in sorted(set(left.children) | set(right.children)):
+            before = left.children.get(name)
+            after = right.children.get(name)
+            child = path + (name,)
+            if before is None:
+                plan.extend(_item(ACTION_ADD, key, found) for key, found in after.files(child))
+            elif after is None:
+                plan.extend(_item(ACTION_REMOVE, key, gone) for key, gone in before.files(child))
+            else:
+                walk(before, after, child)
+
+    walk(current.root, target.root, ())
+    return plan
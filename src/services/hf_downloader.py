@@ -1,16 +1,33 @@
+import itertools
+import os
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Callable, Optional
+from typing import BinaryIO, Callable, Dict, List, Optional
 
 import requests
 from huggingface_hub import HfApi, hf_hub_download, hf_hub_url
 
+from src.services import metrics, tracing
+from src.services.block_manifest import BlockHasher, manifest_path
+from src.services.hf_endpoints import normalize_endpoints, rank_endpoints
+from src.services.peer_cache import find_peer, lfs_sha256
+from src.services.scheduler import (
+    POOL_IO,
+    PRIORITY_INTERACTIVE,
+    Job,
+    JobScheduler,
+    get_scheduler,
+)
+
 
 ProgressCallback = Callable[[int, int, float], None]
 CompletionCallback = Callable[[bool, str, Optional[str], Optional[str]], None]
 
+PEER_SOURCE = "peer"
+
 
 @dataclass
 class DownloadRequest:
@@ -21,25 +38,33 @@ class DownloadRequest:
     target_dir: Path
     readme_dir: Optional[Path] = None
     token: str = ""
+    endpoints: List[str] = field(default_factory=list)
+    manifest_dir: Optional[Path] = None
+    peers: List[str] = field(default_factory=list)
+    target_name: str = ""
+    sha256: str = ""
 
 
 class HFDownloader:
-    def __init__(self) -> None:
+    def __init__(self, scheduler: Optional[JobScheduler] = None) -> None:
+        self.scheduler = scheduler or get_scheduler()
         self._cancelled = False
+        self._active_endpoint: Optional[str] = None
+        self._revision = ""
 
     def download_async(
         self,
         request: DownloadRequest,
         progress_cb: Optional[ProgressCallback] = None,
         completion_cb: Optional[CompletionCallback] = None,
-    ) -> threading.Thread:
-        thread = threading.Thread(
-            target=self._download,
-            args=(request, progress_cb, completion_cb),
-            daemon=True,
+    ) -> Job:
+        self._cancelled = False
+        return self.scheduler.submit(
+            partial(self._download, request, progress_cb, completion_cb),
+            pool=POOL_IO,
+            priority=PRIORITY_INTERACTIVE,
+            name=f"download {request.repo_id}/{request.filename}",
         )
-        thread.start()
-        return thread
 
     def cancel(self) -> None:
         self._cancelled = True
@@ -50,19 +75,27 @@ class HFDownloader:
         progress_cb: Optional[ProgressCallback],
         completion_cb: Optional[CompletionCallback],
     ) -> None:
-        self._cancelled = False
+        if self._cancelled:
+            metrics.DOWNLOADS.labels("cancelled").inc()
+            if completion_cb:
+                completion_cb(False, "download_cancelled", None, None)
+            return
         try:
             request.target_dir.mkdir(parents=True, exist_ok=True)
             model_path = self._download_with_progress(request, progress_cb)
             if self._cancelled:
+                metrics.DOWNLOADS.labels("cancelled").inc()
                 if completion_cb:
                     completion_cb(False, "download_cancelled", None, None)
                 return
 
-            readme_path = self._download_readme(request)
+            with tracing.span("download.readme", "download", repo=request.repo_id):
+                readme_path = self._download_readme(request)
+            metrics.DOWNLOADS.labels("ok").inc()
             if completion_cb:
                 completion_cb(True, "", readme_path, model_path)
         except Exception as exc:
+            metrics.DOWNLOADS.labels("cancelled" if self._cancelled else "failed").inc()
             if completion_cb:
                 completion_cb(False, str(exc), None, None)
 
@@ -75,41 +108,141 @@ class HFDownloader:
     ) -> None:
         if self._cancelled:
             raise RuntimeError("download_cancelled")
+        job = self.scheduler.current_job()
+        if job is not None:
+            job.report(downloaded, total)
         if callback:
             callback(downloaded, total, speed)
 
     def _download_with_progress(
         self, request: DownloadRequest, progress_cb: Optional[ProgressCallback]
     ) -> str:
-        target_path = request.target_dir / request.filename
+        target_path = request.target_dir / (request.target_name or request.filename)
+        temp_path = target_path.with_name(
+            f".{target_path.name}.{os.getpid()}.{threading.get_ident()}.part"
+        )
         headers = {}
         if request.token:
             headers["Authorization"] = f"Bearer {request.token}"
 
-        url = hf_hub_url(repo_id=request.repo_id, filename=request.filename)
-        response = requests.get(url, headers=headers, stream=True, timeout=30)
-        response.raise_for_status()
+        def url_for(endpoint: str) -> str:
+            return hf_hub_url(
+                repo_id=request.repo_id, filename=request.filename, endpoint=endpoint
+            )
+
+        endpoints = normalize_endpoints(request.endpoints)
+        with tracing.span("download.probe", "download", endpoints=len(endpoints)):
+            ranked = [probe.endpoint for probe in rank_endpoints(endpoints, url_for, headers)]
+        self._active_endpoint = None
+        self._revision = ""
+        sources = [(endpoint, url_for(endpoint), headers) for endpoint in ranked]
+        expected = request.sha256
+        if request.peers and ranked:
+            with tracing.span("download.peer_lookup", "download", peers=len(request.peers)):
+                expected = expected or lfs_sha256(sources[0][1], headers)
+                peer_url = find_peer(request.peers, expected) if expected else None
+            if peer_url:
+                sources.insert(0, (PEER_SOURCE, peer_url, {}))
+        hasher = BlockHasher() if request.manifest_dir or expected else None
 
-        total = int(response.headers.get("Content-Length", "0"))
-        downloaded = 0
+        errors: List[str] = []
         start = time.time()
-        with target_path.open("wb") as handle:
-            for chunk in response.iter_content(chunk_size=1024 * 512):
-                if self._cancelled:
-                    target_path.unlink(missing_ok=True)
-                    raise RuntimeError("download_cancelled")
-                if not chunk:
-                    continue
-                handle.write(chunk)
-                downloaded += len(chunk)
-                if progress_cb:
-                    elapsed = max(0.1, time.time() - start)
-                    speed = downloaded / elapsed
-                    self._progress(total, downloaded, speed, progress_cb)
+        served_by = None
+        try:
+            with temp_path.open("wb") as handle:
+                for endpoint, url, source_headers in sources:
+                    try:
+                        self._stream_from(
+                            url, source_headers, handle, start, temp_path, progress_cb, hasher
+                        )
+                    except requests.RequestException as exc:
+                        handle.flush()
+                        errors.append(f"{endpoint}: {exc}")
+                        metrics.DOWNLOAD_RETRIES.inc()
+                        continue
+                    if hasher and expected and hasher.hexdigest() != expected:
+                        errors.append(f"{endpoint}: sha256 mismatch")
+                        handle.seek(0)
+                        handle.truncate()
+                        hasher.reset()
+                        metrics.DOWNLOAD_RETRIES.inc()
+                        continue
+                    served_by = endpoint
+                    metrics.DOWNLOAD_BYTES_PER_SECOND.set(
+                        metrics.rate(handle.tell(), time.time() - start)
+                    )
+                    break
+            if served_by is None:
+                raise RuntimeError("; ".join(errors) or "download_failed")
+            os.replace(temp_path, target_path)
+        except Exception:
+            temp_path.unlink(missing_ok=True)
+            raise
+        if served_by != PEER_SOURCE:
+            self._active_endpoint = served_by
+        metrics.DOWNLOAD_SOURCES.labels("peer" if served_by == PEER_SOURCE else "origin").inc()
+        if hasher and request.manifest_dir:
+            manifest = hasher.manifest(request.repo_id, request.filename, self._revision)
+            manifest.save(manifest_path(request.manifest_dir, request.repo_id, request.filename))
         return str(target_path)
 
+    def _stream_from(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        handle: BinaryIO,
+        start: float,
+        target_path: Path,
+        progress_cb: Optional[ProgressCallback],
+        hasher: Optional[BlockHasher] = None,
+    ) -> None:
+        offset = handle.tell()
+        request_headers = dict(headers)
+        if offset:
+            request_headers["Range"] = f"bytes={offset}-"
+        with tracing.span("download.connect", "download", url=url, offset=offset):
+            response = requests.get(url, headers=request_headers, stream=True, timeout=30)
+        try:
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                handle.seek(0)
+                handle.truncate()
+                offset = 0
+                if hasher:
+                    hasher.reset()
+            self._revision = response.headers.get("X-Repo-Commit", self._revision)
+
+            total = offset + int(response.headers.get("Content-Length", "0"))
+            downloaded = offset
+            chunks = iter(response.iter_content(chunk_size=1024 * 512))
+            with tracing.span("download.first_byte", "download"):
+                first = next(chunks, b"")
+            with tracing.span("download.stream", "download", url=url) as span:
+                for chunk in itertools.chain([first], chunks):
+                    if self._cancelled:
+                        handle.close()
+                        target_path.unlink(missing_ok=True)
+                        raise RuntimeError("download_cancelled")
+                    if not chunk:
+                        continue
+                    handle.write(chunk)
+                    if hasher:
+                        hasher.update(chunk)
+                    downloaded += len(chunk)
+                    metrics.DOWNLOAD_BYTES.inc(len(chunk))
+                    if progress_cb:
+                        elapsed = max(0.1, time.time() - start)
+                        speed = downloaded / elapsed
+                        self._progress(total, downloaded, speed, progress_cb)
+                span.set(bytes=downloaded - offset)
+            if total > offset and downloaded < total:
+                raise requests.ConnectionError(f"incomplete_read {downloaded}/{total}")
+        finally:
+            response.close()
+
     def _download_readme(self, request: DownloadRequest) -> Optional[str]:
-        api = HfApi(token=request.token or None)
+        endpoint = self._active_endpoint or normalize_endpoints(request.endpoints)[0]
+        api = HfApi(endpoint=endpoint, token=request.token or None)
         readme_name = None
         try:
             repo_info = api.repo_info(repo_id=request.repo_id)
@@ -131,6 +264,7 @@ class HFDownloader:
                 filename=readme_name,
                 cache_dir=str(readme_dir),
                 token=request.token or None,
+                endpoint=endpoint,
             )
         except Exception:
             return None
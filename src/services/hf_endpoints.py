@@ -0,0 +1,98 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List
+
+import requests
+
+from src.config import DEFAULT_HF_ENDPOINT
+
+
+PROBE_BYTES = 256 * 1024
+PROBE_TIMEOUT = 5.0
+
+UrlBuilder = Callable[[str], str]
+
+
+@dataclass
+class EndpointProbe:
+    endpoint: str
+    latency: float = float("inf")
+    throughput: float = 0.0
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+    def estimated_seconds(self, size_bytes: int = PROBE_BYTES) -> float:
+        if not self.ok or self.throughput <= 0:
+            return float("inf")
+        return self.latency + size_bytes / self.throughput
+
+
+def normalize_endpoints(endpoints: Iterable[str]) -> List[str]:
+    result: List[str] = []
+    for endpoint in endpoints:
+        endpoint = endpoint.strip().rstrip("/")
+        if endpoint and endpoint not in result:
+            result.append(endpoint)
+    if DEFAULT_HF_ENDPOINT not in result:
+        result.append(DEFAULT_HF_ENDPOINT)
+    return result
+
+
+def probe_endpoint(
+    endpoint: str,
+    url_for: UrlBuilder,
+    headers: Dict[str, str],
+    sample_bytes: int = PROBE_BYTES,
+    timeout: float = PROBE_TIMEOUT,
+) -> EndpointProbe:
+    probe_headers = dict(headers)
+    probe_headers["Range"] = f"bytes=0-{sample_bytes - 1}"
+    start = time.perf_counter()
+    try:
+        with requests.get(
+            url_for(endpoint), headers=probe_headers, stream=True, timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            latency = time.perf_counter() - start
+            received = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                received += len(chunk)
+                if received >= sample_bytes:
+                    break
+            elapsed = max(time.perf_counter() - start - latency, 1e-6)
+    except requests.RequestException as exc:
+        return EndpointProbe(endpoint=endpoint, error=str(exc))
+    return EndpointProbe(endpoint=endpoint, latency=latency, throughput=received / elapsed)
+
+
+def rank_endpoints(
+    endpoints: List[str],
+    url_for: UrlBuilder,
+    headers: Dict[str, str],
+    sample_bytes: int = PROBE_BYTES,
+    timeout: float = PROBE_TIMEOUT,
+) -> List[EndpointProbe]:
+    if len(endpoints) <= 1:
+        return [EndpointProbe(endpoint=endpoint) for endpoint in endpoints]
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+        probes = list(
+            pool.map(
+                lambda endpoint: probe_endpoint(
+                    endpoint, url_for, headers, sample_bytes, timeout
+                ),
+                endpoints,
+            )
+        )
+    order = {endpoint: index for index, endpoint in enumerate(endpoints)}
+    return sorted(
+        probes,
+        key=lambda probe: (
+            not probe.ok,
+            probe.estimated_seconds(sample_bytes),
+            order[probe.endpoint],
+        ),
+    )
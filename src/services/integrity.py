@@ -0,0 +1,147 @@
+import time
+import zipfile
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from src.config import AppConfig
+from src.models.model_scanner import ModelEntry
+from src.services import metrics
+from src.services.scheduler import POOL_CPU, POOL_IO, JobScheduler, get_scheduler
+from src.utils.file_utils import file_hash
+from src.utils.safetensors_utils import HEADER_PREFIX_BYTES, SafetensorsError, read_header
+
+
+STATUS_OK = "ok"
+STATUS_TRUNCATED = "truncated"
+STATUS_CORRUPT = "corrupt"
+STATUS_HASH_MISMATCH = "hash_mismatch"
+STATUS_UNCHECKED = "unchecked"
+BROKEN_STATUSES = (STATUS_TRUNCATED, STATUS_CORRUPT, STATUS_HASH_MISMATCH)
+
+ZIP_SUFFIXES = (".ckpt", ".pt", ".pth", ".bin")
+ZIP_MAGIC = b"PK\x03\x04"
+
+CheckCallback = Callable[["IntegrityResult"], None]
+
+
+@dataclass
+class IntegrityResult:
+    model: ModelEntry
+    status: str
+    detail: str = ""
+    size_bytes: int = 0
+
+    @property
+    def broken(self) -> bool:
+        return self.status in BROKEN_STATUSES
+
+
+def check_safetensors(path: Path, size: int) -> Tuple[str, str]:
+    try:
+        header, length = read_header(path)
+    except SafetensorsError as exc:
+        status = STATUS_TRUNCATED if str(exc) == "header_truncated" else STATUS_CORRUPT
+        return status, str(exc)
+    end = 0
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        try:
+            end = max(end, int(info["data_offsets"][1]))
+        except (KeyError, IndexError, TypeError, ValueError):
+            return STATUS_CORRUPT, f"tensor_invalid: {name}"
+    expected = HEADER_PREFIX_BYTES + length + end
+    if size < expected:
+        return STATUS_TRUNCATED, f"{size} of {expected} bytes"
+    if size > expected:
+        return STATUS_CORRUPT, f"{size - expected} trailing bytes"
+    return STATUS_OK, ""
+
+
+def check_zip(path: Path, size: int) -> Tuple[str, str]:
+    with path.open("rb") as handle:
+        magic = handle.read(len(ZIP_MAGIC))
+    if magic != ZIP_MAGIC:
+        if len(magic) < len(ZIP_MAGIC):
+            return STATUS_TRUNCATED, "empty"
+        return STATUS_UNCHECKED, "not a zip archive"
+    try:
+        with zipfile.ZipFile(path) as archive:
+            entries = archive.infolist()
+            directory_start = getattr(archive, "start_dir", size)
+    except zipfile.BadZipFile as exc:
+        return STATUS_TRUNCATED, str(exc)
+    except (ValueError, NotImplementedError) as exc:
+        return STATUS_CORRUPT, str(exc)
+    for info in entries:
+        if info.header_offset + info.compress_size > directory_start:
+            return STATUS_TRUNCATED, f"{info.filename} overlaps the central directory"
+    return STATUS_OK, ""
+
+
+def check_file(path: Path, expected_sha256: str = "") -> Tuple[str, str]:
+    size = path.stat().st_size
+    suffix = path.suffix.lower()
+    if suffix == ".safetensors":
+        status, detail = check_safetensors(path, size)
+    elif suffix in ZIP_SUFFIXES:
+        status, detail = check_zip(path, size)
+    else:
+        status, detail = STATUS_UNCHECKED, ""
+    if expected_sha256 and status in (STATUS_OK, STATUS_UNCHECKED):
+        started = time.perf_counter()
+        sha256 = file_hash(path)
+        metrics.observe_hash(size, time.perf_counter() - started)
+        if sha256 != expected_sha256:
+            return STATUS_HASH_MISMATCH, f"sha256 {sha256}"
+        return STATUS_OK, ""
+    return status, detail
+
+
+def check_models(
+    config: AppConfig,
+    models: Iterable[ModelEntry],
+    deep: bool = False,
+    workers: int = 16,
+    on_checked: Optional[CheckCallback] = None,
+    scheduler: Optional[JobScheduler] = None,
+) -> List[IntegrityResult]:
+    def run(model: ModelEntry, expected: str) -> IntegrityResult:
+        path = Path(model.absolute_path)
+        try:
+            status, detail = check_file(path, expected)
+            size = path.stat().st_size
+        except OSError as exc:
+            return IntegrityResult(model, STATUS_CORRUPT, str(exc))
+        return IntegrityResult(model, status, detail, size)
+
+    scheduler = scheduler or get_scheduler()
+    jobs = []
+    for model in models:
+        metadata = config.models_metadata.get(model.relative_path) or {}
+        expected = metadata.get("sha256", "") if deep else ""
+        jobs.append(
+            scheduler.submit(
+                partial(run, model, expected),
+                pool=POOL_CPU if expected else POOL_IO,
+                name=f"verify {model.name}",
+                group="integrity",
+                group_limit=max(1, workers),
+            )
+        )
+    results = []
+    for job in jobs:
+        result = job.wait()
+        results.append(result)
+        if on_checked:
+            on_checked(result)
+    return results
+
+
+def record_results(config: AppConfig, results: Iterable[IntegrityResult]) -> None:
+    for result in results:
+        config.set_integrity(
+            result.model.relative_path, result.status, result.detail, result.size_bytes
+        )
@@ -0,0 +1,316 @@
+import bisect
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+METRICS_DIR_NAME = "metrics"
+EXPORT_INTERVAL_SECONDS = 15.0
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+LabelKey = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class _Bound:
+    def __init__(self, metric: "Counter", key: LabelKey) -> None:
+        self.metric = metric
+        self.key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.metric.inc(amount, self.key)
+
+    def set(self, value: float) -> None:
+        self.metric.set(value, self.key)
+
+    def observe(self, value: float) -> None:
+        self.metric.observe(value, self.key)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> _Bound:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return _Bound(self, tuple(str(value) for value in values))
+
+    def inc(self, amount: float = 1.0, key: LabelKey = ()) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, key: LabelKey = ()) -> float:
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, self._label_dict(key), value) for key, value in items]
+
+    def _label_dict(self, key: LabelKey) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, key: LabelKey = ()) -> None:
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Counter):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, key: LabelKey = ()) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def value(self, key: LabelKey = ()) -> float:
+        with self._lock:
+            series = self._series.get(key)
+            return series[-1] if series else 0.0
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        samples: List[Sample] = []
+        for key, series in items:
+            labels = self._label_dict(key)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                samples.append(
+                    (f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative)
+                )
+            samples.append((f"{self.name}_sum", labels, series[-2]))
+            samples.append((f"{self.name}_count", labels, series[-1]))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def metrics(self) -> List[Counter]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self, const_labels: Optional[Dict[str, str]] = None) -> str:
+        lines: List[str] = []
+        for metric in self.metrics():
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in samples:
+                merged = {**(const_labels or {}), **labels}
+                lines.append(f"{name}{_format_labels(merged)} {_format_value(value)}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def snapshot(self) -> Dict[str, Dict]:
+        payload: Dict[str, Dict] = {}
+        for metric in self.metrics():
+            samples = metric.samples()
+            if samples:
+                payload[metric.name] = {
+                    "type": metric.kind,
+                    "help": metric.help_text,
+                    "samples": [
+                        {"name": name, "labels": labels, "value": value}
+                        for name, labels, value in samples
+                    ],
+                }
+        return payload
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"{metric.name} is already registered as {existing.kind}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+class MetricsExporter:
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        directory: Path,
+        process: str,
+        interval: float = EXPORT_INTERVAL_SECONDS,
+    ) -> None:
+        self.registry = registry
+        self.directory = Path(directory)
+        self.process = process
+        self.interval = interval
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def textfile_path(self) -> Path:
+        return self.directory / f"comfy_model_manager_{self.process}.prom"
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.directory / f"comfy_model_manager_{self.process}.json"
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self.export()
+
+    def export(self) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            _write_atomic(self.textfile_path, self.registry.render({"process": self.process}))
+            _write_atomic(
+                self.snapshot_path,
+                json.dumps(self.registry.snapshot(), ensure_ascii=False, indent=2),
+            )
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            self.export()
+
+
+def metrics_dir(app_data_dir: Path) -> Path:
+    return Path(app_data_dir) / METRICS_DIR_NAME
+
+
+def read_snapshots(directory: Path) -> Dict[str, Dict]:
+    snapshots: Dict[str, Dict] = {}
+    prefix = "comfy_model_manager_"
+    for path in sorted(Path(directory).glob(f"{prefix}*.json")):
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if isinstance(payload, dict):
+            snapshots[path.stem[len(prefix) :]] = payload
+    return snapshots
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp.write_text(text, encoding="utf-8")
+    os.replace(temp, path)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+SCAN_SECONDS = REGISTRY.histogram("cmm_scan_duration_seconds", "Wall time of a full model scan.")
+SCAN_FILES = REGISTRY.counter("cmm_scan_files_total", "Model files seen by scans.")
+SCAN_FILES_PER_SECOND = REGISTRY.gauge(
+    "cmm_scan_files_per_second", "Files per second of the most recent scan."
+)
+CATALOG_MODELS = REGISTRY.gauge("cmm_catalog_models", "Models in the current catalog.")
+CONFIG_SAVES = REGISTRY.counter("cmm_config_saves_total", "Config file writes.")
+CONFIG_SAVE_SECONDS = REGISTRY.histogram(
+    "cmm_config_save_duration_seconds", "Latency of config file writes."
+)
+DOWNLOAD_BYTES = REGISTRY.counter("cmm_download_bytes_total", "Bytes received by downloads.")
+DOWNLOAD_BYTES_PER_SECOND = REGISTRY.gauge(
+    "cmm_download_bytes_per_second", "Throughput of the most recent finished download."
+)
+DOWNLOAD_RETRIES = REGISTRY.counter(
+    "cmm_download_retries_total", "Download attempts that failed over to another endpoint."
+)
+DOWNLOADS = REGISTRY.counter("cmm_downloads_total", "Finished downloads by result.", ("result",))
+DOWNLOAD_SOURCES = REGISTRY.counter(
+    "cmm_download_sources_total", "Successful downloads by source (peer or origin).", ("source",)
+)
+HASH_BYTES = REGISTRY.counter("cmm_hash_bytes_total", "Bytes hashed with sha256.")
+HASH_SECONDS = REGISTRY.counter("cmm_hash_seconds_total", "Time spent hashing files.")
+HASH_BYTES_PER_SECOND = REGISTRY.gauge(
+    "cmm_hash_bytes_per_second", "Throughput of the most recent file hash."
+)
+THUMBNAIL_LOOKUPS = REGISTRY.counter(
+    "cmm_thumbnail_lookups_total", "Thumbnail cache lookups by result.", ("result",)
+)
+THUMBNAIL_HIT_RATIO = REGISTRY.gauge(
+    "cmm_thumbnail_cache_hit_ratio", "Share of thumbnail lookups served from a cache."
+)
+
+
+def rate(amount: float, seconds: float) -> float:
+    return amount / seconds if seconds > 0 else 0.0
+
+
+def observe_hash(size_bytes: int, seconds: float) -> None:
+    HASH_BYTES.inc(size_bytes)
+    HASH_SECONDS.inc(seconds)
+    HASH_BYTES_PER_SECOND.set(rate(size_bytes, seconds))
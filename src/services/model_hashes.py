@@ -0,0 +1,112 @@
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.config import AppConfig
+from src.models.model_scanner import ModelEntry
+from src.services import metrics
+from src.services.block_manifest import BlockManifest, manifest_path, manifests_dir
+from src.services.scheduler import POOL_CPU, JobScheduler, get_scheduler
+from src.utils.file_utils import file_hash
+
+
+HashCallback = Callable[[ModelEntry, str], None]
+
+
+def cached_hash(config: AppConfig, model: ModelEntry) -> Optional[str]:
+    metadata = config.models_metadata.get(model.relative_path) or {}
+    sha256 = metadata.get("sha256")
+    if not sha256:
+        return None
+    try:
+        stat = Path(model.absolute_path).stat()
+    except OSError:
+        return None
+    if metadata.get("hash_size") != str(stat.st_size):
+        return None
+    if metadata.get("hash_mtime") != str(stat.st_mtime_ns):
+        return None
+    return sha256
+
+
+def recorded_hash(config: AppConfig, model: ModelEntry) -> Optional[str]:
+    sha256 = cached_hash(config, model)
+    if sha256:
+        return sha256
+    metadata = config.models_metadata.get(model.relative_path) or {}
+    if metadata.get("converted_from"):
+        return None
+    if not metadata.get("repo_id") or not metadata.get("filename"):
+        return None
+    directory = manifests_dir(Path(config.app_data_dir))
+    try:
+        manifest = BlockManifest.load(
+            manifest_path(directory, metadata["repo_id"], metadata["filename"])
+        )
+        if manifest.size != Path(model.absolute_path).stat().st_size:
+            return None
+    except (OSError, ValueError, TypeError):
+        return None
+    return manifest.sha256
+
+
+def hash_models(
+    config: AppConfig,
+    models: Iterable[ModelEntry],
+    workers: int = 4,
+    on_hashed: Optional[HashCallback] = None,
+    scheduler: Optional[JobScheduler] = None,
+) -> Dict[str, str]:
+    hashes: Dict[str, str] = {}
+    pending: List[ModelEntry] = []
+    for model in models:
+        sha256 = cached_hash(config, model)
+        if sha256:
+            hashes[model.relative_path] = sha256
+        else:
+            pending.append(model)
+
+    def run(model: ModelEntry) -> Tuple[ModelEntry, str, int, int]:
+        path = Path(model.absolute_path)
+        before = path.stat()
+        started = time.perf_counter()
+        sha256 = file_hash(path)
+        metrics.observe_hash(before.st_size, time.perf_counter() - started)
+        return model, sha256, before.st_size, before.st_mtime_ns
+
+    scheduler = scheduler or get_scheduler()
+    jobs = [
+        scheduler.submit(
+            partial(run, model),
+            pool=POOL_CPU,
+            name=f"hash {model.name}",
+            group="hash",
+            group_limit=max(1, workers),
+        )
+        for model in pending
+    ]
+    for job in jobs:
+        model, sha256, size, mtime_ns = job.wait()
+        config.set_hash(model.relative_path, sha256, size, mtime_ns)
+        hashes[model.relative_path] = sha256
+        if on_hashed:
+            on_hashed(model, sha256)
+    return hashes
+
+
+def find_duplicates(
+    config: AppConfig, models: Iterable[ModelEntry], workers: int = 4
+) -> List[List[ModelEntry]]:
+    by_size: Dict[int, List[ModelEntry]] = {}
+    for model in models:
+        by_size.setdefault(model.size_bytes, []).append(model)
+    candidates = [model for group in by_size.values() if len(group) > 1 for model in group]
+
+    hashes = hash_models(config, candidates, workers)
+    by_hash: Dict[str, List[ModelEntry]] = {}
+    for model in candidates:
+        by_hash.setdefault(hashes[model.relative_path], []).append(model)
+    groups = [group for group in by_hash.values() if len(group) > 1]
+    groups.sort(key=lambda group: group[0].size_bytes, reverse=True)
+    return groups
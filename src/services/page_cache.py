@@ -0,0 +1,156 @@
+import ctypes
+import ctypes.util
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+
+READ_CHUNK_SIZE = 8 * 1024 * 1024
+MIN_SEGMENT_SIZE = 256 * 1024 * 1024
+PROT_READ = 1
+MAP_SHARED = 1
+
+WarmProgress = Callable[[int, int], None]
+
+
+@dataclass
+class Residency:
+    path: Path
+    size_bytes: int
+    resident_bytes: Optional[int]
+
+    @property
+    def percent(self) -> Optional[float]:
+        if self.resident_bytes is None:
+            return None
+        if not self.size_bytes:
+            return 100.0
+        return min(100.0, self.resident_bytes * 100.0 / self.size_bytes)
+
+
+@dataclass
+class WarmResult:
+    path: Path
+    bytes_read: int
+    seconds: float
+    residency: Residency
+
+
+_libc = None
+_libc_lock = threading.Lock()
+
+
+def _load_libc():
+    global _libc
+    with _libc_lock:
+        if _libc is None:
+            name = ctypes.util.find_library("c")
+            if os.name != "posix" or not name:
+                _libc = False
+            else:
+                libc = ctypes.CDLL(name, use_errno=True)
+                libc.mmap.restype = ctypes.c_void_p
+                libc.mmap.argtypes = [
+                    ctypes.c_void_p,
+                    ctypes.c_size_t,
+                    ctypes.c_int,
+                    ctypes.c_int,
+                    ctypes.c_int,
+                    ctypes.c_long,
+                ]
+                libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+                libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p]
+                _libc = libc
+        return _libc or None
+
+
+def residency(path: Path) -> Residency:
+    size = path.stat().st_size
+    libc = _load_libc()
+    if libc is None or not size:
+        return Residency(path, size, None if libc is None else 0)
+    page_size = mmap.PAGESIZE
+    pages = (size + page_size - 1) // page_size
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        address = libc.mmap(None, size, PROT_READ, MAP_SHARED, fd, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            return Residency(path, size, None)
+        try:
+            vector = (ctypes.c_ubyte * pages)()
+            if libc.mincore(ctypes.c_void_p(address), size, vector) != 0:
+                return Residency(path, size, None)
+            resident_pages = sum(1 for value in vector if value & 1)
+        finally:
+            libc.munmap(ctypes.c_void_p(address), size)
+    finally:
+        os.close(fd)
+    return Residency(path, size, min(size, resident_pages * page_size))
+
+
+def advise(path: Path, advice_name: str) -> bool:
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def evict(path: Path) -> Residency:
+    advise(path, "POSIX_FADV_DONTNEED")
+    return residency(path)
+
+
+def _segments(size: int, workers: int) -> List[Tuple[int, int]]:
+    segment = max(MIN_SEGMENT_SIZE, -(-size // max(1, workers)))
+    return [(start, min(size, start + segment)) for start in range(0, size, segment)]
+
+
+def _read_segment(path: Path, start: int, end: int, progress: Callable[[int], None]) -> int:
+    buffer = bytearray(READ_CHUNK_SIZE)
+    view = memoryview(buffer)
+    total = 0
+    with path.open("rb", buffering=0) as handle:
+        handle.seek(start)
+        while start + total < end:
+            count = handle.readinto(view[: min(READ_CHUNK_SIZE, end - start - total)])
+            if not count:
+                break
+            total += count
+            progress(count)
+    return total
+
+
+def warm_file(path: Path, workers: int = 4, progress: Optional[WarmProgress] = None) -> WarmResult:
+    started = time.monotonic()
+    size = path.stat().st_size
+    advise(path, "POSIX_FADV_SEQUENTIAL")
+    advise(path, "POSIX_FADV_WILLNEED")
+    lock = threading.Lock()
+    done = [0]
+
+    def report(count: int) -> None:
+        with lock:
+            done[0] += count
+            current = done[0]
+        if progress:
+            progress(current, size)
+
+    segments = _segments(size, workers)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(segments) or 1))) as pool:
+        bytes_read = sum(
+            pool.map(lambda segment: _read_segment(path, segment[0], segment[1], report), segments)
+        )
+    return WarmResult(path, bytes_read, time.monotonic() - started, residency(path))
+
@@ -0,0 +1,189 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from src.config import AppConfig
+from src.models.model_scanner import ModelEntry
+from src.services.model_hashes import recorded_hash
+
+
+DEFAULT_PEER_PORT = 8766
+PEER_PROBE_TIMEOUT = 2.0
+FILES_PREFIX = "/peer/files/"
+SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+PeerIndex = Dict[str, Path]
+
+
+def build_index(config: AppConfig, models: Iterable[ModelEntry]) -> PeerIndex:
+    index: PeerIndex = {}
+    for model in models:
+        sha256 = recorded_hash(config, model)
+        if sha256:
+            index[sha256] = Path(model.absolute_path)
+    return index
+
+
+def peer_file_url(peer: str, sha256: str) -> str:
+    return f"{peer.rstrip('/')}{FILES_PREFIX}{sha256}"
+
+
+def lfs_sha256(url: str, headers: Dict[str, str]) -> str:
+    try:
+        response = requests.head(url, headers=headers, allow_redirects=False, timeout=10)
+    except requests.RequestException:
+        return ""
+    etag = response.headers.get("X-Linked-Etag", "").strip()
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    etag = etag.strip('"').lower()
+    return etag if SHA256_PATTERN.fullmatch(etag) else ""
+
+
+def find_peer(peers: Iterable[str], sha256: str) -> Optional[str]:
+    for peer in peers:
+        url = peer_file_url(peer, sha256)
+        try:
+            response = requests.head(url, timeout=PEER_PROBE_TIMEOUT)
+        except requests.RequestException:
+            continue
+        if response.status_code == 200:
+            return url
+    return None
+
+
+class PeerServer:
+    def __init__(self, host: str = "0.0.0.0", port: int = DEFAULT_PEER_PORT) -> None:
+        self._lock = threading.Lock()
+        self._index: PeerIndex = {}
+        self.httpd = _PeerHTTPServer((host, port), _PeerHandler, self)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def set_index(self, index: PeerIndex) -> None:
+        with self._lock:
+            self._index = dict(index)
+
+    def lookup(self, sha256: str) -> Optional[Path]:
+        with self._lock:
+            return self._index.get(sha256)
+
+    def sizes(self) -> Dict[str, int]:
+        with self._lock:
+            items = list(self._index.items())
+        sizes: Dict[str, int] = {}
+        for sha256, path in items:
+            try:
+                sizes[sha256] = path.stat().st_size
+            except OSError:
+                continue
+        return sizes
+
+
+class _PeerHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self, address, handler, owner: PeerServer) -> None:
+        self.owner = owner
+        super().__init__(address, handler)
+
+
+class _PeerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _PeerHTTPServer
+
+    def log_message(self, *_args) -> None:
+        return
+
+    def do_GET(self) -> None:
+        self._route(head=False)
+
+    def do_HEAD(self) -> None:
+        self._route(head=True)
+
+    def _route(self, head: bool) -> None:
+        path = urlsplit(self.path).path
+        if path.rstrip("/") == "/peer/index":
+            self._send_json(200, {"files": self.server.owner.sizes()}, head)
+            return
+        if path.startswith(FILES_PREFIX):
+            self._file(path[len(FILES_PREFIX) :], head)
+            return
+        self._send_json(404, {"error": "not_found"}, head)
+
+    def _file(self, sha256: str, head: bool) -> None:
+        path = self.server.owner.lookup(sha256)
+        try:
+            handle = path.open("rb") if path else None
+        except OSError:
+            handle = None
+        if handle is None:
+            self._send_json(404, {"error": "not_found"}, head)
+            return
+        with handle:
+            size = handle.seek(0, 2)
+            start, end, partial = _parse_range(self.headers.get("Range"), size)
+            if start is None:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206 if partial else 200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(end - start))
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", f'"{sha256}"')
+            if partial:
+                self.send_header("Content-Range", f"bytes {start}-{end - 1}/{size}")
+            self.end_headers()
+            if head or end == start:
+                return
+            try:
+                self.wfile.flush()
+                self.connection.sendfile(handle, start, end - start)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+    def _send_json(self, status: int, payload: Dict, head: bool) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+
+def _parse_range(header: Optional[str], size: int) -> Tuple[Optional[int], int, bool]:
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", (header or "").strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return 0, size, False
+    first, last = match.groups()
+    if not first:
+        return max(0, size - int(last)), size, True
+    start = int(first)
+    if start >= size:
+        return None, 0, False
+    end = min(size, int(last) + 1) if last else size
+    return start, end, True
+
@@ -0,0 +1,236 @@
+import json
+import os
+import re
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.config import AppConfig
+from src.services import tracing
+from src.utils.safetensors_utils import HEADER_PREFIX_BYTES, SafetensorsError, read_header
+
+if TYPE_CHECKING:
+    import numpy
+
+
+TARGET_DTYPES = {"fp16": "F16", "bf16": "BF16"}
+SOURCE_DTYPES = {"F32": "<f4", "F64": "<f8"}
+CHUNK_BYTES = 32 * 1024 * 1024
+COPY_CHUNK_BYTES = 8 * 1024 * 1024
+HEADER_ALIGNMENT = 8
+PRECISION_SUFFIX = re.compile(r"([-_.])(fp32|f32|float32|full)$", re.IGNORECASE)
+
+ConvertProgress = Callable[[int, int], None]
+
+
+@dataclass
+class ConversionResult:
+    source: Path
+    target: Path
+    dtype: str
+    tensors_converted: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    overflowed: int = 0
+    seconds: float = 0.0
+    error: str = ""
+
+
+@dataclass
+class _Tensor:
+    name: str
+    info: Dict
+    begin: int
+    end: int
+    source_dtype: str = ""
+
+    @property
+    def elements(self) -> int:
+        return (self.end - self.begin) // int(SOURCE_DTYPES[self.source_dtype][-1])
+
+    @property
+    def out_bytes(self) -> int:
+        return self.elements * 2 if self.source_dtype else self.end - self.begin
+
+
+def conversion_target(source: Path, precision: str) -> Path:
+    stem = source.stem
+    match = PRECISION_SUFFIX.search(stem)
+    if match:
+        stem = f"{stem[: match.start()]}{match.group(1)}{precision}"
+    else:
+        stem = f"{stem}-{precision}"
+    return source.with_name(f"{stem}{source.suffix}")
+
+
+def sibling_key(relative_path: str, filename: str) -> str:
+    parent, _, _ = relative_path.rpartition("/")
+    return f"{parent}/{filename}" if parent else filename
+
+
+def register_conversion(config: AppConfig, source_key: str, result: ConversionResult) -> str:
+    key = sibling_key(source_key, result.target.name)
+    precision = next(name for name, dtype in TARGET_DTYPES.items() if dtype == result.dtype)
+    config.copy_metadata(source_key, key, precision=precision, converted_from=source_key)
+    return key
+
+
+@tracing.traced("precision.convert", "convert")
+def convert_file(
+    source: Path,
+    target: Path,
+    precision: str = "fp16",
+    progress: Optional[ConvertProgress] = None,
+    overwrite: bool = False,
+) -> ConversionResult:
+    if precision not in TARGET_DTYPES:
+        raise ValueError(f"unsupported precision {precision}")
+    if target.exists() and not overwrite:
+        raise FileExistsError(f"{target} already exists")
+    dtype = TARGET_DTYPES[precision]
+    started = time.perf_counter()
+    header, length = read_header(source)
+    data_start = HEADER_PREFIX_BYTES + length
+    size = source.stat().st_size
+    new_header, tensors = _plan(header, size - data_start, dtype)
+    if not any(tensor.source_dtype for tensor in tensors):
+        raise SafetensorsError("no_fp32_tensors")
+
+    encoded = json.dumps(new_header, separators=(",", ":")).encode("utf-8")
+    encoded += b" " * (-len(encoded) % HEADER_ALIGNMENT)
+    result = ConversionResult(source, target, dtype, bytes_in=size)
+    total = sum(tensor.end - tensor.begin for tensor in tensors)
+    done = 0
+    temp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        with temp.open("wb") as output, source.open("rb") as raw:
+            output.write(struct.pack("<Q", len(encoded)) + encoded)
+            for tensor in tensors:
+                if tensor.source_dtype:
+                    result.tensors_converted += 1
+                    chunks = _convert_tensor(source, data_start, tensor, dtype)
+                else:
+                    chunks = _copy_range(raw, data_start + tensor.begin, tensor.end - tensor.begin)
+                for consumed, data, overflowed in chunks:
+                    output.write(data)
+                    result.overflowed += overflowed
+                    done += consumed
+                    if progress:
+                        progress(done, total)
+            output.flush()
+            os.fsync(output.fileno())
+        os.replace(temp, target)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    result.bytes_out = target.stat().st_size
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def convert_many(
+    pairs: Sequence[Tuple[Path, Path]],
+    precision: str = "fp16",
+    workers: int = 1,
+    overwrite: bool = False,
+) -> Iterator[ConversionResult]:
+    jobs = [(str(source), str(target), precision, overwrite) for source, target in pairs]
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield _convert_job(job)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        yield from pool.map(_convert_job, jobs)
+
+
+def _convert_job(job: Tuple[str, str, str, bool]) -> ConversionResult:
+    source, target, precision, overwrite = job
+    try:
+        return convert_file(Path(source), Path(target), precision, overwrite=overwrite)
+    except (OSError, ValueError) as exc:
+        dtype = TARGET_DTYPES.get(precision, precision)
+        return ConversionResult(Path(source), Path(target), dtype, error=str(exc))
+
+
+def _plan(header: Dict, data_length: int, dtype: str) -> Tuple[Dict, List[_Tensor]]:
+    tensors: List[_Tensor] = []
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        try:
+            begin, end = (int(value) for value in info["data_offsets"])
+            source_dtype = str(info["dtype"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise SafetensorsError("tensor_invalid") from exc
+        if not 0 <= begin <= end <= data_length:
+            raise SafetensorsError("tensor_out_of_bounds")
+        tensor = _Tensor(name, {**info}, begin, end)
+        if source_dtype in SOURCE_DTYPES:
+            tensor.source_dtype = source_dtype
+            if tensor.elements * int(SOURCE_DTYPES[source_dtype][-1]) != end - begin:
+                raise SafetensorsError("tensor_size_mismatch")
+            tensor.info["dtype"] = dtype
+        tensors.append(tensor)
+    tensors.sort(key=lambda tensor: tensor.begin)
+
+    new_header: Dict = {}
+    if "__metadata__" in header:
+        new_header["__metadata__"] = header["__metadata__"]
+    offset = 0
+    for tensor in tensors:
+        tensor.info["data_offsets"] = [offset, offset + tensor.out_bytes]
+        new_header[tensor.name] = tensor.info
+        offset += tensor.out_bytes
+    return new_header, tensors
+
+
+def _copy_range(raw, start: int, length: int) -> Iterator[Tuple[int, bytes, int]]:
+    raw.seek(start)
+    remaining = length
+    while remaining:
+        data = raw.read(min(COPY_CHUNK_BYTES, remaining))
+        if not data:
+            raise SafetensorsError("data_truncated")
+        remaining -= len(data)
+        yield len(data), data, 0
+
+
+def _convert_tensor(
+    source: Path, data_start: int, tensor: _Tensor, dtype: str
+) -> Iterator[Tuple[int, memoryview, int]]:
+    import numpy as np
+
+    source_dtype = np.dtype(SOURCE_DTYPES[tensor.source_dtype])
+    step = max(1, CHUNK_BYTES // source_dtype.itemsize)
+    for first in range(0, tensor.elements, step):
+        count = min(step, tensor.elements - first)
+        window = np.memmap(
+            source,
+            dtype=source_dtype,
+            mode="r",
+            offset=data_start + tensor.begin + first * source_dtype.itemsize,
+            shape=(count,),
+        )
+        converted, overflowed = _cast(np, window, dtype)
+        del window
+        yield count * source_dtype.itemsize, memoryview(converted), overflowed
+
+
+def _cast(np, values: "numpy.ndarray", dtype: str) -> Tuple["numpy.ndarray", int]:
+    with np.errstate(over="ignore", invalid="ignore"):
+        if dtype == "F16":
+            converted = values.astype("<f2")
+            overflowed = np.count_nonzero(np.isinf(converted) & np.isfinite(values))
+            return converted, int(overflowed)
+        single = values.astype("<f4")
+    bits = single.view("<u4")
+    rounded = bits + ((bits >> 16) & 1) + np.uint32(0x7FFF)
+    converted = (rounded >> 16).astype("<u2")
+    nan = np.isnan(single)
+    if nan.any():
+        converted[nan] = ((bits[nan] >> 16) | 0x0040).astype("<u2")
+    overflowed = np.count_nonzero(((converted & 0x7FFF) == 0x7F80) & np.isfinite(single))
+    return converted, int(overflowed)
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image, ImageOps, features
+
+from src.models.model_scanner import ModelEntry
+from src.services import tracing
+from src.services.scheduler import (
+    POOL_CPU,
+    PRIORITY_INTERACTIVE,
+    Job,
+    JobScheduler,
+    get_scheduler,
+)
+from src.services.thumbnail_cache import ThumbnailCache
+
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+MASTER_MAX_SIZE = (2048, 2048)
+MAX_ICC_PROFILE_BYTES = 16 * 1024
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class IngestResult:
+    source: Path
+    preview_path: Optional[Path] = None
+    error: str = ""
+    model: Optional[ModelEntry] = None
+
+
+class PreviewIngestor:
+    def __init__(
+        self,
+        app_data_dir: Path,
+        thumbnails: ThumbnailCache,
+        scheduler: Optional[JobScheduler] = None,
+    ) -> None:
+        self.preview_dir = Path(app_data_dir) / "previews"
+        self.thumbnails = thumbnails
+        self.scheduler = scheduler or get_scheduler()
+        self.format = "WEBP" if features.check("webp") else "PNG"
+
+    def ingest(self, source: Path) -> Path:
+        self.preview_dir.mkdir(parents=True, exist_ok=True)
+        incoming = self.preview_dir / f".incoming-{uuid.uuid4().hex}.tmp"
+        sha256 = hashlib.sha256()
+        try:
+            with source.open("rb") as reader, incoming.open("wb") as writer:
+                while True:
+                    chunk = reader.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    sha256.update(chunk)
+                    writer.write(chunk)
+            suffix = ".webp" if self.format == "WEBP" else ".png"
+            target = self.preview_dir / f"{sha256.hexdigest()}{suffix}"
+            if not target.exists():
+                self._normalize(incoming, target)
+        finally:
+            incoming.unlink(missing_ok=True)
+        self.thumbnails.ensure(target)
+        return target
+
+    def ingest_many(self, pairs: Iterable[Tuple[ModelEntry, Path]]) -> List[IngestResult]:
+        return [job.wait() for job in self._submit(pairs)]
+
+    def ingest_async(
+        self,
+        pairs: Iterable[Tuple[ModelEntry, Path]],
+        on_done: Callable[[List[IngestResult]], None],
+    ) -> None:
+        self.scheduler.gather(
+            self._submit(pairs), lambda jobs: on_done([job.result for job in jobs])
+        )
+
+    def _submit(self, pairs: Iterable[Tuple[ModelEntry, Path]]) -> List[Job]:
+        return [
+            self.scheduler.submit(
+                partial(self._ingest_pair, model, source),
+                pool=POOL_CPU,
+                priority=PRIORITY_INTERACTIVE,
+                name=f"ingest {source.name}",
+            )
+            for model, source in pairs
+        ]
+
+    def _ingest_pair(self, model: ModelEntry, source: Path) -> IngestResult:
+        try:
+            preview_path = self.ingest(source)
+        except (OSError, ValueError, Image.DecompressionBombError) as exc:
+            return IngestResult(source=source, error=str(exc), model=model)
+        return IngestResult(source=source, preview_path=preview_path, model=model)
+
+    @tracing.traced("PreviewIngestor.normalize", "image")
+    def _normalize(self, source: Path, target: Path) -> None:
+        with Image.open(source) as image:
+            image.draft("RGB", MASTER_MAX_SIZE)
+            icc_profile = image.info.get("icc_profile")
+            master = ImageOps.exif_transpose(image)
+            master.thumbnail(MASTER_MAX_SIZE)
+            if master.mode not in ("RGB", "RGBA"):
+                has_alpha = "transparency" in image.info or master.mode in ("LA", "PA")
+                master = master.convert("RGBA" if has_alpha else "RGB")
+
+        options: Dict[str, object] = {}
+        if icc_profile and len(icc_profile) <= MAX_ICC_PROFILE_BYTES:
+            options["icc_profile"] = icc_profile
+        if self.format == "WEBP":
+            options["quality"] = 90
+            options["method"] = 4
+        else:
+            options["optimize"] = True
+
+        temp = target.with_name(f"{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            master.save(temp, format=self.format, **options)
+            os.replace(temp, target)
+        finally:
+            temp.unlink(missing_ok=True)
+
+
+def match_previews_by_stem(
+    folder: Path, models: Iterable[ModelEntry]
+) -> List[Tuple[ModelEntry, Path]]:
+    images: Dict[str, Path] = {}
+    for path in sorted(folder.iterdir()):
+        if not path.is_file() or path.suffix.lower() not in IMAGE_EXTENSIONS:
+            continue
+        stem = path.stem.lower()
+        if stem.endswith(".preview"):
+            stem = stem[: -len(".preview")]
+        images.setdefault(stem, path)
+
+    pairs: List[Tuple[ModelEntry, Path]] = []
+    for model in models:
+        match = images.get(Path(model.name).stem.lower())
+        if match:
+            pairs.append((model, match))
+    return pairs
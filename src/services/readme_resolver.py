@@ -0,0 +1,112 @@
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.models.model_scanner import ModelEntry
+from src.utils.file_utils import list_files, text_hash
+
+
+README_NOT_DOWNLOADED = "README 未下载"
+README_NOT_FOUND = "已下载但未找到 README"
+
+
+def readme_roots(model: ModelEntry, app_data_dir: Path) -> List[Path]:
+    roots: List[Path] = []
+    if model.repo_id:
+        roots.append(app_data_dir / "readmes" / text_hash(model.repo_id))
+    if model.readme:
+        roots.append(Path(model.readme))
+    return roots
+
+
+def resolve_readme_path(
+    model: ModelEntry, app_data_dir: Path
+) -> Tuple[Optional[Path], str, str]:
+    roots = readme_roots(model, app_data_dir)
+    if not roots:
+        return None, README_NOT_DOWNLOADED, ""
+
+    last_checked = ""
+    saw_existing_root = False
+    for root in roots:
+        root = Path(str(root))
+        if not root.is_absolute() and (app_data_dir / root).exists():
+            root = app_data_dir / root
+
+        if not root.exists():
+            last_checked = str(root)
+            continue
+        saw_existing_root = True
+        if root.is_file():
+            if root.name.lower() == "readme.md":
+                return root, "", str(root)
+            last_checked = str(root)
+            continue
+        readme_path = find_readme_file(root)
+        if readme_path:
+            return readme_path, "", str(readme_path)
+        last_checked = str(root)
+
+    if saw_existing_root:
+        return None, README_NOT_FOUND, last_checked
+    return None, README_NOT_DOWNLOADED, last_checked
+
+
+def find_readme_file(root: Path) -> Optional[Path]:
+    if not root.is_dir():
+        return None
+    candidates = [path for path in list_files(root) if path.name.lower() == "readme.md"]
+    if not candidates:
+        return None
+    return sorted(candidates, key=lambda item: str(item))[0]
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+class ReadmeResolver:
+    def __init__(self, app_data_dir: Path) -> None:
+        self.app_data_dir = Path(app_data_dir)
+        self._cache: Dict[str, Tuple[Tuple, Tuple[Optional[Path], str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, model: ModelEntry) -> Tuple[Optional[Path], str, str]:
+        with self._lock:
+            cached = self._cache.get(model.relative_path)
+        if cached and cached[0] == self._signature(model, cached[1][0]):
+            return cached[1]
+        result = resolve_readme_path(model, self.app_data_dir)
+        with self._lock:
+            self._cache[model.relative_path] = (self._signature(model, result[0]), result)
+        return result
+
+    def read_text(self, model: ModelEntry, limit: Optional[int] = None) -> Optional[str]:
+        readme_path, _, _ = self.resolve(model)
+        if not readme_path:
+            return None
+        try:
+            with readme_path.open("rb") as handle:
+                raw = handle.read() if limit is None else handle.read(limit)
+        except OSError:
+            return None
+        return raw.decode("utf-8", errors="ignore")
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
+
+    def _signature(self, model: ModelEntry, readme_path: Optional[Path]) -> Tuple:
+        stamps = []
+        for root in readme_roots(model, self.app_data_dir):
+            stamps.append((str(root), _mtime(root)))
+            if not root.is_absolute():
+                stamps.append((str(self.app_data_dir / root), _mtime(self.app_data_dir / root)))
+        resolved = (str(readme_path), _mtime(readme_path)) if readme_path else None
+        return (model.repo_id, model.readme, tuple(stamps), resolved)
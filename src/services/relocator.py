@@ -0,0 +1,133 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from src.config import ConfigManager
+from src.models.model_roots import ModelRoot
+from src.models.model_scanner import ModelEntry
+from src.services.model_hashes import cached_hash
+from src.utils.file_utils import copy_verified, file_hash
+
+
+MoveProgress = Callable[[ModelEntry, int, int], None]
+
+
+class RelocateError(RuntimeError):
+    pass
+
+
+@dataclass
+class MovePlan:
+    model: ModelEntry
+    target: Path
+    new_key: str
+
+    @property
+    def is_noop(self) -> bool:
+        return Path(self.model.absolute_path) == self.target
+
+
+@dataclass
+class MoveResult:
+    plan: MovePlan
+    method: str = ""
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def plan_moves(
+    models: Iterable[ModelEntry],
+    roots: Sequence[ModelRoot],
+    root_name: Optional[str] = None,
+    model_type: Optional[str] = None,
+    base_model: Optional[str] = None,
+) -> List[MovePlan]:
+    by_name = {root.name: root for root in roots}
+    plans: List[MovePlan] = []
+    targets: Dict[Path, str] = {}
+    for model in models:
+        name = model.root if root_name is None else root_name
+        root = by_name.get(name)
+        if root is None:
+            raise RelocateError(f"unknown model root {name!r}")
+        target_type = model_type or model.model_type
+        type_dirs = root.type_dirs.get(target_type)
+        if not type_dirs:
+            raise RelocateError(f"root {name!r} has no {target_type} folder")
+        target_base = base_model or model.base_model
+        target = type_dirs[0] / target_base / model.name
+        if target in targets:
+            raise RelocateError(
+                f"{model.relative_path} and {targets[target]} both move to {target}"
+            )
+        targets[target] = model.relative_path
+        plans.append(MovePlan(model, target, root.key_for(target_type, target_base, model.name)))
+    return plans
+
+
+class Relocator:
+    def __init__(self, config_manager: ConfigManager, limit_bytes_per_sec: float = 0) -> None:
+        self.config_manager = config_manager
+        self.limit_bytes_per_sec = limit_bytes_per_sec
+
+    def move(
+        self, plans: Sequence[MovePlan], progress: Optional[MoveProgress] = None
+    ) -> List[MoveResult]:
+        results = self.transfer(plans, progress)
+        self.commit(results)
+        return results
+
+    def transfer(
+        self, plans: Sequence[MovePlan], progress: Optional[MoveProgress] = None
+    ) -> List[MoveResult]:
+        results: List[MoveResult] = []
+        for plan in plans:
+            try:
+                results.append(MoveResult(plan, self._move_one(plan, progress)))
+            except (OSError, RelocateError) as exc:
+                results.append(MoveResult(plan, error=str(exc)))
+        return results
+
+    def commit(self, results: Iterable[MoveResult]) -> None:
+        renames = {
+            result.plan.model.relative_path: result.plan.new_key
+            for result in results
+            if result.ok and result.plan.new_key != result.plan.model.relative_path
+        }
+        if renames:
+            self.config_manager.config.rename_metadata(renames)
+            self.config_manager.save()
+
+    def _same_device(self, source: Path, target_dir: Path) -> bool:
+        return source.stat().st_dev == target_dir.stat().st_dev
+
+    def _move_one(self, plan: MovePlan, progress: Optional[MoveProgress]) -> str:
+        source = Path(plan.model.absolute_path)
+        target = plan.target
+        if plan.is_noop:
+            return "noop"
+        if target.exists() or target.is_symlink():
+            raise RelocateError(f"{target} already exists")
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        if source.is_symlink():
+            os.symlink(source.resolve(), target)
+            source.unlink()
+            return "symlink"
+        if self._same_device(source, target.parent):
+            os.rename(source, target)
+            return "rename"
+
+        expected = cached_hash(self.config_manager.config, plan.model) or file_hash(source)
+
+        def report(copied: int, total: int) -> None:
+            if progress:
+                progress(plan.model, copied, total)
+
+        copy_verified(source, target, expected, self.limit_bytes_per_sec, report)
+        source.unlink()
+        return "copy"
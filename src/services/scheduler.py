@@ -0,0 +1,310 @@
+import itertools
+import logging
+import os
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_VISIBLE = 1
+PRIORITY_BACKGROUND = 2
+
+POOL_IO = "io"
+POOL_CPU = "cpu"
+POOL_SCAN = "scan"
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+logger = logging.getLogger(__name__)
+
+JobCallback = Callable[["Job"], None]
+Dispatcher = Callable[[Callable[[], None]], None]
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class Job:
+    def __init__(
+        self,
+        scheduler: "JobScheduler",
+        func: Callable[[], Any],
+        name: str,
+        pool: str,
+        priority: int,
+        group: str,
+        token: CancelToken,
+        on_done: Optional[JobCallback],
+        on_progress: Optional[JobCallback],
+    ) -> None:
+        self.id = next(scheduler._ids)
+        self.scheduler = scheduler
+        self.func = func
+        self.name = name
+        self.pool = pool
+        self.priority = priority
+        self.group = group
+        self.token = token
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.status = STATUS_QUEUED
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.progress: Tuple[int, int] = (0, 0)
+        self._done = threading.Event()
+        self._callbacks: List[JobCallback] = []
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    def report(self, done: int, total: int) -> None:
+        self.progress = (done, total)
+        if self.on_progress:
+            self.scheduler.dispatch(lambda: self.on_progress(self))
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        if not self._done.wait(timeout):
+            raise TimeoutError(self.name)
+        if self.status == STATUS_CANCELLED:
+            raise JobCancelled(self.name)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def add_done_callback(self, callback: JobCallback) -> None:
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _finish(self, status: str) -> None:
+        with self._lock:
+            self.status = status
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                logger.exception("job %s done callback failed", self.name)
+        if self.on_done:
+            self.scheduler.dispatch(lambda: self.on_done(self))
+
+
+class _Pool:
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.queue: "queue.PriorityQueue[Tuple[int, int, Optional[Job]]]" = queue.PriorityQueue()
+        self.threads: List[threading.Thread] = []
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        io_workers: int = 16,
+        cpu_workers: Optional[int] = None,
+        dispatcher: Optional[Dispatcher] = None,
+        autostart: bool = True,
+        scan_workers: int = 8,
+    ) -> None:
+        cpu_workers = cpu_workers or max(2, os.cpu_count() or 2)
+        self.pools: Dict[str, _Pool] = {
+            POOL_IO: _Pool(POOL_IO, io_workers),
+            POOL_CPU: _Pool(POOL_CPU, cpu_workers),
+            POOL_SCAN: _Pool(POOL_SCAN, scan_workers),
+        }
+        self.dispatcher = dispatcher
+        self.autostart = autostart
+        self._ids = itertools.count(1)
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._group_limits: Dict[str, int] = {}
+        self._group_running: Dict[str, int] = {}
+        self._group_waiting: Dict[str, List[Job]] = {}
+        self._local = threading.local()
+        self._started = False
+
+    def submit(
+        self,
+        func: Callable[[], Any],
+        pool: str = POOL_IO,
+        priority: int = PRIORITY_BACKGROUND,
+        name: str = "",
+        on_done: Optional[JobCallback] = None,
+        on_progress: Optional[JobCallback] = None,
+        token: Optional[CancelToken] = None,
+        group: str = "",
+        group_limit: int = 0,
+    ) -> Job:
+        job = Job(
+            self,
+            func,
+            name or getattr(func, "__name__", "job"),
+            pool,
+            priority,
+            group,
+            token or CancelToken(),
+            on_done,
+            on_progress,
+        )
+        if group and group_limit:
+            with self._lock:
+                self._group_limits[group] = group_limit
+        self._enqueue(job)
+        if self.autostart:
+            self.start()
+        return job
+
+    def gather(
+        self,
+        jobs: Sequence[Job],
+        on_done: Callable[[List[Job]], None],
+        marshal: bool = True,
+    ) -> None:
+        remaining = [len(jobs)]
+        lock = threading.Lock()
+
+        def complete() -> None:
+            if marshal:
+                self.dispatch(lambda: on_done(list(jobs)))
+            else:
+                on_done(list(jobs))
+
+        def finished(_job: Job) -> None:
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                complete()
+
+        if not jobs:
+            complete()
+        for job in jobs:
+            job.add_done_callback(finished)
+
+    def dispatch(self, callback: Callable[[], None]) -> None:
+        if self.dispatcher:
+            self.dispatcher(callback)
+            return
+        try:
+            callback()
+        except Exception:
+            logger.exception("job callback failed")
+
+    def current_job(self) -> Optional[Job]:
+        return getattr(self._local, "job", None)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for pool in self.pools.values():
+            for _ in range(pool.workers):
+                thread = threading.Thread(target=self._work, args=(pool,), daemon=True)
+                pool.threads.append(thread)
+                thread.start()
+
+    def shutdown(self) -> None:
+        for pool in self.pools.values():
+            for _ in pool.threads:
+                pool.queue.put((PRIORITY_BACKGROUND + 1, next(self._sequence), None))
+
+    def _enqueue(self, job: Job) -> None:
+        self.pools[job.pool].queue.put((job.priority, next(self._sequence), job))
+
+    def _work(self, pool: _Pool) -> None:
+        while True:
+            _, _, job = pool.queue.get()
+            if job is None:
+                return
+            if job.token.cancelled:
+                job._finish(STATUS_CANCELLED)
+                continue
+            if not self._claim_group(job):
+                continue
+            self._local.job = job
+            job.status = STATUS_RUNNING
+            try:
+                job.result = job.func()
+                status = STATUS_CANCELLED if job.token.cancelled else STATUS_DONE
+            except JobCancelled:
+                status = STATUS_CANCELLED
+            except Exception as exc:
+                job.error = exc
+                status = STATUS_FAILED
+            finally:
+                self._local.job = None
+                self._release_group(job)
+            job._finish(status)
+
+    def _claim_group(self, job: Job) -> bool:
+        if not job.group:
+            return True
+        with self._lock:
+            limit = self._group_limits.get(job.group, 0)
+            running = self._group_running.get(job.group, 0)
+            if limit and running >= limit:
+                self._group_waiting.setdefault(job.group, []).append(job)
+                return False
+            self._group_running[job.group] = running + 1
+            return True
+
+    def _release_group(self, job: Job) -> None:
+        if not job.group:
+            return
+        with self._lock:
+            self._group_running[job.group] -= 1
+            waiting = self._group_waiting.get(job.group)
+            released = waiting.pop(0) if waiting else None
+        if released:
+            self._enqueue(released)
+
+
+_default_scheduler: Optional[JobScheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler() -> JobScheduler:
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = JobScheduler()
+        return _default_scheduler
+
+
+def current_job() -> Optional[Job]:
+    return get_scheduler().current_job()
@@ -0,0 +1,157 @@
+import json
+import re
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.models.model_scanner import ModelEntry
+from src.services.readme_resolver import ReadmeResolver
+from src.utils.safetensors_utils import SafetensorsError, read_metadata
+
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+|[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]")
+MAX_README_BYTES = 256 * 1024
+METADATA_TEXT_KEYS = (
+    "ss_output_name",
+    "ss_base_model_version",
+    "modelspec.title",
+    "modelspec.description",
+    "modelspec.trigger_phrase",
+    "modelspec.tags",
+    "modelspec.architecture",
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def metadata_text(metadata: Dict[str, str]) -> str:
+    parts = [metadata[key] for key in METADATA_TEXT_KEYS if key in metadata]
+    frequency = metadata.get("ss_tag_frequency")
+    if frequency:
+        try:
+            datasets = json.loads(frequency)
+        except ValueError:
+            datasets = {}
+        if isinstance(datasets, dict):
+            for tags in datasets.values():
+                if isinstance(tags, dict):
+                    parts.extend(str(tag) for tag in tags)
+    return "\n".join(parts)
+
+
+@dataclass
+class _Document:
+    signature: Tuple
+    terms: Set[str]
+
+
+class SearchIndex:
+    def __init__(self, app_data_dir: Path, readmes: Optional[ReadmeResolver] = None) -> None:
+        self.readmes = readmes or ReadmeResolver(app_data_dir)
+        self._postings: Dict[str, Set[str]] = {}
+        self._documents: Dict[str, _Document] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def sync(self, models: Iterable[ModelEntry]) -> int:
+        seen: Set[str] = set()
+        updated = 0
+        for model in models:
+            seen.add(model.relative_path)
+            if self.update(model):
+                updated += 1
+        with self._lock:
+            stale = [key for key in self._documents if key not in seen]
+            for key in stale:
+                self._remove(key)
+        return updated + len(stale)
+
+    def update(self, model: ModelEntry) -> bool:
+        signature = self._signature(model)
+        document = self._documents.get(model.relative_path)
+        if document and document.signature == signature:
+            return False
+        terms = set(tokenize(self._document_text(model)))
+        with self._lock:
+            self._remove(model.relative_path)
+            self._documents[model.relative_path] = _Document(signature, terms)
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = set()
+                    self._vocabulary_dirty = True
+                postings.add(model.relative_path)
+        return True
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def search(self, query: str) -> Set[str]:
+        terms = set(tokenize(query))
+        if not terms:
+            return set()
+        with self._lock:
+            if self._vocabulary_dirty:
+                self._vocabulary = sorted(self._postings)
+                self._vocabulary_dirty = False
+            result: Optional[Set[str]] = None
+            for term in sorted(terms, key=len, reverse=True):
+                matches = self._prefix_matches(term, result)
+                result = matches if result is None else result & matches
+                if not result:
+                    return set()
+            return set(result or ())
+
+    def _prefix_matches(self, prefix: str, within: Optional[Set[str]]) -> Set[str]:
+        matches: Set[str] = set()
+        index = bisect_left(self._vocabulary, prefix)
+        while index < len(self._vocabulary):
+            term = self._vocabulary[index]
+            if not term.startswith(prefix):
+                break
+            postings = self._postings.get(term)
+            if postings:
+                matches.update(postings if within is None else postings & within)
+            index += 1
+        return matches
+
+    def _remove(self, key: str) -> None:
+        document = self._documents.pop(key, None)
+        if not document:
+            return
+        for term in document.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.discard(key)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary_dirty = True
+
+    def _signature(self, model: ModelEntry) -> Tuple:
+        try:
+            mtime = Path(model.absolute_path).stat().st_mtime_ns
+        except OSError:
+            mtime = 0
+        return (model.name, model.repo_id, model.notes, model.readme, model.size_bytes, mtime)
+
+    def _document_text(self, model: ModelEntry) -> str:
+        parts = [model.name, model.repo_id, model.notes]
+        readme_text = self.readmes.read_text(model, MAX_README_BYTES)
+        if readme_text:
+            parts.append(readme_text)
+        if model.name.lower().endswith(".safetensors"):
+            try:
+                parts.append(metadata_text(read_metadata(Path(model.absolute_path))))
+            except (OSError, SafetensorsError):
+                pass
+        return "\n".join(parts)
@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PIL import Image, features
+
+from src.services import metrics, tracing
+from src.utils.file_utils import file_hash
+
+
+Size = Tuple[int, int]
+
+CARD_SIZE: Size = (200, 200)
+DETAIL_SIZE: Size = (280, 280)
+THUMBNAIL_SIZES = (CARD_SIZE, DETAIL_SIZE)
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    decode_count: int = 0
+    decode_seconds: float = 0.0
+
+    @property
+    def lookups(self) -> int:
+        return self.memory_hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        if not self.lookups:
+            return 0.0
+        return (self.memory_hits + self.disk_hits) / self.lookups
+
+    def to_dict(self) -> Dict[str, float]:
+        payload = asdict(self)
+        payload["hit_rate"] = self.hit_rate
+        return payload
+
+
+class ThumbnailCache:
+    def __init__(
+        self,
+        app_data_dir: Path,
+        memory_limit: int = 256,
+        image_factory: Optional[Callable[[Image.Image], Any]] = None,
+    ) -> None:
+        self.root = Path(app_data_dir) / "thumbnails"
+        self.memory_limit = memory_limit
+        self.image_factory = image_factory or (lambda image: image)
+        self.format = "WEBP" if features.check("webp") else "PNG"
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[Tuple[str, Size], Any]" = OrderedDict()
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, size: Size) -> Optional[Any]:
+        digest = self.content_hash(path)
+        if digest is None:
+            return None
+        cached = self._lookup((digest, size))
+        if cached is not None:
+            return cached
+        image = self._load(path, digest, size)
+        if image is None:
+            return None
+        return self._remember((digest, size), self.image_factory(image))
+
+    def load(self, path: Path, size: Size) -> Optional[Image.Image]:
+        digest = self.content_hash(path)
+        if digest is None:
+            return None
+        return self._load(path, digest, size)
+
+    def ensure(self, path: Path) -> Optional[str]:
+        digest = self.content_hash(path)
+        if digest is None:
+            return None
+        if not all(self.thumbnail_path(digest, size).exists() for size in THUMBNAIL_SIZES):
+            self.generate(path, digest)
+        return digest
+
+    def peek(self, path: Path, size: Size) -> Optional[Any]:
+        digest = self.known_hash(path)
+        if digest is None:
+            return None
+        return self._lookup((digest, size))
+
+    def remember(self, path: Path, size: Size, image: Image.Image) -> Any:
+        digest = self.content_hash(path)
+        value = self.image_factory(image)
+        if digest is None:
+            return value
+        return self._remember((digest, size), value)
+
+    def known_hash(self, path: Path) -> Optional[str]:
+        cached = self._hashes.get(str(path))
+        if not cached:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        return None
+
+    def content_hash(self, path: Path) -> Optional[str]:
+        digest = self.known_hash(path)
+        if digest is not None:
+            return digest
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        digest = file_hash(path)
+        self._hashes[str(path)] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def thumbnail_path(self, digest: str, size: Size) -> Path:
+        suffix = ".webp" if self.format == "WEBP" else ".png"
+        return self.root / digest[:2] / f"{digest}_{size[0]}x{size[1]}{suffix}"
+
+    @tracing.traced("ThumbnailCache.generate", "image")
+    def generate(self, path: Path, digest: str) -> None:
+        start = time.perf_counter()
+        with Image.open(path) as source:
+            largest = max(THUMBNAIL_SIZES)
+            source.draft("RGB", largest)
+            source.load()
+            for size in sorted(THUMBNAIL_SIZES, reverse=True):
+                image = source.copy()
+                image.thumbnail(size)
+                if image.mode not in ("RGB", "RGBA"):
+                    image = image.convert("RGBA")
+                self._write(image, self.thumbnail_path(digest, size))
+        self._record_decode(time.perf_counter() - start)
+
+    def _load(self, path: Path, digest: str, size: Size) -> Optional[Image.Image]:
+        target = self.thumbnail_path(digest, size)
+        if target.exists():
+            with self._lock:
+                self.stats.disk_hits += 1
+            self._record_lookup("disk")
+        else:
+            with self._lock:
+                self.stats.misses += 1
+            self._record_lookup("miss")
+            try:
+                self.generate(path, digest)
+            except OSError:
+                return None
+        start = time.perf_counter()
+        try:
+            with tracing.span("ThumbnailCache.decode", "image", size=f"{size[0]}x{size[1]}"):
+                with Image.open(target) as thumbnail:
+                    thumbnail.load()
+                    image = thumbnail.copy()
+        except OSError:
+            return None
+        self._record_decode(time.perf_counter() - start)
+        return image
+
+    def _lookup(self, key: Tuple[str, Size]) -> Optional[Any]:
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+        if cached is not None:
+            self._record_lookup("memory")
+        return cached
+
+    def _remember(self, key: Tuple[str, Size], value: Any) -> Any:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_limit:
+                self._memory.popitem(last=False)
+        return value
+
+    def _write(self, image: Image.Image, target: Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f"{target.name}.{threading.get_ident()}.tmp")
+        image.save(temp, format=self.format)
+        os.replace(temp, target)
+
+    def _record_lookup(self, result: str) -> None:
+        metrics.THUMBNAIL_LOOKUPS.labels(result).inc()
+        metrics.THUMBNAIL_HIT_RATIO.set(self.stats.hit_rate)
+
+    def _record_decode(self, seconds: float) -> None:
+        with self._lock:
+            self.stats.decode_count += 1
+            self.stats.decode_seconds += seconds
@@ -0,0 +1,159 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.config import AppConfig
+from src.models.model_scanner import ModelEntry
+from src.services.model_hashes import cached_hash
+from src.utils.file_utils import CopyVerificationError, copy_verified, file_hash
+
+
+ACCESS_LOG_NAME = "access_log.json"
+DAY_SECONDS = 24 * 60 * 60
+
+CopyProgress = Callable[[int, int], None]
+
+
+class TierError(RuntimeError):
+    pass
+
+
+class AccessLog:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._entries: Dict[str, float] = {}
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            payload = {}
+        if isinstance(payload, dict):
+            self._entries = {
+                str(key): float(value)
+                for key, value in payload.items()
+                if isinstance(value, (int, float))
+            }
+
+    def get(self, key: str) -> float:
+        return self._entries.get(key, 0.0)
+
+    def record(self, key: str, when: Optional[float] = None) -> None:
+        self._entries[key] = when if when is not None else time.time()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(f"{self.path.name}.tmp")
+        temp.write_text(json.dumps(self._entries, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp, self.path)
+
+
+@dataclass
+class TierCandidate:
+    model: ModelEntry
+    last_access: float
+
+    @property
+    def idle_days(self) -> float:
+        return max(0.0, (time.time() - self.last_access) / DAY_SECONDS)
+
+
+class TierManager:
+    def __init__(
+        self,
+        config: AppConfig,
+        access_log: Optional[AccessLog] = None,
+        limit_bytes_per_sec: Optional[float] = None,
+    ) -> None:
+        if not config.slow_tier_dir:
+            raise TierError("slow_tier_dir is not configured")
+        self.config = config
+        self.slow_root = Path(config.slow_tier_dir)
+        self.access_log = access_log or AccessLog(Path(config.app_data_dir) / ACCESS_LOG_NAME)
+        if limit_bytes_per_sec is None:
+            limit_bytes_per_sec = config.tier_bandwidth_mb * 1024 * 1024
+        self.limit_bytes_per_sec = limit_bytes_per_sec
+
+    def is_demoted(self, model: ModelEntry) -> bool:
+        return Path(model.absolute_path).is_symlink()
+
+    def slow_path(self, model: ModelEntry) -> Path:
+        return self.slow_root / model.relative_path
+
+    def last_access(self, model: ModelEntry) -> float:
+        try:
+            atime = Path(model.absolute_path).stat().st_atime
+        except OSError:
+            atime = 0.0
+        return max(atime, self.access_log.get(model.relative_path))
+
+    def cold_candidates(
+        self,
+        models: Iterable[ModelEntry],
+        cold_days: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> List[TierCandidate]:
+        cold_days = self.config.tier_cold_days if cold_days is None else cold_days
+        cutoff = (now if now is not None else time.time()) - cold_days * DAY_SECONDS
+        candidates = [
+            TierCandidate(model, self.last_access(model))
+            for model in models
+            if not self.is_demoted(model)
+        ]
+        cold = [candidate for candidate in candidates if candidate.last_access < cutoff]
+        cold.sort(key=lambda candidate: (candidate.last_access, -candidate.model.size_bytes))
+        return cold
+
+    def demote(self, model: ModelEntry, progress: Optional[CopyProgress] = None) -> Path:
+        source = Path(model.absolute_path)
+        if source.is_symlink():
+            raise TierError(f"{model.relative_path} is already on the slow tier")
+        before = source.stat()
+        target = self.slow_path(model)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        expected = cached_hash(self.config, model) or file_hash(source)
+        self._transfer(source, target, expected, progress)
+
+        after = source.stat()
+        if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+            target.unlink(missing_ok=True)
+            raise TierError(f"{model.relative_path} changed while it was being moved")
+        link = source.with_name(f".{source.name}.tier-link")
+        link.unlink(missing_ok=True)
+        try:
+            os.symlink(target, link)
+            os.replace(link, source)
+        except OSError as exc:
+            link.unlink(missing_ok=True)
+            target.unlink(missing_ok=True)
+            raise TierError(
+                f"{model.relative_path} could not be linked to the slow tier: {exc}"
+            ) from exc
+        return target
+
+    def promote(self, model: ModelEntry, progress: Optional[CopyProgress] = None) -> Path:
+        link = Path(model.absolute_path)
+        if not link.is_symlink():
+            raise TierError(f"{model.relative_path} is not on the slow tier")
+        source = link.resolve()
+        expected = cached_hash(self.config, model) or file_hash(source)
+        staged = link.with_name(f".{link.name}.promote")
+        self._transfer(source, staged, expected, progress)
+        os.replace(staged, link)
+        source.unlink(missing_ok=True)
+        self.access_log.record(model.relative_path)
+        self.access_log.save()
+        return link
+
+    def _transfer(
+        self,
+        source: Path,
+        target: Path,
+        expected_hash: str,
+        progress: Optional[CopyProgress],
+    ) -> None:
+        try:
+            copy_verified(source, target, expected_hash, self.limit_bytes_per_sec, progress)
+        except CopyVerificationError as exc:
+            raise TierError(str(exc)) from exc
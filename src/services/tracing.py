@@ -0,0 +1,195 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar
+
+
+TRACE_ENV = "CMM_TRACE"
+DEFAULT_CAPACITY = 200_000
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _NullSpan:
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        return None
+
+    def set(self, **_args: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, _exc, _tb) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.complete(self.name, self.category, self.start, time.perf_counter_ns(), self.args)
+
+    def set(self, **args: Any) -> None:
+        self.args.update(args)
+
+
+class Tracer:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, output: Optional[Path] = None) -> None:
+        self.output = output
+        self.pid = os.getpid()
+        self.dropped = 0
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._threads: Dict[int, str] = {}
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def span(self, name: str, category: str = "app", **args: Any) -> _Span:
+        return _Span(self, name, category, args)
+
+    def complete(
+        self, name: str, category: str, start_ns: int, end_ns: int, args: Dict[str, Any]
+    ) -> None:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns - self._origin) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {key: _jsonable(value) for key, value in args.items()}
+        self._append(event)
+
+    def instant(self, name: str, category: str = "app", **args: Any) -> None:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "t",
+            "ts": (time.perf_counter_ns() - self._origin) / 1000,
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {key: _jsonable(value) for key, value in args.items()}
+        self._append(event)
+
+    def events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        names = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in threads.items()
+        ]
+        return names + events
+
+    def export(self, path: Optional[Path] = None) -> Optional[Path]:
+        path = path or self.output
+        if path is None:
+            return None
+        payload = {
+            "traceEvents": self.events(),
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f"{path.name}.tmp")
+        temp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(temp, path)
+        return path
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        tid = event["tid"]
+        with self._lock:
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def enable(output: Optional[Path] = None, capacity: int = DEFAULT_CAPACITY) -> Tracer:
+    global _tracer
+    _tracer = Tracer(capacity, output)
+    return _tracer
+
+
+def enable_from_env() -> Optional[Tracer]:
+    value = os.environ.get(TRACE_ENV, "").strip()
+    if not value or value == "0":
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return enable()
+    return enable(Path(value))
+
+
+def trace_path(directory: Path) -> Path:
+    return Path(directory) / f"trace-{os.getpid()}.json"
+
+
+def disable() -> Optional[Tracer]:
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def active() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, category: str = "app", **args: Any):
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def traced(name: str, category: str = "app") -> Callable[[F], F]:
+    def decorate(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with _Span(tracer, name, category, {}):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
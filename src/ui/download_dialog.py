@@ -1,10 +1,11 @@
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, List
+from typing import Callable, List, Optional
 
 import customtkinter as ctk
 
+from src.services.block_manifest import manifests_dir
 from src.services.hf_downloader import DownloadRequest, HFDownloader
 from src.utils.file_utils import file_size_display, text_hash
 
@@ -26,15 +27,19 @@ class DownloadDialog(ctk.CTkToplevel):
         selected_type: str,
         selected_base: str,
         token: str,
+        endpoints: List[str],
         models_root: Path,
         app_data_dir: Path,
         on_request: Callable[[str], None],
         on_complete: Callable[[DownloadResult], None],
+        peers: Optional[List[str]] = None,
     ) -> None:
         super().__init__(master)
         self.downloader = HFDownloader()
         self.on_complete = on_complete
         self.token = token
+        self.endpoints = endpoints
+        self.peers = peers or []
         self.models_root = models_root
         self.app_data_dir = app_data_dir
         self.on_request = on_request
@@ -109,6 +114,9 @@ class DownloadDialog(ctk.CTkToplevel):
             target_dir=target_dir,
             readme_dir=readme_root,
             token=self.token,
+            endpoints=list(self.endpoints),
+            manifest_dir=manifests_dir(self.app_data_dir),
+            peers=list(self.peers),
         )
         self.on_request(repo_id)
         self.downloader.download_async(
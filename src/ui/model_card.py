@@ -5,66 +5,139 @@ import customtkinter as ctk
 from PIL import Image
 
 from src.models.model_scanner import ModelEntry
+from src.services.integrity import STATUS_CORRUPT, STATUS_HASH_MISMATCH, STATUS_TRUNCATED
+from src.services.thumbnail_cache import CARD_SIZE
+from src.ui.thumbnail_loader import PRIORITY_VISIBLE, ThumbnailLoader
 from src.utils.file_utils import file_size_display
 
 
+INTEGRITY_BADGES = {
+    STATUS_TRUNCATED: "文件不完整",
+    STATUS_CORRUPT: "文件损坏",
+    STATUS_HASH_MISMATCH: "校验失败",
+}
+
+
 class ModelCard(ctk.CTkFrame):
+    _placeholder: Optional[ctk.CTkImage] = None
+
     def __init__(
         self,
         master,
         model: ModelEntry,
         on_open: Callable[[ModelEntry], None],
+        loader: ThumbnailLoader,
+        priority: int = PRIORITY_VISIBLE,
+        on_toggle: Optional[Callable[[ModelEntry], None]] = None,
     ) -> None:
-        super().__init__(master, fg_color="#21242b", corner_radius=14)
+        super().__init__(
+            master, fg_color="#21242b", corner_radius=14, border_width=2, border_color="#21242b"
+        )
         self.model = model
         self.on_open = on_open
+        self.on_toggle = on_toggle
+        self.selected = False
+        self.loader = loader
+        self._ticket = 0
         self.image_label: Optional[ctk.CTkLabel] = None
+        self.name_label: Optional[ctk.CTkLabel] = None
+        self.size_label: Optional[ctk.CTkLabel] = None
+        self.badge_label: Optional[ctk.CTkLabel] = None
         self.preview_image = None
 
         self._build()
+        self.bind_model(model, priority)
 
     def _build(self) -> None:
         self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
         image_frame = ctk.CTkFrame(self, fg_color="#1a1c21", corner_radius=10)
         image_frame.grid(row=0, column=0, padx=12, pady=(12, 8), sticky="nsew")
         image_label = ctk.CTkLabel(image_frame, text="预览图")
-        image_label.pack(expand=True, fill="both", padx=12, pady=24)
+        image_label.pack(expand=True, fill="both", padx=12, pady=12)
         self.image_label = image_label
 
-        if self.model.preview:
-            self._load_preview(Path(self.model.preview))
-
-        name_label = ctk.CTkLabel(
+        self.name_label = ctk.CTkLabel(
             self,
-            text=self.model.name,
+            text="",
             wraplength=180,
             justify="left",
             font=("Fira Sans", 13, "bold"),
         )
-        name_label.grid(row=1, column=0, padx=12, sticky="w")
+        self.name_label.grid(row=1, column=0, padx=12, sticky="w")
 
-        size_label = ctk.CTkLabel(
+        self.size_label = ctk.CTkLabel(
             self,
-            text=file_size_display(self.model.size_bytes),
+            text="",
             text_color="#a6adbb",
             font=("Fira Sans", 11),
         )
-        size_label.grid(row=2, column=0, padx=12, pady=(0, 12), sticky="w")
+        self.size_label.grid(row=2, column=0, padx=12, pady=(0, 12), sticky="w")
 
-        self.bind("<Button-1>", self._click)
-        for child in self.winfo_children():
-            child.bind("<Button-1>", self._click)
+        self.badge_label = ctk.CTkLabel(
+            self,
+            text="",
+            text_color="#ef6f6c",
+            font=("Fira Sans", 11, "bold"),
+        )
+        self.badge_label.grid(row=2, column=0, padx=12, pady=(0, 12), sticky="e")
+
+        widgets = [self, *self.winfo_children()]
         if self.image_label:
-            self.image_label.bind("<Button-1>", self._click)
+            widgets.append(self.image_label)
+        for widget in widgets:
+            widget.bind("<Button-1>", self._click)
+            widget.bind("<Control-Button-1>", self._toggle)
+
+    def bind_model(self, model: ModelEntry, priority: int = PRIORITY_VISIBLE) -> None:
+        self.model = model
+        if self.name_label:
+            self.name_label.configure(text=model.name)
+        if self.size_label:
+            self.size_label.configure(text=file_size_display(model.size_bytes))
+        if self.badge_label:
+            self.badge_label.configure(text=INTEGRITY_BADGES.get(model.integrity, ""))
+        self.cancel_preview()
+        self._clear_preview()
+        if model.preview:
+            self._ticket = self.loader.request(
+                Path(model.preview), CARD_SIZE, self._apply_preview, priority
+            )
+
+    def cancel_preview(self) -> None:
+        self.loader.cancel(self._ticket)
+        self._ticket = 0
+
+    def destroy(self) -> None:
+        self.cancel_preview()
+        super().destroy()
+
+    def set_selected(self, selected: bool) -> None:
+        if selected == self.selected:
+            return
+        self.selected = selected
+        self.configure(border_color="#5374a6" if selected else "#21242b")
 
     def _click(self, _event) -> None:
         self.on_open(self.model)
 
-    def _load_preview(self, path: Path) -> None:
-        if not path.exists():
+    def _toggle(self, _event) -> str:
+        if self.on_toggle:
+            self.on_toggle(self.model)
+        return "break"
+
+    def _clear_preview(self) -> None:
+        if ModelCard._placeholder is None:
+            blank = Image.new("RGBA", CARD_SIZE, (0, 0, 0, 0))
+            ModelCard._placeholder = ctk.CTkImage(blank, size=CARD_SIZE)
+        self.preview_image = None
+        if self.image_label:
+            self.image_label.configure(image=ModelCard._placeholder, text="预览图")
+
+    def _apply_preview(self, image) -> None:
+        self._ticket = 0
+        if image is None:
             return
-        image = Image.open(path)
-        image.thumbnail((200, 200))
-        self.preview_image = ctk.CTkImage(image, size=image.size)
+        self.preview_image = image
         if self.image_label:
             self.image_label.configure(image=self.preview_image, text="")
@@ -1,13 +1,20 @@
 import os
 import subprocess
+import tkinter
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Optional
 
 import customtkinter as ctk
-from PIL import Image
 
 from src.models.model_scanner import ModelEntry
-from src.utils.file_utils import file_size_display, list_files, text_hash
+from src.services.readme_resolver import ReadmeResolver
+from src.services.scheduler import Job
+from src.services.thumbnail_cache import DETAIL_SIZE
+from src.ui.thumbnail_loader import PRIORITY_INTERACTIVE, ThumbnailLoader
+from src.utils.file_utils import file_size_display
+
+
+README_PAGE_CHARS = 16_000
 
 
 class ModelDetailDialog(ctk.CTkToplevel):
@@ -15,19 +22,32 @@ class ModelDetailDialog(ctk.CTkToplevel):
         self,
         master,
         model: ModelEntry,
-        app_data_dir: str,
+        readmes: ReadmeResolver,
+        loader: ThumbnailLoader,
         on_preview: Callable[[ModelEntry], None],
         on_delete: Callable[[ModelEntry], None],
         on_save_notes: Callable[[ModelEntry, str], None],
+        on_promote: Optional[Callable[[ModelEntry], None]] = None,
+        on_warm: Optional[Callable[[ModelEntry], None]] = None,
+        on_convert: Optional[Callable[[ModelEntry], None]] = None,
     ) -> None:
         super().__init__(master)
         self.model = model
-        self.app_data_dir = Path(app_data_dir)
+        self.readmes = readmes
+        self.loader = loader
+        self._preview_ticket = 0
         self.on_preview = on_preview
         self.on_delete = on_delete
         self.on_save_notes = on_save_notes
+        self.on_promote = on_promote
+        self.on_warm = on_warm
+        self.on_convert = on_convert
         self.preview_image = None
         self.notes_box = None
+        self.readme_box: Optional[ctk.CTkTextbox] = None
+        self._readme_text = ""
+        self._readme_offset = 0
+        self._readme_after_id = None
 
         self.title("模型详情")
         self.geometry("820x620")
@@ -49,16 +69,16 @@ class ModelDetailDialog(ctk.CTkToplevel):
         left = ctk.CTkFrame(content, fg_color="#111318", corner_radius=14)
         left.pack(side="left", fill="y", padx=16, pady=16)
 
-        preview_label = ctk.CTkLabel(left, text="预览图")
-        preview_label.pack(padx=12, pady=12)
+        self.preview_label = ctk.CTkLabel(left, text="预览图")
+        self.preview_label.pack(padx=12, pady=12)
 
         if self.model.preview:
-            path = Path(self.model.preview)
-            if path.exists():
-                image = Image.open(path)
-                image.thumbnail((280, 280))
-                self.preview_image = ctk.CTkImage(image, size=image.size)
-                preview_label.configure(image=self.preview_image, text="")
+            self._preview_ticket = self.loader.request(
+                Path(self.model.preview),
+                DETAIL_SIZE,
+                self._apply_preview,
+                PRIORITY_INTERACTIVE,
+            )
 
         info_frame = ctk.CTkFrame(content, fg_color="#1a1d23")
         info_frame.pack(side="left", fill="both", expand=True, padx=(0, 16), pady=16)
@@ -74,11 +94,11 @@ class ModelDetailDialog(ctk.CTkToplevel):
             anchor="w", padx=12, pady=(12, 8)
         )
 
-        readme_text = self._read_readme()
-        readme_box = ctk.CTkTextbox(info_frame, wrap="word", height=220)
-        readme_box.insert("1.0", readme_text)
-        readme_box.configure(state="disabled")
-        readme_box.pack(fill="both", expand=True, padx=12, pady=(0, 12))
+        self.readme_box = ctk.CTkTextbox(info_frame, wrap="word", height=220)
+        self.readme_box.insert("1.0", "README 加载中…")
+        self.readme_box.configure(state="disabled")
+        self.readme_box.pack(fill="both", expand=True, padx=12, pady=(0, 12))
+        self._load_readme_async()
 
         notes_label = ctk.CTkLabel(info_frame, text="用途提示")
         notes_label.pack(anchor="w", padx=12, pady=(0, 6))
@@ -114,6 +134,33 @@ class ModelDetailDialog(ctk.CTkToplevel):
             command=self._open_folder,
         ).pack(side="left", padx=6)
 
+        if self.on_warm:
+            ctk.CTkButton(
+                actions,
+                text="预热到内存",
+                fg_color="#2f3e46",
+                hover_color="#3d4f59",
+                command=lambda: self.on_warm(self.model),
+            ).pack(side="left", padx=6)
+
+        if self.on_convert and self.model.name.lower().endswith(".safetensors"):
+            ctk.CTkButton(
+                actions,
+                text="转换为 FP16",
+                fg_color="#2f3e46",
+                hover_color="#3d4f59",
+                command=lambda: self.on_convert(self.model),
+            ).pack(side="left", padx=6)
+
+        if self.on_promote and Path(self.model.absolute_path).is_symlink():
+            ctk.CTkButton(
+                actions,
+                text="移回高速存储",
+                fg_color="#2f3e46",
+                hover_color="#3d4f59",
+                command=lambda: self.on_promote(self.model),
+            ).pack(side="left", padx=6)
+
         ctk.CTkButton(
             actions,
             text="删除模型",
@@ -122,6 +169,20 @@ class ModelDetailDialog(ctk.CTkToplevel):
             command=lambda: self.on_delete(self.model),
         ).pack(side="right", padx=6)
 
+    def _apply_preview(self, image) -> None:
+        self._preview_ticket = 0
+        if image is None:
+            return
+        self.preview_image = image
+        self.preview_label.configure(image=self.preview_image, text="")
+
+    def destroy(self) -> None:
+        self.loader.cancel(self._preview_ticket)
+        if self._readme_after_id:
+            self.after_cancel(self._readme_after_id)
+            self._readme_after_id = None
+        super().destroy()
+
     def _save_notes(self) -> None:
         if not self.notes_box:
             return
@@ -135,55 +196,52 @@ class ModelDetailDialog(ctk.CTkToplevel):
         elif os.name == "posix":
             subprocess.Popen(["xdg-open", str(path)])
 
+    def _load_readme_async(self) -> None:
+        self.loader.scheduler.submit(
+            self._read_readme,
+            priority=PRIORITY_INTERACTIVE,
+            name=f"readme {self.model.name}",
+            on_done=self._readme_loaded,
+        )
+
+    def _readme_loaded(self, job: Job) -> None:
+        try:
+            self._render_readme(job.result or "")
+        except (RuntimeError, tkinter.TclError):
+            return
+
     def _read_readme(self) -> str:
-        readme_path, state, diagnostic_path = self._resolve_readme_path()
+        readme_path, state, diagnostic_path = self.readmes.resolve(self.model)
         if not readme_path:
             return self._format_readme_state(state, diagnostic_path)
-        content = readme_path.read_text(encoding="utf-8", errors="ignore")
+        content = self.readmes.read_text(self.model)
+        if content is None:
+            return self._format_readme_state(state, diagnostic_path)
         return self._format_readme_state(content, diagnostic_path)
 
-    def _resolve_readme_path(self) -> tuple[Path | None, str, str]:
-        roots: list[Path] = []
-        if self.model.repo_id:
-            roots.append(self.app_data_dir / "readmes" / text_hash(self.model.repo_id))
-        if self.model.readme:
-            roots.append(Path(self.model.readme))
-
-        if not roots:
-            return None, "README 未下载", ""
-
-        last_checked = ""
-        saw_existing_root = False
-        for root in roots:
-            root = Path(str(root))
-            if not root.is_absolute() and (self.app_data_dir / root).exists():
-                root = self.app_data_dir / root
-
-            if not root.exists():
-                last_checked = str(root)
-                continue
-            saw_existing_root = True
-            if root.is_file():
-                if root.name.lower() == "readme.md":
-                    return root, "", str(root)
-                last_checked = str(root)
-                continue
-            readme_path = self._find_readme_file(root)
-            if readme_path:
-                return readme_path, "", str(readme_path)
-            last_checked = str(root)
-
-        if saw_existing_root:
-            return None, "已下载但未找到 README", last_checked
-        return None, "README 未下载", last_checked
-
-    def _find_readme_file(self, root: Path) -> Path | None:
-        if not root.is_dir():
-            return None
-        candidates = [path for path in list_files(root) if path.name.lower() == "readme.md"]
-        if not candidates:
-            return None
-        return sorted(candidates, key=lambda item: str(item))[0]
+    def _render_readme(self, text: str) -> None:
+        if not self.readme_box or not self.winfo_exists():
+            return
+        self._readme_text = text
+        self._readme_offset = 0
+        self.readme_box.configure(state="normal")
+        self.readme_box.delete("1.0", "end")
+        self.readme_box.configure(state="disabled")
+        self._render_readme_page()
+
+    def _render_readme_page(self) -> None:
+        self._readme_after_id = None
+        if not self.readme_box or not self.winfo_exists():
+            return
+        page = self._readme_text[
+            self._readme_offset : self._readme_offset + README_PAGE_CHARS
+        ]
+        self._readme_offset += len(page)
+        self.readme_box.configure(state="normal")
+        self.readme_box.insert("end", page)
+        self.readme_box.configure(state="disabled")
+        if self._readme_offset < len(self._readme_text):
+            self._readme_after_id = self.after(1, self._render_readme_page)
 
     def _format_readme_state(self, content: str, diagnostic_path: str) -> str:
         if diagnostic_path:
@@ -1,42 +1,222 @@
-from typing import Callable, List
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 import customtkinter as ctk
 
+from src.models.catalog import diff_models
 from src.models.model_scanner import ModelEntry
+from src.services import tracing
 from src.ui.model_card import ModelCard
+from src.ui.thumbnail_loader import PRIORITY_OFFSCREEN, PRIORITY_VISIBLE, ThumbnailLoader
 
 
-class ModelGrid(ctk.CTkScrollableFrame):
+@dataclass
+class GridLayout:
+    column_count: int = 3
+    row_height: int = 320
+    padding: int = 12
+    overscan_rows: int = 1
+
+    def row_count(self, item_count: int) -> int:
+        return math.ceil(item_count / self.column_count)
+
+    def content_height(self, item_count: int) -> int:
+        return self.row_count(item_count) * self.row_height + self.padding
+
+    def visible_range(
+        self, item_count: int, top: float, height: float, overscan: bool = True
+    ) -> range:
+        if item_count <= 0 or height <= 0:
+            return range(0)
+        extra = self.overscan_rows if overscan else 0
+        first_row = max(0, int(top // self.row_height) - extra)
+        last_row = min(
+            self.row_count(item_count),
+            math.ceil((top + height) / self.row_height) + extra,
+        )
+        return range(
+            first_row * self.column_count,
+            min(item_count, last_row * self.column_count),
+        )
+
+    def cell(self, index: int, width: float) -> Tuple[int, int, int, int]:
+        card_width = max(
+            1, int((width - self.padding * (self.column_count + 1)) / self.column_count)
+        )
+        row, col = divmod(index, self.column_count)
+        x = self.padding + col * (card_width + self.padding)
+        y = self.padding + row * self.row_height
+        return x, y, card_width, self.row_height - self.padding
+
+
+class ModelGrid(ctk.CTkFrame):
     def __init__(
         self,
         master,
         on_open: Callable[[ModelEntry], None],
+        loader: ThumbnailLoader,
+        on_selection_change: Optional[Callable[[int], None]] = None,
     ) -> None:
         super().__init__(master, fg_color="#0f1013")
         self.on_open = on_open
-        self.cards: List[ModelCard] = []
-        self.column_count = 3
+        self.loader = loader
+        self.on_selection_change = on_selection_change
+        self.selected: Set[str] = set()
+        self.layout = GridLayout()
+        self.models: List[ModelEntry] = []
+        self.cards: Dict[str, ModelCard] = {}
+        self._pool: List[ModelCard] = []
+        self._windows: Dict[ModelCard, int] = {}
+        self._placements: Dict[ModelCard, Tuple[int, int, int, int]] = {}
+
+        self.canvas = ctk.CTkCanvas(
+            self, bg="#0f1013", highlightthickness=0, yscrollincrement=20
+        )
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
 
+        self.empty_label = ctk.CTkLabel(
+            self.canvas,
+            text="暂无模型",
+            font=("Fira Sans", 16),
+            text_color="#a6adbb",
+        )
+        self._empty_window = self.canvas.create_window(
+            20, 20, window=self.empty_label, anchor="nw"
+        )
+
+        self.canvas.bind("<Configure>", lambda _event: self._refresh())
+        self.bind_all("<MouseWheel>", self._on_mouse_wheel, add="+")
+        self.bind_all("<Button-4>", self._on_mouse_wheel, add="+")
+        self.bind_all("<Button-5>", self._on_mouse_wheel, add="+")
+
+    @tracing.traced("ModelGrid.update_models", "ui")
     def update_models(self, models: List[ModelEntry]) -> None:
-        for card in self.cards:
-            card.destroy()
-        self.cards = []
-
-        if not models:
-            empty_label = ctk.CTkLabel(
-                self,
-                text="暂无模型",
-                font=("Fira Sans", 16),
-                text_color="#a6adbb",
-            )
-            empty_label.grid(row=0, column=0, padx=20, pady=20)
+        diff = diff_models(self.models, models)
+        if diff.is_empty and [model.relative_path for model in models] == [
+            model.relative_path for model in self.models
+        ]:
             return
+        keep_scroll = len(diff.removed) < len(self.models)
+        self.models = list(models)
+        lookup = {model.relative_path: model for model in self.models}
+        if self.selected - lookup.keys():
+            self.selected &= lookup.keys()
+            self._selection_changed()
+
+        for key in diff.removed:
+            if key in self.cards:
+                self._recycle(key)
+        for key in diff.changed:
+            card = self.cards.get(key)
+            if card:
+                card.bind_model(lookup[key], PRIORITY_VISIBLE)
+
+        if not keep_scroll:
+            self.canvas.yview_moveto(0)
+        self.canvas.itemconfigure(
+            self._empty_window, state="hidden" if self.models else "normal"
+        )
+        self._refresh()
+
+    @tracing.traced("ModelGrid.refresh", "ui")
+    def _refresh(self) -> None:
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        content_height = self.layout.content_height(len(self.models))
+        self.canvas.configure(scrollregion=(0, 0, width, max(content_height, height)))
+
+        top = self.canvas.canvasy(0)
+        visible = self.layout.visible_range(len(self.models), top, height)
+        viewport = self.layout.visible_range(len(self.models), top, height, overscan=False)
+        visible_keys = {self.models[index].relative_path for index in visible}
+        for key in [key for key in self.cards if key not in visible_keys]:
+            self._recycle(key)
+        for index in sorted(visible, key=lambda index: index not in viewport):
+            model = self.models[index]
+            card = self.cards.get(model.relative_path)
+            if card is None:
+                priority = PRIORITY_VISIBLE if index in viewport else PRIORITY_OFFSCREEN
+                card = self._acquire(model, priority)
+                self.cards[model.relative_path] = card
+            self._place(card, self.layout.cell(index, width))
 
-        for index, model in enumerate(models):
-            card = ModelCard(self, model, self.on_open)
-            row = index // self.column_count
-            col = index % self.column_count
-            card.grid(row=row, column=col, padx=12, pady=12, sticky="nsew")
-            self.cards.append(card)
-        for col in range(self.column_count):
-            self.grid_columnconfigure(col, weight=1)
+    def selected_models(self) -> List[ModelEntry]:
+        return [model for model in self.models if model.relative_path in self.selected]
+
+    def clear_selection(self) -> None:
+        if not self.selected:
+            return
+        self.selected.clear()
+        for card in self.cards.values():
+            card.set_selected(False)
+        self._selection_changed()
+
+    def _toggle(self, model: ModelEntry) -> None:
+        key = model.relative_path
+        if key in self.selected:
+            self.selected.discard(key)
+        else:
+            self.selected.add(key)
+        card = self.cards.get(key)
+        if card:
+            card.set_selected(key in self.selected)
+        self._selection_changed()
+
+    def _selection_changed(self) -> None:
+        if self.on_selection_change:
+            self.on_selection_change(len(self.selected))
+
+    def _place(self, card: ModelCard, cell: Tuple[int, int, int, int]) -> None:
+        if self._placements.get(card) == cell:
+            return
+        x, y, card_width, card_height = cell
+        window = self._windows[card]
+        self.canvas.coords(window, x, y)
+        self.canvas.itemconfigure(
+            window, width=card_width, height=card_height, state="normal"
+        )
+        self._placements[card] = cell
+
+    def _acquire(self, model: ModelEntry, priority: int) -> ModelCard:
+        if self._pool:
+            card = self._pool.pop()
+            card.loader = self.loader
+            card.bind_model(model, priority)
+        else:
+            card = ModelCard(
+                self.canvas, model, self.on_open, self.loader, priority, self._toggle
+            )
+            self._windows[card] = self.canvas.create_window(
+                0, 0, window=card, anchor="nw", state="hidden"
+            )
+        card.set_selected(model.relative_path in self.selected)
+        return card
+
+    def _recycle(self, key: str) -> None:
+        card = self.cards.pop(key)
+        card.cancel_preview()
+        self.canvas.itemconfigure(self._windows[card], state="hidden")
+        self._placements.pop(card, None)
+        self._pool.append(card)
+
+    def _yview(self, *args) -> None:
+        self.canvas.yview(*args)
+        self._refresh()
+
+    def _on_mouse_wheel(self, event) -> None:
+        if not str(event.widget).startswith(str(self.canvas)):
+            return
+        if event.num == 4:
+            units = -3
+        elif event.num == 5:
+            units = 3
+        elif abs(event.delta) >= 120:
+            units = -int(event.delta / 120) * 3
+        else:
+            units = -event.delta
+        self.canvas.yview_scroll(units, "units")
+        self._refresh()
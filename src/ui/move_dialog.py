@@ -0,0 +1,68 @@
+from typing import Callable, List
+
+import customtkinter as ctk
+
+
+MAIN_ROOT_LABEL = "主目录"
+
+
+class MoveDialog(ctk.CTkToplevel):
+    def __init__(
+        self,
+        master,
+        count: int,
+        roots: List[str],
+        model_types: List[str],
+        base_models: List[str],
+        selected_type: str,
+        selected_base: str,
+        on_confirm: Callable[[str, str, str], None],
+    ) -> None:
+        super().__init__(master)
+        self.count = count
+        self.on_confirm = on_confirm
+        self._roots = {root or MAIN_ROOT_LABEL: root for root in roots}
+
+        self.title("移动模型")
+        self.geometry("420x300")
+        self.configure(fg_color="#14161b")
+
+        self.root_option = ctk.CTkOptionMenu(self, values=list(self._roots))
+        self.type_option = ctk.CTkOptionMenu(self, values=model_types)
+        self.base_option = ctk.CTkOptionMenu(self, values=base_models)
+        if selected_type in model_types:
+            self.type_option.set(selected_type)
+        if selected_base in base_models:
+            self.base_option.set(selected_base)
+
+        self._build()
+
+    def _build(self) -> None:
+        ctk.CTkLabel(
+            self, text=f"移动 {self.count} 个模型", font=("Fira Sans", 16, "bold")
+        ).pack(pady=(16, 12))
+
+        for label, option in (
+            ("目标目录", self.root_option),
+            ("类型", self.type_option),
+            ("基底模型", self.base_option),
+        ):
+            row = ctk.CTkFrame(self, fg_color="#14161b")
+            row.pack(fill="x", padx=24, pady=4)
+            ctk.CTkLabel(row, text=label, width=80, anchor="w").pack(side="left")
+            option.pack(in_=row, side="left", expand=True, fill="x")
+
+        actions = ctk.CTkFrame(self, fg_color="#14161b")
+        actions.pack(fill="x", padx=24, pady=(16, 16))
+        ctk.CTkButton(actions, text="移动", command=self._confirm).pack(side="left", padx=6)
+        ctk.CTkButton(actions, text="取消", fg_color="#2a2c33", command=self.destroy).pack(
+            side="left", padx=6
+        )
+
+    def _confirm(self) -> None:
+        self.on_confirm(
+            self._roots[self.root_option.get()],
+            self.type_option.get(),
+            self.base_option.get(),
+        )
+        self.destroy()
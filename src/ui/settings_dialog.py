@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Callable
+from typing import Callable, List
 
 import customtkinter as ctk
 from tkinter import filedialog
@@ -14,7 +14,9 @@ class SettingsDialog(ctk.CTkToplevel):
         comfyui_dir: str,
         app_data_dir: str,
         hf_token: str,
-        on_save: Callable[[str, str, str], None],
+        hf_endpoints: List[str],
+        extra_model_paths_yaml: str,
+        on_save: Callable[[str, str, str, List[str], str], None],
         on_close: Callable[[], None],
     ) -> None:
         super().__init__(master)
@@ -22,7 +24,7 @@ class SettingsDialog(ctk.CTkToplevel):
         self.on_close = on_close
 
         self.title("设置")
-        self.geometry("560x560")
+        self.geometry("560x720")
         self.configure(fg_color="#15171c")
         self.protocol("WM_DELETE_WINDOW", self._close)
 
@@ -33,9 +35,17 @@ class SettingsDialog(ctk.CTkToplevel):
             self, placeholder_text="例如: D:\\ComfyModelManager\\data"
         )
         self.token_entry = ctk.CTkEntry(self, show="*")
+        self.endpoints_entry = ctk.CTkEntry(
+            self, placeholder_text="例如: https://hf-mirror.com, https://huggingface.co"
+        )
+        self.extra_paths_entry = ctk.CTkEntry(
+            self, placeholder_text="例如: D:\\ComfyUI\\extra_model_paths.yaml"
+        )
         self.comfy_entry.insert(0, comfyui_dir)
         self.data_entry.insert(0, app_data_dir)
         self.token_entry.insert(0, hf_token)
+        self.endpoints_entry.insert(0, ", ".join(hf_endpoints))
+        self.extra_paths_entry.insert(0, extra_model_paths_yaml)
         self.comfyui_dir = comfyui_dir
         self.app_data_dir = app_data_dir
 
@@ -108,6 +118,27 @@ class SettingsDialog(ctk.CTkToplevel):
         )
         self.data_current.pack(anchor="w", padx=24, pady=(0, 8))
 
+        ctk.CTkLabel(
+            self,
+            text="extra_model_paths.yaml（可选）",
+            font=("Fira Sans", 12, "bold"),
+            text_color="#e0e6f1",
+        ).pack(anchor="w", padx=24, pady=(0, 4))
+        extra_row = ctk.CTkFrame(self, fg_color="#15171c")
+        extra_row.pack(fill="x", padx=24, pady=(0, 4))
+        self.extra_paths_entry.pack(in_=extra_row, side="left", fill="x", expand=True)
+        ctk.CTkButton(
+            extra_row,
+            text="选择文件",
+            width=120,
+            fg_color="#2a2c33",
+            command=self._pick_extra_paths,
+        ).pack(side="left", padx=(8, 0))
+        self.extra_paths_error = ctk.CTkLabel(
+            self, text="", font=("Fira Sans", 11), text_color="#d67067"
+        )
+        self.extra_paths_error.pack(anchor="w", padx=24, pady=(0, 6))
+
         ctk.CTkLabel(
             self,
             text="Hugging Face Token",
@@ -116,6 +147,20 @@ class SettingsDialog(ctk.CTkToplevel):
         ).pack(anchor="w", padx=24, pady=(6, 4))
         self.token_entry.pack(fill="x", padx=24, pady=(0, 6))
 
+        ctk.CTkLabel(
+            self,
+            text="Hugging Face 镜像",
+            font=("Fira Sans", 12, "bold"),
+            text_color="#e0e6f1",
+        ).pack(anchor="w", padx=24, pady=(6, 4))
+        self.endpoints_entry.pack(fill="x", padx=24, pady=(0, 4))
+        ctk.CTkLabel(
+            self,
+            text="多个地址用逗号分隔，下载前测速并自动选择最快的地址",
+            font=("Fira Sans", 11),
+            text_color="#9aa3b2",
+        ).pack(anchor="w", padx=24)
+
         ctk.CTkButton(
             self,
             text="保存",
@@ -136,6 +181,14 @@ class SettingsDialog(ctk.CTkToplevel):
             self._apply_directory(self.data_entry, self.data_error, folder)
         self._bring_to_front()
 
+    def _pick_extra_paths(self) -> None:
+        path = filedialog.askopenfilename(filetypes=[("YAML", "*.yaml;*.yml")])
+        if path:
+            self.extra_paths_entry.delete(0, "end")
+            self.extra_paths_entry.insert(0, path)
+            self.extra_paths_error.configure(text="")
+        self._bring_to_front()
+
     def _bring_to_front(self) -> None:
         self.lift()
         self.focus_force()
@@ -171,16 +224,25 @@ class SettingsDialog(ctk.CTkToplevel):
         comfy_dir = self.comfy_entry.get().strip()
         data_dir = self.data_entry.get().strip()
         token = self.token_entry.get().strip()
+        endpoints = [
+            item.strip()
+            for item in self.endpoints_entry.get().split(",")
+            if item.strip()
+        ]
+        extra_paths = self.extra_paths_entry.get().strip()
         if not comfy_dir:
             self.comfy_error.configure(text="请填写 ComfyUI 模型目录。")
             return
+        if extra_paths and not Path(extra_paths).is_file():
+            self.extra_paths_error.configure(text="需要选择 YAML 文件。")
+            return
         comfy_valid = self._validate_directory(comfy_dir, self.comfy_error)
         data_valid = self._validate_directory(data_dir, self.data_error)
         if not comfy_valid or not data_valid:
             return
         if not data_dir:
             data_dir = str(default_app_data_dir())
-        self.on_save(comfy_dir, data_dir, token)
+        self.on_save(comfy_dir, data_dir, token, endpoints, extra_paths)
         self._close()
 
     def _close(self) -> None:
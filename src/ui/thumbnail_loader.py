@@ -0,0 +1,126 @@
+import itertools
+import queue
+import threading
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from src.services.scheduler import (
+    POOL_CPU,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_VISIBLE,
+    Job,
+    JobScheduler,
+    get_scheduler,
+)
+from src.services.thumbnail_cache import Size, ThumbnailCache
+
+
+PRIORITY_OFFSCREEN = PRIORITY_BACKGROUND
+
+ImageCallback = Callable[[Optional[Any]], None]
+
+
+@dataclass
+class _LoadRequest:
+    ticket: int
+    path: Path
+    size: Size
+    callback: ImageCallback
+    job: Optional[Job] = None
+
+
+class ThumbnailLoader:
+    def __init__(
+        self,
+        widget,
+        cache: ThumbnailCache,
+        scheduler: Optional[JobScheduler] = None,
+        batch_size: int = 24,
+        poll_ms: int = 16,
+    ) -> None:
+        self.widget = widget
+        self.cache = cache
+        self.scheduler = scheduler or get_scheduler()
+        self.batch_size = batch_size
+        self.poll_ms = poll_ms
+        self._results: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._pending: Dict[int, _LoadRequest] = {}
+        self._tickets = itertools.count(1)
+        self._lock = threading.Lock()
+        self._draining = False
+
+    def request(
+        self,
+        path: Path,
+        size: Size,
+        callback: ImageCallback,
+        priority: int = PRIORITY_VISIBLE,
+    ) -> int:
+        cached = self.cache.peek(path, size)
+        if cached is not None:
+            callback(cached)
+            return 0
+        load = _LoadRequest(next(self._tickets), path, size, callback)
+        with self._lock:
+            self._pending[load.ticket] = load
+        load.job = self.scheduler.submit(
+            partial(self._work, load),
+            pool=POOL_CPU,
+            priority=priority,
+            name=f"thumbnail {path.name}",
+        )
+        self._schedule_drain()
+        return load.ticket
+
+    def cancel(self, ticket: int) -> None:
+        if not ticket:
+            return
+        with self._lock:
+            load = self._pending.pop(ticket, None)
+        if load is not None and load.job is not None:
+            load.job.cancel()
+
+    def _is_pending(self, ticket: int) -> bool:
+        with self._lock:
+            return ticket in self._pending
+
+    def _work(self, load: _LoadRequest) -> None:
+        if not self._is_pending(load.ticket):
+            return
+        try:
+            cached = self.cache.peek(load.path, load.size)
+            if cached is not None:
+                self._results.put((load.ticket, cached, None))
+                return
+            image = self.cache.load(load.path, load.size)
+        except Exception:
+            image = None
+        self._results.put((load.ticket, None, image))
+
+    def _schedule_drain(self) -> None:
+        if self._draining:
+            return
+        self._draining = True
+        self.widget.after(self.poll_ms, self._drain)
+
+    def _drain(self) -> None:
+        self._draining = False
+        for _ in range(self.batch_size):
+            try:
+                ticket, cached, image = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                load = self._pending.pop(ticket, None)
+            if load is None:
+                continue
+            if cached is None and image is not None:
+                cached = self.cache.remember(load.path, load.size, image)
+            load.callback(cached)
+        with self._lock:
+            busy = bool(self._pending)
+        if busy or not self._results.empty():
+            self._schedule_drain()
@@ -9,11 +9,21 @@ class Topbar(ctk.CTkFrame):
         master,
         base_models: List[str],
         on_select: Callable[[str], None],
+        on_search: Callable[[str], None],
     ) -> None:
         super().__init__(master, fg_color="#15161a")
         self.on_select = on_select
+        self.on_search = on_search
         self.buttons = {}
 
+        self.search_entry = ctk.CTkEntry(
+            self, width=220, placeholder_text="搜索名称 / 触发词 / 用途提示"
+        )
+        self.search_entry.pack(side="right", padx=12, pady=12)
+        self.search_entry.bind(
+            "<KeyRelease>", lambda _event: self.on_search(self.search_entry.get())
+        )
+
         for base in base_models:
             btn = ctk.CTkButton(
                 self,
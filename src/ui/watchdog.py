@@ -0,0 +1,201 @@
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+WATCHDOG_ENV = "CMM_WATCHDOG"
+THRESHOLD_ENV = "CMM_WATCHDOG_THRESHOLD_MS"
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    def __init__(self, window_seconds: float = 600.0, max_samples: int = 50_000) -> None:
+        self.window_seconds = window_seconds
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, value_ms: float, now: Optional[float] = None) -> None:
+        with self._lock:
+            self._samples.append((now if now is not None else time.monotonic(), value_ms))
+
+    def snapshot(self, now: Optional[float] = None) -> Dict:
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            while self._samples and now - self._samples[0][0] > self.window_seconds:
+                self._samples.popleft()
+            values = sorted(value for _, value in self._samples)
+        counts = {f"le_{bound}": 0 for bound in BUCKETS_MS}
+        counts["le_inf"] = 0
+        for value in values:
+            for bound in BUCKETS_MS:
+                if value <= bound:
+                    counts[f"le_{bound}"] += 1
+            counts["le_inf"] += 1
+        return {
+            "count": len(values),
+            "max_ms": values[-1] if values else 0.0,
+            "p50_ms": _percentile(values, 0.50),
+            "p95_ms": _percentile(values, 0.95),
+            "p99_ms": _percentile(values, 0.99),
+            "buckets": counts,
+        }
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class UiWatchdog:
+    def __init__(
+        self,
+        root,
+        threshold_ms: float = 200.0,
+        interval_ms: int = 100,
+        report_path: Optional[Path] = None,
+        export_interval_ms: int = 30_000,
+    ) -> None:
+        self.root = root
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self.report_path = report_path
+        self.export_interval_ms = export_interval_ms
+        self.loop_lag = LatencyHistogram()
+        self.callbacks: Dict[str, LatencyHistogram] = {}
+        self.slow_events: Deque[Dict] = deque(maxlen=50)
+        self._main_ident = threading.get_ident()
+        self._active: Optional[Tuple[str, float]] = None
+        self._reported: Optional[Tuple[str, float]] = None
+        self._expected = 0.0
+        self._last_beat = time.monotonic()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, root, report_dir: Path) -> Optional["UiWatchdog"]:
+        if not os.environ.get(WATCHDOG_ENV):
+            return None
+        threshold = float(os.environ.get(THRESHOLD_ENV, "200"))
+        return cls(root, threshold_ms=threshold, report_path=report_dir / "ui_latency.json")
+
+    def start(self) -> None:
+        self._expected = time.monotonic() + self.interval_ms / 1000
+        self.root.after(self.interval_ms, self._heartbeat)
+        if self.report_path:
+            self.root.after(self.export_interval_ms, self._periodic_export)
+        threading.Thread(target=self._monitor, daemon=True).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self.report_path:
+            self.export(self.report_path)
+
+    def instrument(self, owner, names: Iterable[str], prefix: str = "") -> None:
+        for name in names:
+            method = getattr(owner, name)
+            setattr(owner, name, self.timed(f"{prefix}{name}", method))
+
+    def timed(self, label: str, func: Callable) -> Callable:
+        histogram = self.callbacks.setdefault(label, LatencyHistogram())
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if threading.get_ident() != self._main_ident or self._active is not None:
+                return func(*args, **kwargs)
+            start = time.monotonic()
+            self._active = (label, start)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active = None
+                    reported = self._reported == (label, start)
+                elapsed_ms = (time.monotonic() - start) * 1000
+                histogram.record(elapsed_ms)
+                if elapsed_ms >= self.threshold_ms and not reported:
+                    self._record_slow(label, elapsed_ms, traceback.format_stack()[:-1])
+
+        return wrapper
+
+    def snapshot(self) -> Dict:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "loop_lag": self.loop_lag.snapshot(),
+            "callbacks": {label: hist.snapshot() for label, hist in self.callbacks.items()},
+            "slow_events": list(self.slow_events),
+        }
+
+    def export(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f"{path.name}.tmp")
+        temp.write_text(json.dumps(self.snapshot(), indent=2), encoding="utf-8")
+        os.replace(temp, path)
+
+    def _heartbeat(self) -> None:
+        if self._stopped.is_set():
+            return
+        now = time.monotonic()
+        self.loop_lag.record(max(0.0, (now - self._expected) * 1000), now)
+        self._last_beat = now
+        self._expected = now + self.interval_ms / 1000
+        self.root.after(self.interval_ms, self._heartbeat)
+
+    def _periodic_export(self) -> None:
+        if self._stopped.is_set() or not self.report_path:
+            return
+        try:
+            self.export(self.report_path)
+        except OSError:
+            logger.exception("ui watchdog export failed")
+        self.root.after(self.export_interval_ms, self._periodic_export)
+
+    def _monitor(self) -> None:
+        period = max(self.threshold_ms / 2000, 0.01)
+        while not self._stopped.wait(period):
+            now = time.monotonic()
+            with self._lock:
+                active = self._active
+                blocked_ms = (now - active[1]) * 1000 if active else 0.0
+                capture = (
+                    active is not None
+                    and active != self._reported
+                    and blocked_ms >= self.threshold_ms
+                )
+                if capture:
+                    self._reported = active
+                    stack = self._main_stack()
+            if capture:
+                self._record_slow(active[0], blocked_ms, stack)
+            if active:
+                continue
+            stalled_ms = (now - self._last_beat) * 1000 - self.interval_ms
+            if active is None and stalled_ms >= self.threshold_ms:
+                self._last_beat = now
+                self._record_slow("<event loop>", stalled_ms, self._main_stack())
+
+    def _main_stack(self) -> List[str]:
+        frame = sys._current_frames().get(self._main_ident)
+        return traceback.format_stack(frame) if frame else []
+
+    def _record_slow(self, label: str, blocked_ms: float, stack: List[str]) -> None:
+        event = {
+            "callback": label,
+            "blocked_ms": round(blocked_ms, 1),
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "stack": [line.rstrip() for line in stack],
+        }
+        self.slow_events.append(event)
+        logger.warning(
+            "UI thread blocked %.0f ms in %s\n%s", blocked_ms, label, "".join(stack)
+        )
@@ -1,10 +1,20 @@
+import errno
 import hashlib
 import os
+import time
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Callable, Iterable, Optional, Tuple
 
 
 MODEL_EXTENSIONS = {".safetensors", ".ckpt", ".pt", ".pth", ".bin"}
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+_KERNEL_COPY_FALLBACK_ERRORS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSOCK,
+}
 
 
 def is_model_file(path: Path) -> bool:
@@ -35,6 +45,86 @@ def file_hash(path: Path, chunk_size: int = 1024 * 1024) -> str:
     return sha256.hexdigest()
 
 
+def copy_file(
+    source: Path,
+    target: Path,
+    limit_bytes_per_sec: float = 0,
+    progress: Optional[Callable[[int, int], None]] = None,
+    chunk_size: int = COPY_CHUNK_SIZE,
+) -> int:
+    size = source.stat().st_size
+    started = time.monotonic()
+    copied = 0
+    if hasattr(os, "copy_file_range"):
+        method = "copy_file_range"
+    else:
+        method = "sendfile" if hasattr(os, "sendfile") else "read"
+    with source.open("rb") as reader, target.open("wb") as writer:
+        while copied < size:
+            count = min(chunk_size, size - copied)
+            try:
+                sent = _copy_chunk(method, reader, writer, copied, count)
+            except OSError as exc:
+                if method == "read" or exc.errno not in _KERNEL_COPY_FALLBACK_ERRORS:
+                    raise
+                method = "sendfile" if method == "copy_file_range" else "read"
+                continue
+            if not sent:
+                break
+            copied += sent
+            if progress:
+                progress(copied, size)
+            if limit_bytes_per_sec > 0:
+                delay = copied / limit_bytes_per_sec - (time.monotonic() - started)
+                if delay > 0:
+                    time.sleep(delay)
+        writer.flush()
+        os.fsync(writer.fileno())
+    return copied
+
+
+class CopyVerificationError(OSError):
+    pass
+
+
+def copy_verified(
+    source: Path,
+    target: Path,
+    expected_hash: str,
+    limit_bytes_per_sec: float = 0,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> None:
+    before = source.stat()
+    partial = target.with_name(f"{target.name}.partial")
+    try:
+        copied = copy_file(source, partial, limit_bytes_per_sec, progress)
+        if copied != before.st_size or partial.stat().st_size != before.st_size:
+            raise CopyVerificationError(
+                f"size mismatch copying {source} ({copied}/{before.st_size})"
+            )
+        if file_hash(partial) != expected_hash:
+            raise CopyVerificationError(f"hash mismatch copying {source}")
+        os.utime(partial, ns=(before.st_atime_ns, before.st_mtime_ns))
+        os.replace(partial, target)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def _copy_chunk(method: str, reader, writer, offset: int, count: int) -> int:
+    if method == "copy_file_range":
+        return os.copy_file_range(
+            reader.fileno(), writer.fileno(), count, offset_src=offset, offset_dst=offset
+        )
+    if method == "sendfile":
+        writer.seek(offset)
+        return os.sendfile(writer.fileno(), reader.fileno(), offset, count)
+    reader.seek(offset)
+    writer.seek(offset)
+    data = reader.read(min(count, 1024 * 1024))
+    writer.write(data)
+    return len(data)
+
+
 def text_hash(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
@@ -0,0 +1,40 @@
+import json
+import struct
+from pathlib import Path
+from typing import Dict, Tuple
+
+
+HEADER_PREFIX_BYTES = 8
+MAX_HEADER_BYTES = 100 * 1024 * 1024
+
+
+class SafetensorsError(ValueError):
+    pass
+
+
+def read_header(path: Path) -> Tuple[Dict, int]:
+    with path.open("rb") as handle:
+        prefix = handle.read(HEADER_PREFIX_BYTES)
+        if len(prefix) < HEADER_PREFIX_BYTES:
+            raise SafetensorsError("header_truncated")
+        (length,) = struct.unpack("<Q", prefix)
+        if length > MAX_HEADER_BYTES:
+            raise SafetensorsError("header_too_large")
+        raw = handle.read(length)
+    if len(raw) < length:
+        raise SafetensorsError("header_truncated")
+    try:
+        header = json.loads(raw)
+    except ValueError as exc:
+        raise SafetensorsError("header_invalid_json") from exc
+    if not isinstance(header, dict):
+        raise SafetensorsError("header_not_object")
+    return header, length
+
+
+def read_metadata(path: Path) -> Dict[str, str]:
+    header, _ = read_header(path)
+    metadata = header.get("__metadata__")
+    if not isinstance(metadata, dict):
+        return {}
+    return {str(key): str(value) for key, value in metadata.items()}
@@ -0,0 +1,115 @@
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from benchmarks.hf_server import HostedFile, StandInServer
+from src.services import block_manifest
+from src.services.block_manifest import (
+    BlockHasher,
+    BlockManifest,
+    RepairError,
+    fetch_block,
+    manifest_path,
+    repair_file,
+)
+from src.services.hf_downloader import DownloadRequest, HFDownloader
+from src.services.scheduler import JobScheduler
+
+
+BLOCK = 256 * 1024
+
+
+class TestBlockManifest(unittest.TestCase):
+    def test_hasher_blocks_match_any_chunking(self) -> None:
+        data = bytes(range(256)) * 2500
+        whole = BlockHasher(1000)
+        whole.update(data)
+        pieces = BlockHasher(1000)
+        for start in range(0, len(data), 777):
+            pieces.update(data[start : start + 777])
+
+        manifest = pieces.manifest("user/repo", "model.bin")
+        self.assertEqual(manifest, whole.manifest("user/repo", "model.bin"))
+        self.assertEqual(manifest.sha256, hashlib.sha256(data).hexdigest())
+        self.assertEqual(len(manifest.blocks), 640)
+        self.assertEqual(manifest.block_range(639), (639000, 640000))
+        self.assertEqual(manifest.blocks[1], hashlib.sha256(data[1000:2000]).hexdigest())
+
+    def test_download_records_manifest_and_repair_fetches_only_damage(self) -> None:
+        hosted = HostedFile("user/repo", "model.safetensors", 5 * BLOCK + 123)
+        server = StandInServer([hosted])
+        server.start()
+        scheduler = JobScheduler(io_workers=4, cpu_workers=2)
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir, patch(
+                "src.services.hf_endpoints.DEFAULT_HF_ENDPOINT", server.url
+            ), patch.object(block_manifest, "BLOCK_SIZE", BLOCK):
+                request = DownloadRequest(
+                    repo_id="user/repo",
+                    filename="model.safetensors",
+                    model_type="checkpoints",
+                    base_model="SDXL",
+                    target_dir=Path(temp_dir) / "models",
+                    endpoints=[server.url],
+                    manifest_dir=Path(temp_dir) / "manifests",
+                )
+                request.target_dir.mkdir()
+                HFDownloader(scheduler)._download_with_progress(request, None)
+                path = request.target_dir / "model.safetensors"
+                manifest = BlockManifest.load(
+                    manifest_path(request.manifest_dir, "user/repo", "model.safetensors")
+                )
+                self.assertEqual(manifest.sha256, hosted.sha256)
+                self.assertEqual(len(manifest.blocks), 6)
+                self.assertTrue(manifest.revision)
+
+                with path.open("r+b") as handle:
+                    handle.seek(BLOCK + 10)
+                    handle.write(b"\0" * 20)
+                    handle.truncate(4 * BLOCK + 7)
+                server.events.clear()
+                result = repair_file(path, manifest, [server.url], scheduler=scheduler)
+                self.assertEqual(result.damaged, [1, 4, 5])
+                self.assertEqual(result.bytes_fetched, 2 * BLOCK + 123)
+                self.assertEqual(result.sha256, hosted.sha256)
+                ranges = [event.status for event in server.events if event.kind == "start"]
+                self.assertEqual(ranges, [206, 206, 206])
+
+                manifest.blocks[2] = "0" * 64
+                with self.assertRaises(RepairError):
+                    repair_file(path, manifest, [server.url], scheduler=scheduler)
+        finally:
+            server.shutdown()
+
+    def test_fetch_block_reads_only_the_block(self) -> None:
+        data = b"x" * 100
+        manifest = BlockManifest(
+            "user/repo", "model.bin", 100, "", 100, blocks=[hashlib.sha256(data).hexdigest()]
+        )
+        sent = []
+
+        def stream(chunk_size):
+            while True:
+                sent.append(60)
+                yield b"x" * 60
+
+        def fake_get(url, **kwargs):
+            self.assertTrue(kwargs["stream"])
+            response = MagicMock()
+            response.__enter__.return_value = response
+            response.status_code = 206 if "mirror" in url else 200
+            response.iter_content.side_effect = stream
+            return response
+
+        with patch("src.services.block_manifest.requests.get", side_effect=fake_get):
+            with self.assertRaises(RepairError):
+                fetch_block(manifest, 0, ["http://origin"])
+            self.assertEqual(sent, [])
+            self.assertEqual(fetch_block(manifest, 0, ["http://origin", "http://mirror"]), data)
+        self.assertEqual(len(sent), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
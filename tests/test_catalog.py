@@ -0,0 +1,60 @@
+import json
+import unittest
+from dataclasses import replace
+from pathlib import Path
+import tempfile
+
+from src.models.catalog import diff_models, load_snapshot, save_snapshot
+from src.models.model_scanner import ModelEntry
+
+
+def make_entry(name: str, **kwargs) -> ModelEntry:
+    return ModelEntry(
+        name=name,
+        relative_path=f"loras/SDXL/{name}",
+        absolute_path=f"/models/loras/SDXL/{name}",
+        size_bytes=1,
+        model_type="loras",
+        base_model="SDXL",
+        **kwargs,
+    )
+
+
+class TestDiffModels(unittest.TestCase):
+    def test_keyed_diff(self) -> None:
+        old = [make_entry(f"m{index}.safetensors") for index in range(500)]
+        new = [replace(entry) for entry in old]
+        new[10] = replace(new[10], preview="preview.webp")
+        del new[20]
+        new.append(make_entry("extra.safetensors"))
+
+        diff = diff_models(old, new)
+        self.assertEqual(diff.changed, ["loras/SDXL/m10.safetensors"])
+        self.assertEqual(diff.removed, ["loras/SDXL/m20.safetensors"])
+        self.assertEqual(diff.added, ["loras/SDXL/extra.safetensors"])
+
+    def test_identical_lists_are_empty_diff(self) -> None:
+        old = [make_entry("a.safetensors", notes="x")]
+        self.assertTrue(diff_models(old, [replace(old[0])]).is_empty)
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_roundtrip(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "catalog.json"
+            models = [make_entry("a.safetensors", notes="用途"), make_entry("b.ckpt")]
+            save_snapshot(path, models)
+            self.assertEqual(load_snapshot(path), models)
+
+    def test_missing_or_foreign_snapshot(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "catalog.json"
+            self.assertEqual(load_snapshot(path), [])
+            path.write_text(json.dumps({"version": 0, "models": []}), encoding="utf-8")
+            self.assertEqual(load_snapshot(path), [])
+            path.write_text("{broken", encoding="utf-8")
+            self.assertEqual(load_snapshot(path), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from dataclasses import asdict
+
+from src.models.catalog import ModelCatalog
+from src.models.model_scanner import ModelEntry
+from src.services.catalog_server import CatalogServer
+
+
+def make_entry(name: str, model_type: str = "loras", **kwargs) -> ModelEntry:
+    return ModelEntry(
+        name=name,
+        relative_path=f"{model_type}/SDXL/{name}",
+        absolute_path=f"/models/{model_type}/SDXL/{name}",
+        size_bytes=1,
+        model_type=model_type,
+        base_model="SDXL",
+        **kwargs,
+    )
+
+
+class TestModelCatalog(unittest.TestCase):
+    def test_generation_and_merged_changes(self) -> None:
+        a, b = make_entry("a.safetensors"), make_entry("b.safetensors")
+        catalog = ModelCatalog([a])
+        self.assertTrue(catalog.replace([a]).is_empty)
+        self.assertEqual(catalog.generation, 1)
+
+        catalog.replace([a, b])
+        catalog.replace([b])
+        catalog.replace([b, make_entry("a.safetensors", notes="new")])
+        diff = catalog.changes_since(1)
+        self.assertEqual(catalog.generation, 4)
+        self.assertEqual(diff.added, ["loras/SDXL/b.safetensors"])
+        self.assertEqual(diff.changed, ["loras/SDXL/a.safetensors"])
+        self.assertEqual(diff.removed, [])
+        self.assertIsNone(catalog.changes_since(99))
+
+        catalog.mark_changed([])
+        self.assertEqual(catalog.generation, 4)
+        catalog.mark_changed(["loras/SDXL/b.safetensors"])
+        self.assertEqual(catalog.generation, 5)
+        self.assertEqual(catalog.changes_since(4).changed, ["loras/SDXL/b.safetensors"])
+
+
+class TestCatalogServer(unittest.TestCase):
+    def setUp(self) -> None:
+        models = [make_entry(f"m{index}.safetensors") for index in range(5)]
+        models.append(make_entry("vae.safetensors", model_type="vae"))
+        self.catalog = ModelCatalog(models)
+        self.server = CatalogServer(self.catalog, port=0, heartbeat=0.2)
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+
+    def _get(self, path: str, headers=None):
+        request = urllib.request.Request(self.server.url + path, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, dict(exc.headers), exc.read()
+
+    def test_filter_paginate_and_etag(self) -> None:
+        status, headers, body = self._get("/api/models?type=loras&offset=1&limit=2")
+        payload = json.loads(body)
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["total"], 5)
+        self.assertEqual([item["name"] for item in payload["models"]], ["m1.safetensors", "m2.safetensors"])
+
+        etag = headers["ETag"]
+        status, _, _ = self._get("/api/models?type=loras", {"If-None-Match": etag})
+        self.assertEqual(status, 304)
+
+        self.catalog.replace([make_entry("only.safetensors")])
+        status, headers, _ = self._get("/api/models", {"If-None-Match": etag})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers["ETag"], etag)
+        self.assertEqual(self._get("/api/models?limit=x")[0], 400)
+
+    def test_recorded_hash_change_invalidates_etag(self) -> None:
+        hashes = {}
+        server = CatalogServer(
+            self.catalog,
+            port=0,
+            describe=lambda model: {**asdict(model), "sha256": hashes.get(model.name, "")},
+        )
+        server.start()
+        try:
+            request = urllib.request.Request(server.url + "/api/models?type=vae")
+            with urllib.request.urlopen(request, timeout=5) as response:
+                etag = response.headers["ETag"]
+            hashes["vae.safetensors"] = "a" * 64
+            self.catalog.mark_changed(["vae/SDXL/vae.safetensors"])
+            request.add_header("If-None-Match", etag)
+            with urllib.request.urlopen(request, timeout=5) as response:
+                self.assertNotEqual(response.headers["ETag"], etag)
+                self.assertEqual(json.loads(response.read())["models"][0]["sha256"], "a" * 64)
+        finally:
+            server.shutdown()
+
+    def test_long_poll_returns_change(self) -> None:
+        def later() -> None:
+            time.sleep(0.2)
+            self.catalog.replace([make_entry("new.safetensors")])
+
+        threading.Thread(target=later, daemon=True).start()
+        started = time.monotonic()
+        status, _, body = self._get("/api/changes?since=1&timeout=5")
+        payload = json.loads(body)
+        self.assertEqual(status, 200)
+        self.assertLess(time.monotonic() - started, 4)
+        self.assertEqual(payload["generation"], 2)
+        self.assertEqual([item["name"] for item in payload["added"]], ["new.safetensors"])
+        self.assertEqual(len(payload["removed"]), 6)
+
+    def test_event_stream(self) -> None:
+        with urllib.request.urlopen(self.server.url + "/api/events?since=1", timeout=5) as response:
+            self.assertEqual(response.headers["Content-Type"], "text/event-stream")
+            self.catalog.replace([make_entry("streamed.safetensors")])
+            lines = []
+            while not lines or not lines[-1].startswith("data: {\"generation\""):
+                lines.append(response.readline().decode("utf-8").strip())
+        self.assertIn("event: catalog", lines)
+        self.assertIn("id: 2", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
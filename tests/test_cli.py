@@ -0,0 +1,248 @@
+import hashlib
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from src.cli import main, read_manifest
+from src.config import AppConfig, ConfigManager
+from src.services.block_manifest import BlockHasher, manifest_path, manifests_dir
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        root = Path(self._temp.name)
+        self.models_dir = root / "models"
+        self.config_path = root / "data" / "config.json"
+        manager = ConfigManager(self.config_path)
+        manager.config = AppConfig(
+            comfyui_models_dir=str(self.models_dir), app_data_dir=str(root / "data")
+        )
+        manager.save()
+        self._write("checkpoints/SDXL/a.safetensors", b"same")
+        self._write("loras/SDXL/b.safetensors", b"same")
+        self._write("loras/SD 1.5/c.safetensors", b"diff")
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def _write(self, relative: str, data: bytes) -> None:
+        path = self.models_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def _run(self, *argv: str):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = main(["--config", str(self.config_path), *argv])
+        return code, output.getvalue()
+
+    def test_list_json_filters(self) -> None:
+        code, output = self._run("list", "--type", "loras", "--json")
+        self.assertEqual(code, 0)
+        names = sorted(item["name"] for item in json.loads(output))
+        self.assertEqual(names, ["b.safetensors", "c.safetensors"])
+
+    def test_metrics_snapshot_after_scan(self) -> None:
+        self._run("scan")
+        code, output = self._run("metrics", "--json")
+        self.assertEqual(code, 0)
+        snapshot = json.loads(output)["cli_scan"]
+        catalog = snapshot["cmm_catalog_models"]["samples"][0]
+        self.assertEqual(catalog["value"], 3)
+        self.assertIn("cmm_config_saves_total", snapshot)
+
+    def test_trace_flag_writes_chrome_trace(self) -> None:
+        trace = Path(self._temp.name) / "trace.json"
+        with patch("sys.stderr", io.StringIO()):
+            code, _ = self._run("--trace-file", str(trace), "scan")
+        self.assertEqual(code, 0)
+        names = {event["name"] for event in json.loads(trace.read_text())["traceEvents"]}
+        self.assertIn("ConfigManager.load", names)
+        self.assertIn("ModelScanner.scan_dir", names)
+        self.assertIn("ModelScanner._apply_metadata", names)
+
+        with patch("sys.stderr", io.StringIO()) as stderr:
+            code, _ = self._run("--trace", "scan")
+        self.assertEqual(code, 0)
+        written = Path(stderr.getvalue().split("trace: ")[-1].strip())
+        self.assertEqual(written.parent, self.config_path.parent / "diagnostics")
+        self.assertIn("traceEvents", json.loads(written.read_text()))
+
+    def test_hash_records_metadata_and_dupes(self) -> None:
+        code, _ = self._run("hash")
+        self.assertEqual(code, 0)
+        metadata = ConfigManager(self.config_path).load().models_metadata
+        self.assertEqual(len(metadata), 3)
+        self.assertIn("sha256", metadata["loras/SDXL/b.safetensors"])
+
+        code, output = self._run("dupes", "--json")
+        groups = json.loads(output)
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(
+            sorted(groups[0]["paths"]),
+            ["checkpoints/SDXL/a.safetensors", "loras/SDXL/b.safetensors"],
+        )
+
+    def test_manifest_download_records_metadata(self) -> None:
+        manifest = Path(self._temp.name) / "jobs.jsonl"
+        manifest.write_text(
+            "\n".join(
+                json.dumps(
+                    {"repo_id": "user/repo", "filename": name, "model_type": "vae", "base_model": "SDXL"}
+                )
+                for name in ("x.safetensors", "y.safetensors")
+            ),
+            encoding="utf-8",
+        )
+        self.assertEqual(len(read_manifest(manifest)), 2)
+
+        def fake_get(*_args, **_kwargs):
+            response = Mock()
+            response.status_code = 200
+            response.headers = {"Content-Length": "3"}
+            response.iter_content.return_value = [b"abc"]
+            return response
+
+        api = Mock()
+        api.repo_info.return_value = Mock(siblings=[])
+        with patch("src.services.hf_downloader.requests.get", side_effect=fake_get), patch(
+            "src.services.hf_downloader.hf_hub_url", return_value="http://example"
+        ), patch("src.services.hf_downloader.HfApi", return_value=api), patch(
+            "sys.stderr", new_callable=io.StringIO
+        ) as stderr:
+            code, _ = self._run("download", "--manifest", str(manifest), "--concurrency", "2")
+
+        self.assertEqual(code, 0)
+        self.assertIn("[2/2]", stderr.getvalue())
+        self.assertEqual((self.models_dir / "vae" / "SDXL" / "y.safetensors").read_bytes(), b"abc")
+        metadata = ConfigManager(self.config_path).load().models_metadata
+        self.assertEqual(metadata["vae/SDXL/x.safetensors"]["repo_id"], "user/repo")
+        self.assertEqual(
+            metadata["vae/SDXL/x.safetensors"]["download_sha256"],
+            hashlib.sha256(b"abc").hexdigest(),
+        )
+
+    def test_repair_refuses_manifest_of_another_file(self) -> None:
+        hasher = BlockHasher()
+        hasher.update(b"original")
+        manifest = hasher.manifest("user/repo", "b.safetensors")
+        manifest.save(
+            manifest_path(manifests_dir(self.config_path.parent), "user/repo", "b.safetensors")
+        )
+        manager = ConfigManager(self.config_path)
+        manager.load()
+        manager.config.add_metadata("loras/SDXL/b.safetensors", "user/repo", "b.safetensors", "")
+        manager.config.add_metadata(
+            "loras/SD 1.5/c.safetensors", "user/repo", "b.safetensors", "", manifest.sha256
+        )
+        manager.save()
+
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            code, _ = self._run(
+                "repair", "loras/SDXL/b.safetensors", "loras/SD 1.5/c.safetensors"
+            )
+        self.assertEqual(code, 1)
+        self.assertEqual(stderr.getvalue().count("does not describe this file"), 2)
+        self.assertEqual((self.models_dir / "loras/SDXL/b.safetensors").read_bytes(), b"same")
+        self.assertEqual((self.models_dir / "loras/SD 1.5/c.safetensors").read_bytes(), b"diff")
+
+    def test_convert_registers_sibling(self) -> None:
+        encoded = json.dumps(
+            {"w": {"dtype": "F32", "shape": [2], "data_offsets": [0, 8]}}
+        ).encode("utf-8")
+        self._write(
+            "checkpoints/SDXL/big.safetensors",
+            len(encoded).to_bytes(8, "little") + encoded + b"\0\0\x80?\0\0\0@",
+        )
+        manager = ConfigManager(self.config_path)
+        manager.load()
+        manager.config.add_metadata(
+            "checkpoints/SDXL/big.safetensors", "user/repo", "big.safetensors", ""
+        )
+        manager.config.set_notes("checkpoints/SDXL/big.safetensors", "portraits")
+        manager.save()
+        hasher = BlockHasher()
+        hasher.update((self.models_dir / "checkpoints/SDXL/big.safetensors").read_bytes())
+        hasher.manifest("user/repo", "big.safetensors").save(
+            manifest_path(manifests_dir(self.config_path.parent), "user/repo", "big.safetensors")
+        )
+
+        code, output = self._run("convert", "checkpoints/SDXL/big.safetensors")
+        self.assertEqual(code, 0)
+        self.assertIn("checkpoints/SDXL/big-fp16.safetensors", output)
+        converted = self.models_dir / "checkpoints/SDXL/big-fp16.safetensors"
+        data = converted.read_bytes()
+        metadata = json.loads(self.config_path.read_text(encoding="utf-8"))["models_metadata"]
+        self.assertEqual(metadata["checkpoints/SDXL/big-fp16.safetensors"]["notes"], "portraits")
+        self.assertNotIn("repo_id", metadata["checkpoints/SDXL/big-fp16.safetensors"])
+
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            code, _ = self._run("repair", "checkpoints/SDXL/big-fp16.safetensors")
+        self.assertEqual(code, 1)
+        self.assertIn("not a download", stderr.getvalue())
+        self.assertEqual(converted.read_bytes(), data)
+
+        fingerprint = Path(self._temp.name) / "node.json"
+        self._run("fingerprint", "--output", str(fingerprint))
+        (self.models_dir / "checkpoints/SDXL/big.safetensors").unlink()
+        converted.unlink()
+        with patch("sys.stderr", new_callable=io.StringIO):
+            _, output = self._run("diff", str(fingerprint))
+        plan = {item["name"]: item for item in map(json.loads, output.splitlines())}
+        self.assertEqual(plan["big.safetensors"]["repo_id"], "user/repo")
+        self.assertEqual(plan["big-fp16.safetensors"]["repo_id"], "")
+        self.assertEqual(plan["big-fp16.safetensors"]["sha256"], "")
+
+    def test_diff_plan_feeds_manifest_download(self) -> None:
+        remote = Path(self._temp.name) / "remote.json"
+        code, output = self._run("fingerprint", "--hash", "--output", str(remote))
+        self.assertEqual(code, 0)
+        self.assertTrue(output.startswith(json.loads(remote.read_text("utf-8"))["root"]["hash"]))
+        code, output = self._run("diff", str(remote))
+        self.assertEqual((code, output), (0, ""))
+
+        manager = ConfigManager(self.config_path)
+        manager.load()
+        manager.config.add_metadata("loras/SDXL/b.safetensors", "user/repo", "b.safetensors", "")
+        manager.save()
+        self._run("fingerprint", "--hash", "--output", str(remote))
+        (self.models_dir / "loras/SDXL/b.safetensors").unlink()
+        self._write("loras/SD 1.5/c.safetensors", b"changed")
+        self._write("vae/SDXL/local.safetensors", b"local")
+
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            code, output = self._run("diff", str(remote))
+        self.assertEqual(code, 1)
+        plan = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(
+            [(item["action"], item["model_type"], item["name"]) for item in plan],
+            [
+                ("replace", "loras", "c.safetensors"),
+                ("add", "loras", "b.safetensors"),
+                ("remove", "vae", "local.safetensors"),
+            ],
+        )
+        self.assertIn("1 without a Hugging Face source", stderr.getvalue())
+        manifest = Path(self._temp.name) / "plan.jsonl"
+        manifest.write_text(output, encoding="utf-8")
+        jobs = read_manifest(manifest)
+        self.assertEqual(
+            [(job.repo_id, job.name, job.overwrite, len(job.sha256)) for job in jobs],
+            [("user/repo", "b.safetensors", False, 64)],
+        )
+
+    def test_cli_does_not_import_tk(self) -> None:
+        code = "import sys, src.cli; sys.exit('tkinter' in sys.modules)"
+        root = Path(__file__).resolve().parents[1]
+        self.assertEqual(subprocess.run([sys.executable, "-c", code], cwd=root).returncode, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
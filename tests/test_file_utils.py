@@ -17,6 +17,19 @@ class TestFileUtils(unittest.TestCase):
         self.assertEqual(file_utils.file_size_display(1024), "1.0 KB")
         self.assertEqual(file_utils.file_size_display(1024 * 1024), "1.0 MB")
 
+    def test_copy_file_chunks_and_progress(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "source.bin"
+            target = Path(temp_dir) / "target.bin"
+            source.write_bytes(bytes(range(256)) * 1000)
+            calls = []
+            copied = file_utils.copy_file(
+                source, target, progress=lambda done, total: calls.append(done), chunk_size=100_000
+            )
+            self.assertEqual(copied, 256_000)
+            self.assertEqual(target.read_bytes(), source.read_bytes())
+            self.assertEqual(calls, [100_000, 200_000, 256_000])
+
     def test_file_hash_and_text_hash(self) -> None:
         with tempfile.TemporaryDirectory() as temp_dir:
             path = Path(temp_dir) / "sample.txt"
@@ -0,0 +1,110 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.config import AppConfig
+from src.models.model_scanner import ModelEntry
+from src.services.fingerprint import (
+    build_fingerprint,
+    diff_fingerprints,
+    load_fingerprint,
+    save_fingerprint,
+)
+
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp.name)
+        self.config = AppConfig(app_data_dir=str(self.root / "data"))
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def _model(self, key: str, data: bytes, sha256: str = "") -> ModelEntry:
+        path = self.root / "models" / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        if sha256:
+            stat = path.stat()
+            self.config.set_hash(key, sha256, stat.st_size, stat.st_mtime_ns)
+            self.config.models_metadata[key].update(repo_id="user/repo", filename=path.name)
+        model_type, base_model, name = key.split("/")
+        return ModelEntry(name, key, str(path), len(data), model_type, base_model)
+
+    def test_subtree_hashes_and_round_trip(self) -> None:
+        first = [
+            self._model("loras/SDXL/a.safetensors", b"aa", "a" * 64),
+            self._model("checkpoints/SDXL/b.safetensors", b"bb", "b" * 64),
+        ]
+        one = build_fingerprint(self.config, first)
+        two = build_fingerprint(self.config, list(reversed(first)))
+        self.assertEqual(one.root.hash, two.root.hash)
+        self.assertEqual(one.unhashed, 0)
+
+        extra = self._model("loras/SD 1.5/c.safetensors", b"cc")
+        three = build_fingerprint(self.config, first + [extra])
+        self.assertEqual(three.unhashed, 1)
+        self.assertNotEqual(three.root.hash, one.root.hash)
+        self.assertNotEqual(three.root.children["loras"].hash, one.root.children["loras"].hash)
+        self.assertEqual(
+            three.root.children["checkpoints"].hash, one.root.children["checkpoints"].hash
+        )
+
+        path = self.root / "fingerprint.json"
+        save_fingerprint(path, three)
+        loaded = load_fingerprint(path)
+        self.assertEqual(loaded.root, three.root)
+        self.assertEqual(diff_fingerprints(loaded, three), [])
+        path.write_text('{"version": 0}', encoding="utf-8")
+        with self.assertRaises(ValueError):
+            load_fingerprint(path)
+
+    def test_diff_plans_add_remove_replace(self) -> None:
+        kept = self._model("checkpoints/SDXL/kept.safetensors", b"kk", "k" * 64)
+        old = self._model("loras/SDXL/old.safetensors", b"oo", "o" * 64)
+        swapped = self._model("loras/SDXL/swap.safetensors", b"s1", "1" * 64)
+        current = build_fingerprint(self.config, [kept, old, swapped])
+
+        swapped = self._model("loras/SDXL/swap.safetensors", b"s2", "2" * 64)
+        new = self._model("vae/FLUX/new.safetensors", b"nn", "n" * 64)
+        target = build_fingerprint(self.config, [kept, swapped, new])
+
+        plan = diff_fingerprints(current, target)
+        self.assertEqual(
+            [(item.action, item.key, item.sha256) for item in plan],
+            [
+                ("remove", "loras/SDXL/old.safetensors", "o" * 64),
+                ("replace", "loras/SDXL/swap.safetensors", "2" * 64),
+                ("add", "vae/FLUX/new.safetensors", "n" * 64),
+            ],
+        )
+        self.assertEqual(plan[2].repo_id, "user/repo")
+        self.assertEqual(
+            [(item.action, item.key) for item in diff_fingerprints(target, current)],
+            [
+                ("add", "loras/SDXL/old.safetensors"),
+                ("replace", "loras/SDXL/swap.safetensors"),
+                ("remove", "vae/FLUX/new.safetensors"),
+            ],
+        )
+
+    def test_unhashed_leaves_compare_by_size(self) -> None:
+        unhashed = self._model("loras/SDXL/a.safetensors", b"aa")
+        current = build_fingerprint(self.config, [unhashed])
+        hashed = build_fingerprint(
+            self.config, [self._model("loras/SDXL/a.safetensors", b"aa", "a" * 64)]
+        )
+        self.assertNotEqual(current.root.hash, hashed.root.hash)
+        self.assertEqual(diff_fingerprints(current, hashed), [])
+        self.assertEqual(diff_fingerprints(hashed, current), [])
+
+        grown = build_fingerprint(
+            self.config, [self._model("loras/SDXL/a.safetensors", b"aaa", "b" * 64)]
+        )
+        plan = diff_fingerprints(current, grown)
+        self.assertEqual([(item.action, item.sha256) for item in plan], [("replace", "b" * 64)])
+
+
+if __name__ == "__main__":
+    unittest.main()
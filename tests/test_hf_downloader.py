@@ -3,6 +3,7 @@ from pathlib import Path
 from unittest.mock import Mock, patch
 import tempfile
 
+from benchmarks.hf_server import Faults, HostedFile, StandInServer
 from src.services.hf_downloader import DownloadRequest, HFDownloader
 
 
@@ -58,6 +59,72 @@ class TestHFDownloader(unittest.TestCase):
 
             self.assertIsNone(result)
 
+    def test_resumes_on_next_endpoint_after_reset(self) -> None:
+        hosted = HostedFile("user/repo", "model.safetensors", 3 * 1024 * 1024)
+        server = StandInServer([hosted], faults=Faults(reset_after=1024 * 1024, resets=1))
+        server.start()
+        try:
+            endpoints = [server.url, server.url.replace("127.0.0.1", "localhost")]
+            with tempfile.TemporaryDirectory() as temp_dir:
+                request = DownloadRequest(
+                    repo_id="user/repo",
+                    filename="model.safetensors",
+                    model_type="checkpoints",
+                    base_model="SDXL",
+                    target_dir=Path(temp_dir),
+                    endpoints=endpoints,
+                )
+                outcome = []
+                with patch("src.services.hf_endpoints.DEFAULT_HF_ENDPOINT", server.url):
+                    HFDownloader().download_async(
+                        request, completion_cb=lambda *args: outcome.append(args)
+                    ).wait(30)
+
+                success, message, _readme, model_path = outcome[0]
+                self.assertTrue(success, message)
+                data = Path(model_path).read_bytes()
+                self.assertEqual(data, b"".join(hosted.read(0, hosted.size)))
+            kinds = [event.kind for event in server.events]
+            self.assertIn("reset", kinds)
+            resumed = [event for event in server.events if event.kind == "start" and event.offset]
+            self.assertEqual(resumed[-1].status, 206)
+        finally:
+            server.shutdown()
+
+    def test_replace_keeps_existing_file_until_verified(self) -> None:
+        hosted = HostedFile("user/repo", "model.safetensors", 1024 * 1024)
+        server = StandInServer([hosted])
+        server.start()
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir, patch(
+                "src.services.hf_endpoints.DEFAULT_HF_ENDPOINT", server.url
+            ):
+                existing = Path(temp_dir) / "renamed.safetensors"
+                existing.write_bytes(b"working model")
+                request = DownloadRequest(
+                    repo_id="user/repo",
+                    filename="model.safetensors",
+                    model_type="checkpoints",
+                    base_model="SDXL",
+                    target_dir=Path(temp_dir),
+                    endpoints=[server.url],
+                    target_name="renamed.safetensors",
+                    sha256="0" * 64,
+                )
+                with self.assertRaises(RuntimeError):
+                    HFDownloader()._download_with_progress(request, None)
+                self.assertEqual(existing.read_bytes(), b"working model")
+
+                request.sha256 = hosted.sha256
+                path = HFDownloader()._download_with_progress(request, None)
+                self.assertEqual(Path(path), existing)
+                self.assertEqual(existing.read_bytes(), b"".join(hosted.read(0, hosted.size)))
+                self.assertEqual(
+                    sorted(item.name for item in Path(temp_dir).iterdir()), ["renamed.safetensors"]
+                )
+        finally:
+            server.shutdown()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,122 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional
+from unittest.mock import patch
+import tempfile
+
+from src.config import DEFAULT_HF_ENDPOINT
+from src.services.hf_downloader import DownloadRequest, HFDownloader
+from src.services.hf_endpoints import normalize_endpoints, rank_endpoints
+
+
+PAYLOAD = bytes(range(256)) * 4096
+
+
+class StandInServer:
+    def __init__(
+        self, latency: float = 0.0, fail_after: Optional[int] = None, status: int = 200
+    ) -> None:
+        self.latency = latency
+        self.fail_after = fail_after
+        self.status = status
+        self.ranges: List[str] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *_args) -> None:
+                return
+
+            def do_GET(self) -> None:
+                time.sleep(server.latency)
+                range_header = self.headers.get("Range", "")
+                server.ranges.append(range_header)
+                if server.status != 200:
+                    self.send_response(server.status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                start, end = 0, len(PAYLOAD) - 1
+                if range_header.startswith("bytes="):
+                    first, _, last = range_header[6:].partition("-")
+                    start = int(first)
+                    end = int(last) if last else end
+                body = PAYLOAD[start : end + 1]
+                self.send_response(206 if range_header else 200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if server.fail_after is not None and len(body) > server.fail_after:
+                    self.wfile.write(body[: server.fail_after])
+                    self.wfile.flush()
+                    self.connection.shutdown(2)
+                    return
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self) -> "StandInServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def fake_hub_url(repo_id: str, filename: str, endpoint: str) -> str:
+    return f"{endpoint}/{repo_id}/resolve/main/{filename}"
+
+
+class TestEndpoints(unittest.TestCase):
+    def test_normalize_endpoints_appends_origin(self) -> None:
+        endpoints = normalize_endpoints(["http://mirror/", " http://mirror", ""])
+        self.assertEqual(endpoints, ["http://mirror", DEFAULT_HF_ENDPOINT])
+
+    def test_rank_prefers_fast_and_healthy(self) -> None:
+        with StandInServer(latency=0.3) as slow, StandInServer() as fast, StandInServer(
+            status=503
+        ) as broken:
+            probes = rank_endpoints(
+                [broken.endpoint, slow.endpoint, fast.endpoint],
+                lambda endpoint: f"{endpoint}/file",
+                {},
+            )
+        self.assertEqual(
+            [probe.endpoint for probe in probes],
+            [fast.endpoint, slow.endpoint, broken.endpoint],
+        )
+        self.assertFalse(probes[-1].ok)
+
+    def test_failover_resumes_from_offset(self) -> None:
+        with StandInServer(fail_after=700_000) as flaky, StandInServer(
+            latency=0.2
+        ) as backup, tempfile.TemporaryDirectory() as temp_dir:
+            request = DownloadRequest(
+                repo_id="user/repo",
+                filename="model.bin",
+                model_type="checkpoints",
+                base_model="SD 1.5",
+                target_dir=Path(temp_dir),
+                endpoints=[flaky.endpoint, backup.endpoint],
+            )
+            downloader = HFDownloader()
+            with patch("src.services.hf_downloader.hf_hub_url", side_effect=fake_hub_url):
+                with patch("src.services.hf_downloader.normalize_endpoints", side_effect=list):
+                    path = downloader._download_with_progress(request, None)
+
+            self.assertEqual(Path(path).read_bytes(), PAYLOAD)
+            self.assertEqual(downloader._active_endpoint, backup.endpoint)
+            resumed = [value for value in backup.ranges if value.endswith("-")]
+            self.assertEqual(len(resumed), 1)
+            self.assertGreater(int(resumed[0][6:-1]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import json
+import struct
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from src.config import AppConfig
+from src.models.model_scanner import ModelEntry, ModelScanner
+from src.services.integrity import (
+    STATUS_CORRUPT,
+    STATUS_HASH_MISMATCH,
+    STATUS_OK,
+    STATUS_TRUNCATED,
+    STATUS_UNCHECKED,
+    check_file,
+    check_models,
+    record_results,
+)
+from src.services.scheduler import JobScheduler
+from src.utils.file_utils import file_hash
+
+
+def safetensors_bytes(data_length: int) -> bytes:
+    header = json.dumps(
+        {"w": {"dtype": "U8", "shape": [data_length], "data_offsets": [0, data_length]}}
+    ).encode("utf-8")
+    return struct.pack("<Q", len(header)) + header + b"\1" * data_length
+
+
+class TestIntegrity(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp.name)
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def _write(self, name: str, data: bytes) -> Path:
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return path
+
+    def test_safetensors_size_against_offsets(self) -> None:
+        full = safetensors_bytes(64)
+        self.assertEqual(check_file(self._write("ok.safetensors", full))[0], STATUS_OK)
+        status, detail = check_file(self._write("cut.safetensors", full[:-10]))
+        self.assertEqual(status, STATUS_TRUNCATED)
+        self.assertIn(str(len(full)), detail)
+        head = self._write("head.safetensors", full[:20])
+        self.assertEqual(check_file(head)[0], STATUS_TRUNCATED)
+        tail = self._write("tail.safetensors", full + b"x")
+        self.assertEqual(check_file(tail)[0], STATUS_CORRUPT)
+
+    def test_zip_central_directory(self) -> None:
+        path = self.root / "model.ckpt"
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("archive/data.pkl", b"\x80\x02}q\x00." * 100)
+            archive.writestr("archive/data/0", b"\0" * 4096)
+        data = path.read_bytes()
+        self.assertEqual(check_file(path)[0], STATUS_OK)
+        self.assertEqual(check_file(self._write("cut.ckpt", data[:-200]))[0], STATUS_TRUNCATED)
+        legacy = self._write("legacy.pt", b"\x80\x02}q\x00.")
+        self.assertEqual(check_file(legacy)[0], STATUS_UNCHECKED)
+
+    def test_deep_check_records_metadata_for_badges(self) -> None:
+        models_dir = self.root / "models"
+        good = self._write("models/loras/SDXL/good.safetensors", safetensors_bytes(32))
+        bad = self._write("models/loras/SDXL/bad.safetensors", safetensors_bytes(32))
+        config = AppConfig(comfyui_models_dir=str(models_dir))
+        config.set_hash("loras/SDXL/good.safetensors", file_hash(good), 0, 0)
+        config.set_hash("loras/SDXL/bad.safetensors", "0" * 64, 0, 0)
+        models = [
+            ModelEntry(path.name, f"loras/SDXL/{path.name}", str(path), 0, "loras", "SDXL")
+            for path in (good, bad)
+        ]
+
+        scheduler = JobScheduler(io_workers=2, cpu_workers=2)
+        quick = check_models(config, models, scheduler=scheduler)
+        self.assertEqual([result.status for result in quick], [STATUS_OK, STATUS_OK])
+        deep = check_models(config, models, deep=True, scheduler=scheduler)
+        self.assertEqual([result.status for result in deep], [STATUS_OK, STATUS_HASH_MISMATCH])
+
+        record_results(config, deep)
+        scanned = {model.name: model for model in ModelScanner(config).scan()}
+        self.assertEqual(scanned["bad.safetensors"].integrity, STATUS_HASH_MISMATCH)
+        self.assertEqual(scanned["good.safetensors"].integrity, STATUS_OK)
+
+        bad.write_bytes(safetensors_bytes(40))
+        scanned = {model.name: model for model in ModelScanner(config).scan()}
+        self.assertEqual(scanned["bad.safetensors"].integrity, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.services.metrics import MetricsExporter, MetricsRegistry, read_snapshots
+
+
+class TestMetrics(unittest.TestCase):
+    def test_render_prometheus_text(self) -> None:
+        registry = MetricsRegistry()
+        lookups = registry.counter("cmm_lookups_total", "Lookups.", ("result",))
+        latency = registry.histogram("cmm_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        registry.gauge("cmm_idle", "Never set.")
+        lookups.labels("hit").inc()
+        lookups.labels("hit").inc(2)
+        latency.observe(0.05)
+        latency.observe(5)
+
+        text = registry.render({"process": "app"})
+        self.assertIn("# TYPE cmm_lookups_total counter", text)
+        self.assertIn('cmm_lookups_total{process="app",result="hit"} 3', text)
+        self.assertIn('cmm_latency_seconds_bucket{process="app",le="0.1"} 1', text)
+        self.assertIn('cmm_latency_seconds_bucket{process="app",le="+Inf"} 2', text)
+        self.assertIn('cmm_latency_seconds_count{process="app"} 2', text)
+        self.assertNotIn("cmm_idle", text)
+        self.assertIs(registry.counter("cmm_lookups_total", "Lookups.", ("result",)), lookups)
+        with self.assertRaises(ValueError):
+            registry.gauge("cmm_lookups_total", "Lookups.")
+
+    def test_exporter_writes_textfile_and_snapshot(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            registry = MetricsRegistry()
+            registry.counter("cmm_saves_total", "Saves.").inc()
+            exporter = MetricsExporter(registry, Path(temp_dir), "cli")
+            exporter.stop()
+
+            self.assertIn('cmm_saves_total{process="cli"} 1', exporter.textfile_path.read_text())
+            snapshots = read_snapshots(Path(temp_dir))
+            self.assertEqual(snapshots["cli"]["cmm_saves_total"]["samples"][0]["value"], 1)
+            self.assertEqual(sorted(p.suffix for p in Path(temp_dir).iterdir()), [".json", ".prom"])
+            json.loads(exporter.snapshot_path.read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
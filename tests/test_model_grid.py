@@ -0,0 +1,34 @@
+import unittest
+
+from src.ui.model_grid import GridLayout
+
+
+class TestGridLayout(unittest.TestCase):
+    def test_visible_range_is_bounded_by_viewport(self) -> None:
+        layout = GridLayout(column_count=3, row_height=100, overscan_rows=1)
+        visible = layout.visible_range(3000, top=0, height=250)
+        self.assertEqual(visible, range(0, 12))
+
+        visible = layout.visible_range(3000, top=50_000, height=250)
+        self.assertEqual(visible, range(1497, 1512))
+
+        visible = layout.visible_range(3000, top=99_950, height=250)
+        self.assertEqual(visible.stop, 3000)
+
+        viewport = layout.visible_range(3000, top=50_000, height=250, overscan=False)
+        self.assertEqual(viewport, range(1500, 1509))
+
+    def test_visible_range_empty(self) -> None:
+        layout = GridLayout()
+        self.assertEqual(len(layout.visible_range(0, top=0, height=500)), 0)
+        self.assertEqual(len(layout.visible_range(10, top=0, height=0)), 0)
+
+    def test_cell_positions(self) -> None:
+        layout = GridLayout(column_count=3, row_height=100, padding=10)
+        self.assertEqual(layout.cell(0, 340), (10, 10, 100, 90))
+        self.assertEqual(layout.cell(4, 340), (120, 110, 100, 90))
+        self.assertEqual(layout.content_height(4), 210)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,27 @@
+import threading
+import time
 import unittest
 from pathlib import Path
 import tempfile
 
 from src.config import AppConfig
+from src.models.model_roots import ModelRoot, load_extra_model_paths, split_root_key
 from src.models.model_scanner import ModelScanner
+from src.services.scheduler import JobScheduler
+
+
+def write_model(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"data")
+
+
+class BlockingScanner(ModelScanner):
+    release = threading.Event()
+
+    def _scan_type_dir(self, root, model_type, type_dir):
+        if root.name == "nfs":
+            self.release.wait(5)
+        return super()._scan_type_dir(root, model_type, type_dir)
 
 
 class TestModelScanner(unittest.TestCase):
@@ -41,5 +59,122 @@ class TestModelScanner(unittest.TestCase):
             self.assertEqual(entry.notes, "用途提示")
 
 
+    def test_extra_model_paths_yaml_roots(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            write_model(base / "local" / "loras" / "SDXL" / "a.safetensors")
+            write_model(base / "shared" / "models" / "Lora" / "SDXL" / "b.safetensors")
+            write_model(base / "shared" / "more" / "SDXL" / "c.safetensors")
+            yaml_path = base / "extra_model_paths.yaml"
+            yaml_path.write_text(
+                "nfs:\n"
+                f"    base_path: {base / 'shared'}\n"
+                "    loras: |\n"
+                "        models/Lora\n"
+                "        more\n"
+                "    unknown_type: models/other\n",
+                encoding="utf-8",
+            )
+            roots = load_extra_model_paths(yaml_path, ["loras"])
+            self.assertEqual([root.name for root in roots], ["nfs"])
+            self.assertEqual(len(roots[0].type_dirs["loras"]), 2)
+
+            config = AppConfig(
+                comfyui_models_dir=str(base / "local"), extra_model_paths_yaml=str(yaml_path)
+            )
+            config.models_metadata["@nfs/loras/SDXL/b.safetensors"] = {"notes": "shared"}
+            results = {entry.relative_path: entry for entry in ModelScanner(config).scan()}
+            self.assertEqual(
+                sorted(results),
+                [
+                    "@nfs/loras/SDXL/b.safetensors",
+                    "@nfs/loras/SDXL/c.safetensors",
+                    "loras/SDXL/a.safetensors",
+                ],
+            )
+            self.assertEqual(results["@nfs/loras/SDXL/b.safetensors"].notes, "shared")
+            self.assertEqual(results["@nfs/loras/SDXL/b.safetensors"].root, "nfs")
+            self.assertEqual(split_root_key("@nfs/loras/SDXL/b.safetensors"), ("nfs", "loras/SDXL/b.safetensors"))
+
+    def test_flat_yaml_root_lists_files_in_type_folder(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            write_model(base / "a1111" / "models" / "Stable-diffusion" / "v1.safetensors")
+            write_model(base / "a1111" / "models" / "Lora" / "SDXL" / "l.safetensors")
+            (base / "a1111" / "models" / "Stable-diffusion" / "notes.txt").write_text("x")
+            yaml_path = base / "extra_model_paths.yaml"
+            yaml_path.write_text(
+                "a111:\n"
+                f"    base_path: {base / 'a1111'}\n"
+                "    checkpoints: models/Stable-diffusion\n"
+                "    loras: models/Lora\n",
+                encoding="utf-8",
+            )
+            config = AppConfig(extra_model_paths_yaml=str(yaml_path))
+            results = {entry.relative_path: entry for entry in ModelScanner(config).scan()}
+            self.assertEqual(
+                sorted(results),
+                ["@a111/checkpoints/v1.safetensors", "@a111/loras/SDXL/l.safetensors"],
+            )
+            flat = results["@a111/checkpoints/v1.safetensors"]
+            self.assertEqual((flat.model_type, flat.base_model), ("checkpoints", ""))
+
+    def test_slow_root_times_out_with_stale_results(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            write_model(base / "local" / "vae" / "SDXL" / "fast.safetensors")
+            write_model(base / "nfs" / "vae" / "SDXL" / "slow.safetensors")
+            roots = [
+                ModelRoot("", {"vae": [base / "local" / "vae"]}),
+                ModelRoot("nfs", {"vae": [base / "nfs" / "vae"]}, timeout=0.2),
+            ]
+            config = AppConfig()
+
+            BlockingScanner.release.set()
+            first = BlockingScanner(config, roots).scan()
+            self.assertEqual(len(first), 2)
+
+            BlockingScanner.release.clear()
+            write_model(base / "local" / "vae" / "SDXL" / "new.safetensors")
+            scanner = BlockingScanner(config, roots)
+            started = time.monotonic()
+            second = scanner.scan()
+            BlockingScanner.release.set()
+            self.assertLess(time.monotonic() - started, 2)
+            self.assertEqual(
+                sorted(entry.name for entry in second),
+                ["fast.safetensors", "new.safetensors", "slow.safetensors"],
+            )
+            self.assertTrue(scanner.statuses["nfs"].stale)
+            self.assertFalse(scanner.statuses[""].stale)
+
+    def test_hung_root_does_not_hold_io_workers(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            for model_type in ("vae", "loras"):
+                write_model(base / "nfs" / model_type / "SDXL" / f"{model_type}.safetensors")
+            write_model(base / "late" / "vae" / "SDXL" / "late.safetensors")
+            roots = [
+                ModelRoot(
+                    "nfs",
+                    {"vae": [base / "nfs" / "vae"], "loras": [base / "nfs" / "loras"]},
+                    timeout=0.2,
+                ),
+                ModelRoot("late", {"vae": [base / "late" / "vae"]}, timeout=0.2),
+            ]
+            scheduler = JobScheduler(io_workers=1, cpu_workers=1, scan_workers=2)
+            BlockingScanner.release.clear()
+            try:
+                scanner = BlockingScanner(AppConfig(), roots, scheduler)
+                started = time.monotonic()
+                self.assertEqual(scanner.scan(), [])
+                self.assertLess(time.monotonic() - started, 2)
+                self.assertEqual(scanner.statuses["late"].error, "timeout")
+                self.assertEqual(scheduler.submit(lambda: "io").wait(1), "io")
+            finally:
+                BlockingScanner.release.set()
+                scheduler.shutdown()
+
+
 if __name__ == "__main__":
     unittest.main()
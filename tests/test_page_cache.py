@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.services import page_cache
+
+
+class TestPageCache(unittest.TestCase):
+    def test_warm_reads_whole_file_in_segments(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "model.safetensors"
+            path.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+            calls = []
+
+            def progress(done: int, total: int) -> None:
+                calls.append((done, total))
+
+            result = page_cache.warm_file(path, workers=2, progress=progress)
+            self.assertEqual(result.bytes_read, path.stat().st_size)
+            self.assertEqual(calls[-1], (result.bytes_read, result.bytes_read))
+            if result.residency.percent is not None:
+                self.assertGreater(result.residency.percent, 0)
+
+    def test_segments_cover_file(self) -> None:
+        size = 3 * page_cache.MIN_SEGMENT_SIZE + 5
+        segments = page_cache._segments(size, 2)
+        self.assertEqual(segments[0][0], 0)
+        self.assertEqual(segments[-1][1], size)
+        for (_, end), (start, _) in zip(segments, segments[1:]):
+            self.assertEqual(end, start)
+
+    @unittest.skipUnless(os.name == "posix", "mincore is POSIX only")
+    def test_residency_reports_bytes(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "model.bin"
+            path.write_bytes(b"x" * 100_000)
+            residency = page_cache.residency(path)
+            self.assertEqual(residency.size_bytes, 100_000)
+            self.assertIsNotNone(residency.resident_bytes)
+            self.assertLessEqual(residency.resident_bytes, 100_000)
+            self.assertIsNotNone(page_cache.evict(path).percent)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+
+from benchmarks.hf_server import HostedFile, StandInServer
+from src.config import AppConfig
+from src.models.model_scanner import ModelEntry
+from src.services.block_manifest import BlockHasher, manifest_path, manifests_dir
+from src.services.hf_downloader import DownloadRequest, HFDownloader
+from src.services.peer_cache import PeerServer, build_index, peer_file_url
+
+
+class TestPeerCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp.name)
+        self.peer = PeerServer("127.0.0.1", 0)
+        self.peer.start()
+
+    def tearDown(self) -> None:
+        self.peer.shutdown()
+        self._temp.cleanup()
+
+    def test_serves_indexed_files_with_range(self) -> None:
+        data = bytes(range(256)) * 64
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.root / "model.safetensors"
+        path.write_bytes(data)
+        self.peer.set_index({sha256: path})
+
+        url = peer_file_url(self.peer.url, sha256)
+        self.assertEqual(requests.get(url, timeout=5).content, data)
+        partial = requests.get(url, headers={"Range": "bytes=100-"}, timeout=5)
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.content, data[100:])
+        self.assertEqual(partial.headers["Content-Range"], f"bytes 100-16383/{len(data)}")
+        head = requests.head(url, timeout=5)
+        self.assertEqual(head.headers["Content-Length"], str(len(data)))
+        missing = requests.get(peer_file_url(self.peer.url, "0" * 64), timeout=5)
+        self.assertEqual(missing.status_code, 404)
+        index = requests.get(f"{self.peer.url}/peer/index", timeout=5).json()
+        self.assertEqual(index, {"files": {sha256: len(data)}})
+
+    def _download(self, server: StandInServer, target: Path) -> Path:
+        request = DownloadRequest(
+            repo_id="user/repo",
+            filename="model.safetensors",
+            model_type="checkpoints",
+            base_model="SDXL",
+            target_dir=target,
+            endpoints=[server.url],
+            peers=[self.peer.url],
+        )
+        target.mkdir()
+        with patch("src.services.hf_endpoints.DEFAULT_HF_ENDPOINT", server.url):
+            return Path(HFDownloader()._download_with_progress(request, None))
+
+    def test_downloader_prefers_peer_and_falls_back_on_bad_hash(self) -> None:
+        hosted = HostedFile("user/repo", "model.safetensors", 10 * 1024 * 1024)
+        expected = b"".join(hosted.read(0, hosted.size))
+        cached = self.root / "peer.safetensors"
+        cached.write_bytes(expected)
+        self.peer.set_index({hosted.sha256: cached})
+        server = StandInServer([hosted])
+        server.start()
+        try:
+            path = self._download(server, self.root / "first")
+            self.assertEqual(path.read_bytes(), expected)
+            bodies = [event for event in server.events if event.kind == "start"]
+            self.assertEqual([event for event in bodies if event.status == 200], [])
+
+            cached.write_bytes(b"x" * hosted.size)
+            server.events.clear()
+            path = self._download(server, self.root / "second")
+            self.assertEqual(path.read_bytes(), expected)
+            bodies = [event for event in server.events if event.kind == "start"]
+            self.assertEqual([event.status for event in bodies if event.offset == 0][-1], 200)
+        finally:
+            server.shutdown()
+
+    def test_index_from_recorded_hashes_and_manifests(self) -> None:
+        hashed = self.root / "a.safetensors"
+        downloaded = self.root / "b.safetensors"
+        hashed.write_bytes(b"aaaa")
+        downloaded.write_bytes(b"bbbb")
+        config = AppConfig(app_data_dir=str(self.root / "data"))
+        stat = hashed.stat()
+        config.set_hash("loras/SDXL/a.safetensors", "a" * 64, stat.st_size, stat.st_mtime_ns)
+        config.add_metadata("loras/SDXL/b.safetensors", "user/repo", "b.safetensors", "")
+        hasher = BlockHasher()
+        hasher.update(b"bbbb")
+        manifest = hasher.manifest("user/repo", "b.safetensors")
+        manifest.save(
+            manifest_path(manifests_dir(self.root / "data"), "user/repo", "b.safetensors")
+        )
+        models = [
+            ModelEntry(path.name, f"loras/SDXL/{path.name}", str(path), 4, "loras", "SDXL")
+            for path in (hashed, downloaded)
+        ]
+        self.assertEqual(
+            build_index(config, models), {"a" * 64: hashed, manifest.sha256: downloaded}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
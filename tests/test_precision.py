@@ -0,0 +1,133 @@
+import json
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from src.config import AppConfig
+from src.services import precision
+from src.services.precision import (
+    conversion_target,
+    convert_file,
+    convert_many,
+    register_conversion,
+)
+from src.utils.safetensors_utils import SafetensorsError, read_header
+
+
+def write_safetensors(path: Path, tensors, metadata=None) -> None:
+    header = {"__metadata__": metadata} if metadata else {}
+    data = b""
+    for name, (dtype, array) in tensors.items():
+        raw = array.tobytes()
+        header[name] = {
+            "dtype": dtype,
+            "shape": list(array.shape),
+            "data_offsets": [len(data), len(data) + len(raw)],
+        }
+        data += raw
+    encoded = json.dumps(header).encode("utf-8")
+    path.write_bytes(struct.pack("<Q", len(encoded)) + encoded + data)
+
+
+def read_tensor(path: Path, name: str, dtype: str) -> np.ndarray:
+    header, length = read_header(path)
+    begin, end = header[name]["data_offsets"]
+    raw = path.read_bytes()[8 + length + begin : 8 + length + end]
+    return np.frombuffer(raw, dtype=dtype).reshape(header[name]["shape"])
+
+
+class TestPrecision(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp.name)
+        self.weights = np.linspace(-4, 4, 3 * 1000, dtype="<f4").reshape(3, 1000)
+        self.steps = np.arange(5, dtype="<i8")
+        self.source = self.root / "model-fp32.safetensors"
+        write_safetensors(
+            self.source,
+            {"steps": ("I64", self.steps), "weight": ("F32", self.weights)},
+            {"ss_output_name": "pixel"},
+        )
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def test_fp16_in_chunks_keeps_other_tensors(self) -> None:
+        target = conversion_target(self.source, "fp16")
+        self.assertEqual(target.name, "model-fp16.safetensors")
+        seen = []
+        progress = lambda done, _total: seen.append(done)  # noqa: E731
+        with patch.object(precision, "CHUNK_BYTES", 1024):
+            result = convert_file(self.source, target, "fp16", progress)
+
+        header, length = read_header(target)
+        self.assertEqual((8 + length) % 8, 0)
+        self.assertEqual(header["__metadata__"], {"ss_output_name": "pixel"})
+        self.assertEqual(header["weight"]["dtype"], "F16")
+        np.testing.assert_allclose(read_tensor(target, "weight", "<f2"), self.weights, atol=2e-3)
+        np.testing.assert_array_equal(read_tensor(target, "steps", "<i8"), self.steps)
+        self.assertEqual(result.tensors_converted, 1)
+        self.assertEqual(result.bytes_out, target.stat().st_size)
+        self.assertGreater(len(seen), 10)
+        self.assertEqual(seen[-1], self.weights.nbytes + self.steps.nbytes)
+        with self.assertRaises(FileExistsError):
+            convert_file(self.source, target, "fp16")
+
+    def test_bf16_rounds_to_nearest_even(self) -> None:
+        values = np.array(
+            [1.0, 1.00390625, 1.01171875, -2.5, np.inf, np.nan, 3.4e38], dtype="<f4"
+        )
+        source = self.root / "edge.safetensors"
+        write_safetensors(source, {"v": ("F32", values)})
+        result = convert_file(source, self.root / "edge-bf16.safetensors", "bf16")
+
+        bits = read_tensor(result.target, "v", "<u2")
+        widened = (bits.astype("<u4") << 16).view("<f4")
+        self.assertEqual(list(widened[:4]), [1.0, 1.0, 1.015625, -2.5])
+        self.assertTrue(np.isposinf(widened[4]))
+        self.assertTrue(np.isnan(widened[5]))
+        self.assertEqual(result.overflowed, 1)
+
+    def test_batch_over_process_pool_and_register(self) -> None:
+        other = self.root / "plain.safetensors"
+        write_safetensors(other, {"steps": ("I64", self.steps)})
+        pairs = [
+            (self.source, conversion_target(self.source, "bf16")),
+            (other, conversion_target(other, "bf16")),
+        ]
+        results = list(convert_many(pairs, "bf16", workers=2))
+        self.assertEqual(results[0].error, "")
+        self.assertEqual(results[1].error, "no_fp32_tensors")
+        self.assertFalse(pairs[1][1].exists())
+
+        config = AppConfig()
+        source_key = "@nas/checkpoints/SDXL/model-fp32.safetensors"
+        config.add_metadata(source_key, "user/repo", "model-fp32.safetensors", "readme.md")
+        config.set_notes(source_key, "portraits")
+        config.set_hash(source_key, "abc", 1, 2)
+        key = register_conversion(config, source_key, results[0])
+        self.assertEqual(key, "@nas/checkpoints/SDXL/model-bf16.safetensors")
+        metadata = dict(config.models_metadata[key])
+        metadata.pop("added_at")
+        self.assertEqual(
+            metadata, {"notes": "portraits", "precision": "bf16", "converted_from": source_key}
+        )
+
+    def test_rejects_out_of_bounds_offsets(self) -> None:
+        broken = self.root / "broken.safetensors"
+        encoded = json.dumps(
+            {"w": {"dtype": "F32", "shape": [4], "data_offsets": [0, 16]}}
+        ).encode("utf-8")
+        broken.write_bytes(struct.pack("<Q", len(encoded)) + encoded + b"\0" * 8)
+        with self.assertRaises(SafetensorsError):
+            convert_file(broken, self.root / "out.safetensors")
+        names = sorted(path.name for path in self.root.iterdir())
+        self.assertEqual(names, ["broken.safetensors", "model-fp32.safetensors"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import hashlib
+import unittest
+from pathlib import Path
+import tempfile
+
+from PIL import Image
+
+from src.models.model_scanner import ModelEntry
+from src.services.preview_ingest import PreviewIngestor, match_previews_by_stem
+from src.services.thumbnail_cache import CARD_SIZE, DETAIL_SIZE, ThumbnailCache
+
+
+def make_entry(name: str) -> ModelEntry:
+    return ModelEntry(
+        name=name,
+        relative_path=f"loras/SDXL/{name}",
+        absolute_path=f"/models/loras/SDXL/{name}",
+        size_bytes=1,
+        model_type="loras",
+        base_model="SDXL",
+    )
+
+
+class TestPreviewIngestor(unittest.TestCase):
+    def test_ingest_normalizes_and_strips_metadata(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            source = root / "big.jpg"
+            exif = Image.Exif()
+            exif[0x010E] = "x" * 60_000
+            Image.new("RGB", (4096, 3072), "green").save(source, exif=exif.tobytes())
+
+            thumbnails = ThumbnailCache(root)
+            ingestor = PreviewIngestor(root, thumbnails)
+            target = ingestor.ingest(source)
+
+            digest = hashlib.sha256(source.read_bytes()).hexdigest()
+            self.assertEqual(target.stem, digest)
+            self.assertEqual(target.parent, root / "previews")
+            with Image.open(target) as master:
+                self.assertEqual(master.format, ingestor.format)
+                self.assertEqual(master.size, (2048, 1536))
+                self.assertNotIn("exif", master.info)
+
+            master_digest = thumbnails.content_hash(target)
+            self.assertTrue(thumbnails.thumbnail_path(master_digest, CARD_SIZE).exists())
+            self.assertTrue(thumbnails.thumbnail_path(master_digest, DETAIL_SIZE).exists())
+
+            self.assertEqual(ingestor.ingest(source), target)
+            self.assertEqual(
+                [path.name for path in (root / "previews").iterdir()], [target.name]
+            )
+
+    def test_ingest_many_reports_errors(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            good = root / "good.png"
+            bad = root / "bad.png"
+            Image.new("RGB", (64, 64), "red").save(good)
+            bad.write_bytes(b"not an image")
+
+            ingestor = PreviewIngestor(root, ThumbnailCache(root))
+            results = ingestor.ingest_many(
+                [(make_entry("good.safetensors"), good), (make_entry("bad.safetensors"), bad)]
+            )
+            self.assertIsNotNone(results[0].preview_path)
+            self.assertEqual(results[0].model.name, "good.safetensors")
+            self.assertIsNone(results[1].preview_path)
+            self.assertTrue(results[1].error)
+
+
+class TestMatchPreviews(unittest.TestCase):
+    def test_match_by_stem(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            for name in ["StyleA.png", "styleb.preview.jpg", "other.webp", "notes.txt"]:
+                (folder / name).write_bytes(b"")
+            models = [
+                make_entry("styleA.safetensors"),
+                make_entry("styleB.safetensors"),
+                make_entry("missing.safetensors"),
+            ]
+            pairs = match_previews_by_stem(folder, models)
+            self.assertEqual(
+                [(model.name, path.name) for model, path in pairs],
+                [
+                    ("styleA.safetensors", "StyleA.png"),
+                    ("styleB.safetensors", "styleb.preview.jpg"),
+                ],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import tempfile
+
+from src.models.model_scanner import ModelEntry
+from src.services import readme_resolver
+from src.services.readme_resolver import (
+    README_NOT_DOWNLOADED,
+    README_NOT_FOUND,
+    ReadmeResolver,
+    resolve_readme_path,
+)
+from src.utils.file_utils import text_hash
+
+
+def make_entry(**kwargs) -> ModelEntry:
+    return ModelEntry(
+        name="model.safetensors",
+        relative_path="checkpoints/SDXL/model.safetensors",
+        absolute_path="/models/checkpoints/SDXL/model.safetensors",
+        size_bytes=1,
+        model_type="checkpoints",
+        base_model="SDXL",
+        **kwargs,
+    )
+
+
+class TestResolveReadmePath(unittest.TestCase):
+    def test_states(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            path, state, _ = resolve_readme_path(make_entry(), root)
+            self.assertIsNone(path)
+            self.assertEqual(state, README_NOT_DOWNLOADED)
+
+            snapshot = root / "readmes" / text_hash("user/repo") / "snapshots" / "abc"
+            snapshot.mkdir(parents=True)
+            path, state, diagnostic = resolve_readme_path(make_entry(repo_id="user/repo"), root)
+            self.assertIsNone(path)
+            self.assertEqual(state, README_NOT_FOUND)
+            self.assertTrue(diagnostic)
+
+            (snapshot / "README.md").write_text("hello", encoding="utf-8")
+            path, state, _ = resolve_readme_path(make_entry(repo_id="user/repo"), root)
+            self.assertEqual(path, snapshot / "README.md")
+            self.assertEqual(state, "")
+
+
+class TestReadmeResolver(unittest.TestCase):
+    def test_caches_until_mtime_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            readme = root / "readmes" / text_hash("user/repo") / "README.md"
+            readme.parent.mkdir(parents=True)
+            readme.write_text("first", encoding="utf-8")
+            model = make_entry(repo_id="user/repo")
+            resolver = ReadmeResolver(root)
+
+            with patch.object(
+                readme_resolver, "find_readme_file", wraps=readme_resolver.find_readme_file
+            ) as finder:
+                self.assertEqual(resolver.resolve(model)[0], readme)
+                self.assertEqual(resolver.resolve(model)[0], readme)
+                self.assertEqual(finder.call_count, 1)
+
+                readme.write_text("second", encoding="utf-8")
+                stat = readme.stat()
+                os.utime(readme, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+                self.assertEqual(resolver.read_text(model), "second")
+                self.assertEqual(finder.call_count, 2)
+
+                readme.unlink()
+                self.assertIsNone(resolver.resolve(model)[0])
+                self.assertEqual(resolver.resolve(model)[1], README_NOT_FOUND)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.config import AppConfig, ConfigManager
+from src.models.model_roots import configured_roots
+from src.models.model_scanner import ModelScanner
+from src.services.relocator import RelocateError, Relocator, plan_moves
+
+
+class CrossDeviceRelocator(Relocator):
+    def _same_device(self, source: Path, target_dir: Path) -> bool:
+        return False
+
+
+class TestRelocator(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        base = Path(self._temp.name)
+        self.models_dir = base / "models"
+        self.manager = ConfigManager(base / "data" / "config.json")
+        self.manager.config = AppConfig(
+            comfyui_models_dir=str(self.models_dir),
+            app_data_dir=str(base / "data"),
+            extra_model_roots=[{"name": "nfs", "path": str(base / "nfs")}],
+        )
+        for name in ("a.safetensors", "b.safetensors"):
+            path = self.models_dir / "loras" / "SD 1.5" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(name.encode() * 100)
+            self.manager.config.set_notes(f"loras/SD 1.5/{name}", f"notes {name}")
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def _models(self):
+        return sorted(ModelScanner(self.manager.config).scan(), key=lambda model: model.name)
+
+    def test_rename_within_root_rewrites_metadata(self) -> None:
+        roots = configured_roots(self.manager.config)
+        plans = plan_moves(self._models(), roots, base_model="SDXL")
+        results = Relocator(self.manager).move(plans)
+        self.assertEqual([result.method for result in results], ["rename", "rename"])
+
+        saved = ConfigManager(self.manager.config_path).load().models_metadata
+        self.assertEqual(saved["loras/SDXL/a.safetensors"]["notes"], "notes a.safetensors")
+        self.assertNotIn("loras/SD 1.5/a.safetensors", saved)
+        self.assertEqual([model.base_model for model in self._models()], ["SDXL", "SDXL"])
+
+        again = plan_moves(self._models(), roots, base_model="SDXL")
+        self.assertTrue(all(plan.is_noop for plan in again))
+        methods = {result.method for result in Relocator(self.manager).move(again)}
+        self.assertEqual(methods, {"noop"})
+
+    def test_cross_device_copy_to_other_root(self) -> None:
+        roots = configured_roots(self.manager.config)
+        model = self._models()[0]
+        data = Path(model.absolute_path).read_bytes()
+        plans = plan_moves([model], roots, root_name="nfs")
+        self.assertEqual(plans[0].new_key, "@nfs/loras/SD 1.5/a.safetensors")
+
+        results = CrossDeviceRelocator(self.manager).move(plans)
+        self.assertEqual(results[0].method, "copy")
+        self.assertFalse(Path(model.absolute_path).exists())
+        self.assertEqual(plans[0].target.read_bytes(), data)
+        metadata = self.manager.config.models_metadata
+        self.assertEqual(metadata["@nfs/loras/SD 1.5/a.safetensors"]["notes"], "notes a.safetensors")
+
+    def test_conflicts_are_rejected(self) -> None:
+        roots = configured_roots(self.manager.config)
+        with self.assertRaises(RelocateError):
+            plan_moves(self._models(), roots, root_name="missing")
+        blocker = self.models_dir / "loras" / "SDXL" / "a.safetensors"
+        blocker.mkdir(parents=True)
+        plans = plan_moves(self._models(), roots, base_model="SDXL")
+        results = Relocator(self.manager).move(plans)
+        self.assertFalse(results[0].ok)
+        self.assertTrue(results[1].ok)
+        self.assertTrue(Path(plans[0].model.absolute_path).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import json
+import struct
+import unittest
+from pathlib import Path
+import tempfile
+
+from src.utils.safetensors_utils import SafetensorsError, read_header, read_metadata
+
+
+class TestSafetensorsUtils(unittest.TestCase):
+    def test_read_header_and_metadata(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "model.safetensors"
+            header = json.dumps(
+                {
+                    "__metadata__": {"ss_output_name": "pixel", "epochs": 4},
+                    "w": {"dtype": "F32", "shape": [2], "data_offsets": [0, 8]},
+                }
+            ).encode("utf-8")
+            path.write_bytes(struct.pack("<Q", len(header)) + header + b"\0" * 8)
+
+            parsed, length = read_header(path)
+            self.assertEqual(length, len(header))
+            self.assertEqual(parsed["w"]["data_offsets"], [0, 8])
+            self.assertEqual(read_metadata(path), {"ss_output_name": "pixel", "epochs": "4"})
+
+    def test_truncated_and_invalid(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "broken.safetensors"
+            path.write_bytes(struct.pack("<Q", 100) + b"{}")
+            with self.assertRaises(SafetensorsError):
+                read_header(path)
+            path.write_bytes(struct.pack("<Q", 3) + b"[1]")
+            with self.assertRaises(SafetensorsError):
+                read_header(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
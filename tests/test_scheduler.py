@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+
+from src.services.scheduler import (
+    POOL_CPU,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_VISIBLE,
+    STATUS_CANCELLED,
+    STATUS_FAILED,
+    JobCancelled,
+    JobScheduler,
+)
+
+
+class TestJobScheduler(unittest.TestCase):
+    def test_priority_order_and_queued_cancel(self) -> None:
+        scheduler = JobScheduler(io_workers=1, cpu_workers=1, autostart=False)
+        order = []
+        scheduler.submit(lambda: order.append("background"), priority=PRIORITY_BACKGROUND)
+        visible = scheduler.submit(lambda: order.append("visible"), priority=PRIORITY_VISIBLE)
+        last = scheduler.submit(lambda: order.append("interactive"), priority=PRIORITY_INTERACTIVE)
+        visible.cancel()
+        scheduler.start()
+
+        for job in (last, visible):
+            job._done.wait(5)
+        scheduler.submit(lambda: None).wait(5)
+        self.assertEqual(order, ["interactive", "background"])
+        self.assertEqual(visible.status, STATUS_CANCELLED)
+        with self.assertRaises(JobCancelled):
+            visible.wait(0)
+
+    def test_errors_surface_on_wait(self) -> None:
+        scheduler = JobScheduler(io_workers=1, cpu_workers=1)
+
+        def fail() -> None:
+            raise ValueError("boom")
+
+        job = scheduler.submit(fail, pool=POOL_CPU)
+        with self.assertRaises(ValueError):
+            job.wait(5)
+        self.assertEqual(job.status, STATUS_FAILED)
+        self.assertEqual(scheduler.submit(lambda: 42, pool=POOL_CPU).wait(5), 42)
+
+    def test_group_limit_and_cooperative_cancel(self) -> None:
+        scheduler = JobScheduler(io_workers=4, cpu_workers=1)
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def work() -> None:
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+        jobs = [scheduler.submit(work, group="root", group_limit=2) for _ in range(6)]
+        for job in jobs:
+            job.wait(5)
+        self.assertLessEqual(max(peak), 2)
+
+        def loop() -> None:
+            job = scheduler.current_job()
+            while True:
+                job.report(1, 2)
+                job.token.raise_if_cancelled()
+                time.sleep(0.005)
+
+        job = scheduler.submit(loop)
+        while job.progress != (1, 2):
+            time.sleep(0.005)
+        job.cancel()
+        with self.assertRaises(JobCancelled):
+            job.wait(5)
+
+    def test_callbacks_go_through_dispatcher(self) -> None:
+        dispatched = []
+        scheduler = JobScheduler(io_workers=2, cpu_workers=1, dispatcher=dispatched.append)
+        results = []
+        jobs = [scheduler.submit(lambda value=value: value) for value in range(3)]
+        scheduler.gather(jobs, lambda done: results.extend(job.result for job in done))
+
+        deadline = time.time() + 5
+        while not dispatched and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(results, [])
+        dispatched[0]()
+        self.assertEqual(results, [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
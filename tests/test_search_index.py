@@ -0,0 +1,83 @@
+import json
+import struct
+import unittest
+from pathlib import Path
+import tempfile
+
+from src.models.model_scanner import ModelEntry
+from src.services.search_index import SearchIndex, tokenize
+from src.utils.file_utils import text_hash
+
+
+def write_safetensors(path: Path, metadata: dict) -> None:
+    header = json.dumps({"__metadata__": metadata}).encode("utf-8")
+    path.write_bytes(struct.pack("<Q", len(header)) + header)
+
+
+def make_entry(root: Path, name: str, **kwargs) -> ModelEntry:
+    path = root / name
+    if not path.exists():
+        path.write_bytes(b"")
+    return ModelEntry(
+        name=name,
+        relative_path=f"loras/SDXL/{name}",
+        absolute_path=str(path),
+        size_bytes=path.stat().st_size,
+        model_type="loras",
+        base_model="SDXL",
+        **kwargs,
+    )
+
+
+class TestSearchIndex(unittest.TestCase):
+    def test_tokenize(self) -> None:
+        self.assertEqual(tokenize("Pixel-Art_v2 风格"), ["pixel", "art", "v2", "风", "格"])
+
+    def test_indexes_fields_readme_and_metadata(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            write_safetensors(
+                root / "pixel.safetensors",
+                {"ss_tag_frequency": json.dumps({"10_pixel": {"pxlart": 12, "retro game": 3}})},
+            )
+            readme_dir = root / "readmes" / text_hash("user/castle")
+            readme_dir.mkdir(parents=True)
+            (readme_dir / "README.md").write_text("Trigger word: gothcastle", encoding="utf-8")
+
+            index = SearchIndex(root)
+            models = [
+                make_entry(root, "pixel.safetensors"),
+                make_entry(root, "castle.safetensors", repo_id="user/castle"),
+                make_entry(root, "portrait.ckpt", notes="用于人像"),
+            ]
+            self.assertEqual(index.sync(models), 3)
+
+            self.assertEqual(index.search("pxl"), {"loras/SDXL/pixel.safetensors"})
+            self.assertEqual(index.search("retro gam"), {"loras/SDXL/pixel.safetensors"})
+            self.assertEqual(index.search("gothc"), {"loras/SDXL/castle.safetensors"})
+            self.assertEqual(index.search("USER/cas"), {"loras/SDXL/castle.safetensors"})
+            self.assertEqual(index.search("人像"), {"loras/SDXL/portrait.ckpt"})
+            self.assertEqual(index.search("pixel castle"), set())
+            self.assertEqual(index.search("  "), set())
+
+    def test_incremental_sync(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            first = make_entry(root, "first.pt", notes="alpha")
+            second = make_entry(root, "second.pt", notes="beta")
+            index = SearchIndex(root)
+            index.sync([first, second])
+
+            self.assertEqual(index.sync([first, second]), 0)
+            second.notes = "gamma"
+            self.assertEqual(index.sync([first, second]), 1)
+            self.assertEqual(index.search("beta"), set())
+            self.assertEqual(index.search("gam"), {"loras/SDXL/second.pt"})
+
+            self.assertEqual(index.sync([second]), 1)
+            self.assertEqual(index.search("alpha"), set())
+            self.assertEqual(len(index), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
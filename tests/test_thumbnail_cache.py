@@ -0,0 +1,54 @@
+import unittest
+from pathlib import Path
+import tempfile
+
+from PIL import Image
+
+from src.services.thumbnail_cache import CARD_SIZE, DETAIL_SIZE, ThumbnailCache
+
+
+class TestThumbnailCache(unittest.TestCase):
+    def _make_preview(self, path: Path, color: str) -> None:
+        Image.new("RGB", (1600, 1200), color).save(path, format="PNG")
+
+    def test_generates_all_sizes_and_hits_memory(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            preview = Path(temp_dir) / "preview.png"
+            self._make_preview(preview, "red")
+            cache = ThumbnailCache(Path(temp_dir))
+
+            image = cache.get(preview, CARD_SIZE)
+            self.assertEqual(image.size, (200, 150))
+            digest = cache.content_hash(preview)
+            self.assertTrue(cache.thumbnail_path(digest, CARD_SIZE).exists())
+            self.assertTrue(cache.thumbnail_path(digest, DETAIL_SIZE).exists())
+
+            self.assertIs(cache.get(preview, CARD_SIZE), image)
+            self.assertEqual(cache.stats.misses, 1)
+            self.assertEqual(cache.stats.memory_hits, 1)
+            self.assertEqual(cache.stats.hit_rate, 0.5)
+
+    def test_disk_tier_and_lru_eviction(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = Path(temp_dir) / "first.png"
+            second = Path(temp_dir) / "second.png"
+            self._make_preview(first, "red")
+            self._make_preview(second, "blue")
+            ThumbnailCache(Path(temp_dir)).get(first, DETAIL_SIZE)
+
+            cache = ThumbnailCache(Path(temp_dir), memory_limit=1)
+            self.assertEqual(cache.get(first, DETAIL_SIZE).size, (280, 210))
+            self.assertEqual(cache.stats.disk_hits, 1)
+            cache.get(second, DETAIL_SIZE)
+            cache.get(first, DETAIL_SIZE)
+            self.assertEqual(cache.stats.memory_hits, 0)
+            self.assertEqual(cache.stats.misses, 1)
+
+    def test_missing_preview(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ThumbnailCache(Path(temp_dir))
+            self.assertIsNone(cache.get(Path(temp_dir) / "missing.png", CARD_SIZE))
+
+
+if __name__ == "__main__":
+    unittest.main()
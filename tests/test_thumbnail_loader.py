@@ -0,0 +1,78 @@
+import time
+import unittest
+from pathlib import Path
+import tempfile
+
+from PIL import Image
+
+from src.services.scheduler import JobScheduler
+from src.services.thumbnail_cache import CARD_SIZE, ThumbnailCache
+from src.ui.thumbnail_loader import (
+    PRIORITY_OFFSCREEN,
+    PRIORITY_VISIBLE,
+    ThumbnailLoader,
+)
+
+
+class FakeWidget:
+    def __init__(self) -> None:
+        self.scheduled = []
+
+    def after(self, _ms: int, callback) -> None:
+        self.scheduled.append(callback)
+
+    def pump(self, until, timeout: float = 5.0) -> None:
+        deadline = time.time() + timeout
+        while not until() and time.time() < deadline:
+            pending, self.scheduled = self.scheduled, []
+            for callback in pending:
+                callback()
+            time.sleep(0.01)
+
+
+class TestThumbnailLoader(unittest.TestCase):
+    def _previews(self, root: Path, count: int):
+        paths = []
+        for index in range(count):
+            path = root / f"preview{index}.png"
+            Image.new("RGB", (640, 480), (index * 20, 0, 0)).save(path)
+            paths.append(path)
+        return paths
+
+    def test_visible_first_and_cancelled_skipped(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = self._previews(Path(temp_dir), 3)
+            widget = FakeWidget()
+            scheduler = JobScheduler(io_workers=1, cpu_workers=1, autostart=False)
+            loader = ThumbnailLoader(widget, ThumbnailCache(Path(temp_dir)), scheduler)
+            delivered = []
+
+            def deliver(index: int):
+                return lambda _image: delivered.append(index)
+
+            loader.request(paths[0], CARD_SIZE, deliver(0), PRIORITY_OFFSCREEN)
+            cancelled = loader.request(paths[1], CARD_SIZE, deliver(1), PRIORITY_VISIBLE)
+            loader.request(paths[2], CARD_SIZE, deliver(2), PRIORITY_VISIBLE)
+            loader.cancel(cancelled)
+
+            scheduler.start()
+            widget.pump(lambda: len(delivered) == 2)
+            self.assertEqual(delivered, [2, 0])
+
+    def test_memory_hit_is_synchronous(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = self._previews(Path(temp_dir), 1)[0]
+            widget = FakeWidget()
+            loader = ThumbnailLoader(widget, ThumbnailCache(Path(temp_dir)), JobScheduler(1, 1))
+            images = []
+            loader.request(path, CARD_SIZE, images.append)
+            widget.pump(lambda: bool(images))
+            self.assertEqual(images[0].size, (200, 150))
+
+            ticket = loader.request(path, CARD_SIZE, images.append)
+            self.assertEqual(ticket, 0)
+            self.assertIs(images[1], images[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.config import AppConfig
+from src.models.model_scanner import ModelScanner
+from src.services.tiering import DAY_SECONDS, TierError, TierManager
+
+
+class TestTierManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        base = Path(self._temp.name)
+        self.models_dir = base / "nvme"
+        self.config = AppConfig(
+            comfyui_models_dir=str(self.models_dir),
+            app_data_dir=str(base / "data"),
+            slow_tier_dir=str(base / "hdd"),
+        )
+        now = time.time()
+        for name, idle_days in (("old.safetensors", 200), ("older.safetensors", 400), ("hot.safetensors", 1)):
+            path = self.models_dir / "checkpoints" / "SDXL" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(name.encode() * 1000)
+            stamp = now - idle_days * DAY_SECONDS
+            os.utime(path, (stamp, stamp))
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def _models(self):
+        return {model.name: model for model in ModelScanner(self.config).scan()}
+
+    def test_cold_candidates_use_access_log(self) -> None:
+        tiers = TierManager(self.config)
+        tiers.access_log.record("checkpoints/SDXL/old.safetensors")
+        names = [item.model.name for item in tiers.cold_candidates(self._models().values(), 90)]
+        self.assertEqual(names, ["older.safetensors"])
+
+    def test_demote_and_promote_roundtrip(self) -> None:
+        tiers = TierManager(self.config, limit_bytes_per_sec=10 * 1024 * 1024)
+        model = self._models()["older.safetensors"]
+        data = Path(model.absolute_path).read_bytes()
+
+        target = tiers.demote(model)
+        source = Path(model.absolute_path)
+        self.assertTrue(source.is_symlink())
+        self.assertEqual(source.resolve(), target.resolve())
+        self.assertEqual(source.read_bytes(), data)
+        self.assertEqual(self._models()["older.safetensors"].size_bytes, len(data))
+        with self.assertRaises(TierError):
+            tiers.demote(model)
+
+        tiers.promote(model)
+        self.assertFalse(source.is_symlink())
+        self.assertEqual(source.read_bytes(), data)
+        self.assertFalse(target.exists())
+        self.assertGreater(tiers.access_log.get(model.relative_path), time.time() - 60)
+
+    def test_hash_mismatch_keeps_source(self) -> None:
+        model = self._models()["old.safetensors"]
+        stat = Path(model.absolute_path).stat()
+        self.config.set_hash(model.relative_path, "0" * 64, stat.st_size, stat.st_mtime_ns)
+        tiers = TierManager(self.config)
+        with self.assertRaises(TierError):
+            tiers.demote(model)
+        self.assertFalse(Path(model.absolute_path).is_symlink())
+        self.assertEqual(list(Path(self.config.slow_tier_dir).rglob("*.partial")), [])
+
+    def test_failed_link_removes_slow_copy(self) -> None:
+        model = self._models()["older.safetensors"]
+        data = Path(model.absolute_path).read_bytes()
+        with patch("os.symlink", side_effect=OSError("symlink privilege not held")):
+            with self.assertRaises(TierError):
+                TierManager(self.config).demote(model)
+        source = Path(model.absolute_path)
+        self.assertFalse(source.is_symlink())
+        self.assertEqual(source.read_bytes(), data)
+        slow_files = [path for path in Path(self.config.slow_tier_dir).rglob("*") if path.is_file()]
+        self.assertEqual(slow_files, [])
+        self.assertEqual(list(source.parent.glob(".*.tier-link")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
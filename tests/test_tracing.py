@@ -0,0 +1,55 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.services import tracing
+
+
+class TestTracing(unittest.TestCase):
+    def tearDown(self) -> None:
+        tracing.disable()
+
+    def test_disabled_spans_are_shared_no_ops(self) -> None:
+        self.assertIsNone(tracing.active())
+        self.assertIs(tracing.span("a"), tracing.span("b"))
+
+        @tracing.traced("work")
+        def work(value: int) -> int:
+            return value * 2
+
+        self.assertEqual(work(3), 6)
+
+    def test_spans_record_threads_and_ring_buffer(self) -> None:
+        tracer = tracing.enable(capacity=3)
+
+        @tracing.traced("work", "test")
+        def work() -> None:
+            with tracing.span("inner", "test", path=Path("x")) as span:
+                span.set(files=2)
+
+        thread = threading.Thread(target=work, name="scan-worker")
+        thread.start()
+        thread.join()
+        work()
+        work()
+
+        events = tracer.events()
+        spans = [event for event in events if event["ph"] == "X"]
+        self.assertEqual(len(spans), 3)
+        self.assertEqual(tracer.dropped, 3)
+        names = {event["args"]["name"] for event in events if event["ph"] == "M"}
+        self.assertIn("scan-worker", names)
+        inner = next(event for event in spans if event["name"] == "inner")
+        self.assertEqual(inner["args"], {"path": "x", "files": 2})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = tracer.export(Path(temp_dir) / "trace.json")
+            payload = json.loads(path.read_text())
+            self.assertEqual(payload["otherData"]["dropped_events"], 3)
+            self.assertTrue(all("tid" in event for event in payload["traceEvents"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.ui.watchdog import LatencyHistogram, UiWatchdog
+
+
+class FakeRoot:
+    def __init__(self) -> None:
+        self.scheduled = []
+
+    def after(self, _ms: int, callback) -> None:
+        self.scheduled.append(callback)
+
+
+class Component:
+    def slow(self) -> str:
+        time.sleep(0.08)
+        return "done"
+
+    def fast(self) -> str:
+        return "quick"
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_buckets_and_window(self) -> None:
+        histogram = LatencyHistogram(window_seconds=10)
+        histogram.record(3.0, now=0.0)
+        for value in (4.0, 40.0, 400.0):
+            histogram.record(value, now=20.0)
+
+        snapshot = histogram.snapshot(now=25.0)
+        self.assertEqual(snapshot["count"], 3)
+        self.assertEqual(snapshot["buckets"]["le_5"], 1)
+        self.assertEqual(snapshot["buckets"]["le_50"], 2)
+        self.assertEqual(snapshot["buckets"]["le_inf"], 3)
+        self.assertEqual(snapshot["max_ms"], 400.0)
+
+
+class TestUiWatchdog(unittest.TestCase):
+    def test_slow_callback_logged_with_stack(self) -> None:
+        watchdog = UiWatchdog(FakeRoot(), threshold_ms=30)
+        component = Component()
+        watchdog.instrument(component, ["slow", "fast"], prefix="Component.")
+
+        with self.assertLogs("src.ui.watchdog", level="WARNING"):
+            self.assertEqual(component.slow(), "done")
+        self.assertEqual(component.fast(), "quick")
+
+        snapshot = watchdog.snapshot()
+        self.assertEqual(snapshot["callbacks"]["Component.slow"]["count"], 1)
+        self.assertEqual(snapshot["callbacks"]["Component.fast"]["count"], 1)
+        self.assertEqual(len(snapshot["slow_events"]), 1)
+        event = snapshot["slow_events"][0]
+        self.assertEqual(event["callback"], "Component.slow")
+        self.assertTrue(any("test_slow_callback_logged_with_stack" in line for line in event["stack"]))
+
+    def test_monitor_captures_blocked_stack_and_exports(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report = Path(temp_dir) / "diagnostics" / "ui_latency.json"
+            root = FakeRoot()
+            watchdog = UiWatchdog(root, threshold_ms=30, report_path=report)
+            component = Component()
+            watchdog.instrument(component, ["slow"])
+            watchdog.start()
+            try:
+                with self.assertLogs("src.ui.watchdog", level="WARNING"):
+                    component.slow()
+                    root.scheduled.pop(0)()
+            finally:
+                watchdog.stop()
+
+            events = watchdog.snapshot()["slow_events"]
+            self.assertEqual([event["callback"] for event in events], ["slow"])
+            self.assertTrue(any("time.sleep" in line for line in events[0]["stack"]))
+            exported = json.loads(report.read_text(encoding="utf-8"))
+            self.assertEqual(exported["loop_lag"]["count"], 1)
+            self.assertIn("slow", exported["callbacks"])
+
+
+if __name__ == "__main__":
+    unittest.main()